@@ -0,0 +1,154 @@
+from pathlib import Path
+import asyncio
+import subprocess
+from datetime import datetime
+
+from .Git import Git, GitRepoMeta
+
+class AsyncGit:
+	#Runs the same git commands as Git through asyncio subprocesses so independent queries overlap.
+	GitRepo:Git = None
+	RepoPath:Path = None
+	MaxConcurrency:int = 8
+	_semaphore:asyncio.Semaphore = None
+
+	def __init__(self, repoSearchPath:Path, execPath:Path | None = None, maxConcurrency:int = 8):
+		if (maxConcurrency < 1):
+			raise ValueError(f"maxConcurrency must be at least 1, got {maxConcurrency}")
+		self.GitRepo = Git(repoSearchPath, execPath=execPath, backend="exec")
+		self.RepoPath = self.GitRepo.RepoPath
+		self.MaxConcurrency = maxConcurrency
+		self._semaphore = asyncio.Semaphore(maxConcurrency)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exceptionType, exceptionValue, traceback) -> None:
+		self.Close()
+
+	def Close(self) -> None:
+		self.GitRepo.Close()
+
+	async def RunGit(self, args:list[str]) -> bytes:
+		#At most MaxConcurrency git processes run at once.
+		async with self._semaphore:
+			process:asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+				*args,
+				cwd=self.RepoPath,
+				stdout=asyncio.subprocess.PIPE)
+			output, errorOutput = await process.communicate()
+		if (process.returncode != 0):
+			raise subprocess.CalledProcessError(process.returncode, args)
+		return output
+
+	async def LoadCommits(self,
+					includeRevisions:list[str] | None = None,
+					excludeRevisions:list[str] | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None,
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				) -> list[tuple[str, dict]]:
+		returnValue:list[tuple[str, dict]] = list[tuple[str, dict]]()
+		filteredAttributes:dict = self.GitRepo.GetFilteredAttributes(selectedAttributes)
+		args:list[str] = self.GitRepo.BuildLogArgs(self.GitRepo.GetLogFormat(filteredAttributes),
+			includeRevisions, excludeRevisions, lastNCommits,
+			afterDateTime, beforeDateTime, excludeMergeCommits, rootCommitsOnly, includeFiles)
+		output:bytes = await self.RunGit(args)
+		for record in output.split(b"\x1e"):
+			if (len(record) > 0):
+				returnValue.append(self.GitRepo.ParseLogRecord(filteredAttributes, record, includeFiles))
+		return returnValue
+
+	async def GetCommit(self, commitHash:str, selectedAttributes:list | None = None, includeFiles:bool = True) -> dict | None:
+		returnValue:dict | None = None
+		commits:list[tuple[str, dict]] = await self.LoadCommits(
+			includeRevisions=[commitHash],
+			lastNCommits=1,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		if (len(commits) > 0):
+			returnValue = commits[0][1]
+		return returnValue
+
+	async def GetFirstCommit(self, selectedAttributes:list | None = None, includeFiles:bool = True) -> dict | None:
+		returnValue:dict | None = None
+		commits:list[tuple[str, dict]] = await self.LoadCommits(
+			lastNCommits=1,
+			rootCommitsOnly=True,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		if (len(commits) > 0):
+			returnValue = commits[0][1]
+		return returnValue
+
+	async def GetCommitsBetweenHashes(self,
+					beginHash:str,
+					endHash:str,
+					excludeMergeCommits:bool | None = None,
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				) -> list:
+		commits:list[tuple[str, dict]] = await self.LoadCommits(
+			includeRevisions=[endHash],
+			excludeRevisions=[beginHash],
+			excludeMergeCommits=excludeMergeCommits,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		return [commit for commitHash, commit in commits if commitHash != endHash]
+
+	async def GetCommits(self,
+					afterHash:str | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				) -> list:
+		excludeRevisions:list[str] | None = None
+		if (afterHash is not None):
+			excludeRevisions = [afterHash]
+		commits:list[tuple[str, dict]] = await self.LoadCommits(
+			excludeRevisions=excludeRevisions,
+			lastNCommits=lastNCommits,
+			afterDateTime=afterDateTime,
+			beforeDateTime=beforeDateTime,
+			excludeMergeCommits=excludeMergeCommits,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		return [commit for commitHash, commit in commits]
+
+	async def GetCommitFiles(self, commitHash:str) -> list[str]:
+		output:bytes = await self.RunGit(self.GitRepo.GetCommitFilesArgs(commitHash))
+		return [file for file in output.decode().split("\n") if len(file) > 0]
+
+	async def GetTags(self, selectedAttributes:list | None = None, includeFiles:bool = True) -> list:
+		filteredAttributes:dict = self.GitRepo.GetFilteredAttributes(selectedAttributes)
+		isIndexed:bool = all(key in self.GitRepo.TagIndexAttributes for key in filteredAttributes.keys())
+		tagIndex:list[dict] = self.GitRepo.ParseTagIndex(await self.RunGit(self.GitRepo.GetTagIndexArgs()))
+		return list(await asyncio.gather(*[
+			self.GetTagFromIndex(tagEntry, isIndexed, selectedAttributes, includeFiles)
+			for tagEntry in tagIndex]))
+
+	async def GetTagFromIndex(self, tagEntry:dict, isIndexed:bool, selectedAttributes:list | None, includeFiles:bool) -> dict:
+		returnValue:dict = {"Name": tagEntry["Name"]}
+		if (isIndexed):
+			filteredAttributes:dict = self.GitRepo.GetFilteredAttributes(selectedAttributes)
+			returnValue.update({key: tagEntry[key] for key in filteredAttributes.keys()})
+			if (includeFiles):
+				returnValue["Files"] = await self.GetCommitFiles(tagEntry["Hash"])
+		else:
+			returnValue.update(await self.GetCommit(tagEntry["Hash"], selectedAttributes, includeFiles))
+		return returnValue
+
+	async def GetOriginURL(self) -> str | None:
+		return self.GitRepo.ParseOriginURL(await self.RunGit(self.GitRepo.GetOriginURLArgs()))
+
+	async def GetRepoMeta(self) -> GitRepoMeta:
+		return self.GitRepo.BuildRepoMeta(await self.GetOriginURL())
+
+__all__ = ["AsyncGit"]
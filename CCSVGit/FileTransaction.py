@@ -0,0 +1,164 @@
+from pathlib import Path
+import os
+import shutil
+import stat
+import tempfile
+import threading
+
+class FileTransaction:
+	#Stages whole-file writes as temporary files beside their targets and swaps them all in on Commit.
+	#Until Commit starts renaming, the targets are untouched, so a failure or a kill leaves the tree as it was.
+	#During Commit every replaced target is kept as a backup, and any failure puts all of them back.
+	StagedFiles:dict[Path, Path] = None
+		#Target path to staged temporary path, in staging order.
+	IsCommitted:bool = False
+	IsRolledBack:bool = False
+	_openFiles:list = None
+	_lock:threading.Lock = None
+	_defaultMode:int = 0o644
+
+	def __init__(self) -> None:
+		self.StagedFiles = dict[Path, Path]()
+		self.IsCommitted = False
+		self.IsRolledBack = False
+		self._openFiles = list()
+		self._lock = threading.Lock()
+		#New files get the permissions a plain open() would have given them.
+		self._defaultMode = 0o666 & ~FileTransaction.GetUmask()
+
+	@staticmethod
+	def GetUmask() -> int:
+		#os.umask can only be read by setting it, which races with other threads creating files, so Linux's copy in /proc is read instead.
+		returnValue:int = 0o022
+		try:
+			with open("/proc/self/status", "r", encoding="ascii") as statusFile:
+				for line in statusFile:
+					if (line.startswith("Umask:")):
+						returnValue = int(line.split(":", 1)[1].strip(), 8)
+						break
+		except OSError:
+			pass
+		return returnValue
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exceptionType, exceptionValue, traceback) -> None:
+		if (exceptionType is None):
+			self.Commit()
+		else:
+			self.Rollback()
+
+	def CreateTemporaryFile(self, path:Path) -> tuple[int, Path]:
+		if (self.IsCommitted
+			or self.IsRolledBack):
+			raise Exception("The file transaction has already finished")
+		fileDescriptor, temporaryPath = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+		mode:int = self._defaultMode
+		if (path.exists()):
+			mode = stat.S_IMODE(path.stat().st_mode)
+		os.chmod(temporaryPath, mode)
+		with self._lock:
+			previousTemporaryPath:Path | None = self.StagedFiles.get(path)
+			#A path written twice keeps only its last content.
+			self.StagedFiles[path] = Path(temporaryPath)
+		if (previousTemporaryPath is not None):
+			previousTemporaryPath.unlink(missing_ok=True)
+		return (fileDescriptor, Path(temporaryPath))
+
+	def Write(self, path:Path, content:bytes) -> None:
+		fileDescriptor, temporaryPath = self.CreateTemporaryFile(path)
+		with os.fdopen(fileDescriptor, "wb") as temporaryFile:
+			temporaryFile.write(content)
+
+	def Open(self, path:Path, encoding:str | None = None):
+		#A writable file whose content replaces path on Commit; text mode when an encoding is given.
+		fileDescriptor, temporaryPath = self.CreateTemporaryFile(path)
+		returnValue = None
+		if (encoding is None):
+			returnValue = os.fdopen(fileDescriptor, "wb")
+		else:
+			returnValue = os.fdopen(fileDescriptor, "w", encoding=encoding)
+		with self._lock:
+			self._openFiles.append(returnValue)
+		return returnValue
+
+	def Commit(self) -> None:
+		if (not self.IsCommitted
+			and not self.IsRolledBack):
+			for openFile in self._openFiles:
+				openFile.close()
+			try:
+				#All data reaches the disk before the first rename, so a crash never exposes a partially written file.
+				for temporaryPath in self.StagedFiles.values():
+					self.SyncPath(temporaryPath)
+				self.ReplaceAll()
+			except BaseException:
+				self.Rollback()
+				raise
+			self.IsCommitted = True
+
+	def ReplaceAll(self) -> None:
+		backupPaths:dict[Path, Path | None] = dict[Path, Path | None]()
+		try:
+			for path, temporaryPath in self.StagedFiles.items():
+				backupPaths[path] = self.CreateBackup(path)
+				os.replace(temporaryPath, path)
+			for directoryPath in set(path.parent for path in self.StagedFiles.keys()):
+				self.SyncPath(directoryPath)
+		except BaseException:
+			for path, backupPath in backupPaths.items():
+				if (not self.StagedFiles[path].exists()):
+					if (backupPath is not None):
+						os.replace(backupPath, path)
+					else:
+						path.unlink(missing_ok=True)
+				elif (backupPath is not None):
+					backupPath.unlink(missing_ok=True)
+			raise
+		for backupPath in backupPaths.values():
+			if (backupPath is not None):
+				backupPath.unlink(missing_ok=True)
+
+	def CreateBackup(self, path:Path) -> Path | None:
+		#A hard link costs no copy and survives the rename that replaces path.
+		returnValue:Path | None = None
+		if (path.exists()):
+			fileDescriptor, backupPath = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".bak")
+			os.close(fileDescriptor)
+			returnValue = Path(backupPath)
+			returnValue.unlink()
+			try:
+				os.link(path, returnValue)
+			except OSError:
+				shutil.copy2(path, returnValue)
+		return returnValue
+
+	def Rollback(self) -> None:
+		if (not self.IsCommitted
+			and not self.IsRolledBack):
+			for openFile in self._openFiles:
+				openFile.close()
+			for temporaryPath in self.StagedFiles.values():
+				temporaryPath.unlink(missing_ok=True)
+			self.IsRolledBack = True
+
+	@staticmethod
+	def SyncPath(path:Path) -> None:
+		#Directories cannot be opened for syncing on every platform; there the rename is as durable as it gets.
+		fileDescriptor:int | None = None
+		try:
+			fileDescriptor = os.open(path, os.O_RDONLY)
+		except OSError:
+			if (not path.is_dir()):
+				raise
+		if (fileDescriptor is not None):
+			try:
+				os.fsync(fileDescriptor)
+			except OSError:
+				if (not path.is_dir()):
+					raise
+			finally:
+				os.close(fileDescriptor)
+
+__all__ = ["FileTransaction"]
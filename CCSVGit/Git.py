@@ -4,9 +4,13 @@ import shutil
 import json
 import errno
 import os
-from datetime import datetime
+import queue
+import threading
+from datetime import datetime, timezone, timedelta
 from urllib.parse import urlparse
 
+from .ObjectStore import GitObjectStore
+
 class GitRepoMeta:
 	Name:str|None = None
 	Organization:str|None = None
@@ -71,12 +75,134 @@ class GitRepoMeta:
 	def __str__(self) -> str:
 		return self.ToJSON()
 
+class GitCatFileWorker:
+	GitExecPath:Path | None = None
+	RepoPath:Path | None = None
+	CheckOnly:bool = False
+	Process:subprocess.Popen | None = None
+
+	def __init__(self, execPath:Path, repoPath:Path, checkOnly:bool = False) -> None:
+		self.GitExecPath = execPath
+		self.RepoPath = repoPath
+		self.CheckOnly = checkOnly
+		self.Process = None
+
+	def Start(self) -> None:
+		if (self.Process is None
+			or self.Process.poll() is not None):
+			self.Process = subprocess.Popen(
+				executable=self.GitExecPath,
+				cwd=self.RepoPath,
+				args=[str(self.GitExecPath), "cat-file", "--batch-check" if self.CheckOnly else "--batch"],
+				stdin=subprocess.PIPE,
+				stdout=subprocess.PIPE,
+				stderr=subprocess.DEVNULL)
+
+	def Request(self, revision:str) -> tuple[str, str, int, bytes | None] | None:
+		#Returns (hash, type, size, content) or None when the revision does not resolve to an object.
+		returnValue:tuple[str, str, int, bytes | None] | None = None
+		self.Start()
+		self.Process.stdin.write(f"{revision}\n".encode())
+		self.Process.stdin.flush()
+		header:list[str] = self.Process.stdout.readline().decode().split()
+		if (len(header) == 3):
+			content:bytes | None = None
+			if (not self.CheckOnly):
+				content = self.Process.stdout.read(int(header[2]))
+				self.Process.stdout.read(1)
+			returnValue = (header[0], header[1], int(header[2]), content)
+		return returnValue
+
+	def Close(self) -> None:
+		if (self.Process is not None):
+			try:
+				self.Process.stdin.close()
+				self.Process.wait(timeout=5)
+			except subprocess.TimeoutExpired:
+				self.Process.kill()
+				self.Process.wait()
+			finally:
+				self.Process.stdout.close()
+			self.Process = None
+
+class GitCatFilePool:
+	GitExecPath:Path | None = None
+	RepoPath:Path | None = None
+	Size:int = 1
+	_batchWorkers:queue.LifoQueue | None = None
+	_checkWorkers:queue.LifoQueue | None = None
+	_allWorkers:list[GitCatFileWorker] | None = None
+	_lock:threading.Lock = None
+
+	def __init__(self, execPath:Path, repoPath:Path, size:int = 1) -> None:
+		self.GitExecPath = execPath
+		self.RepoPath = repoPath
+		self.Size = max(1, size)
+		self._batchWorkers = queue.LifoQueue()
+		self._checkWorkers = queue.LifoQueue()
+		self._allWorkers = list[GitCatFileWorker]()
+		self._lock = threading.Lock()
+
+	def Acquire(self, checkOnly:bool) -> GitCatFileWorker:
+		returnValue:GitCatFileWorker | None = None
+		workers:queue.LifoQueue = self._checkWorkers if checkOnly else self._batchWorkers
+		try:
+			returnValue = workers.get_nowait()
+		except queue.Empty:
+			with self._lock:
+				if (sum(worker.CheckOnly == checkOnly for worker in self._allWorkers) < self.Size):
+					returnValue = GitCatFileWorker(self.GitExecPath, self.RepoPath, checkOnly)
+					self._allWorkers.append(returnValue)
+			if (returnValue is None):
+				returnValue = workers.get()
+		return returnValue
+
+	def Release(self, worker:GitCatFileWorker) -> None:
+		if (worker.CheckOnly):
+			self._checkWorkers.put(worker)
+		else:
+			self._batchWorkers.put(worker)
+
+	def Read(self, revision:str) -> tuple[str, str, bytes] | None:
+		returnValue:tuple[str, str, bytes] | None = None
+		worker:GitCatFileWorker = self.Acquire(False)
+		try:
+			result = worker.Request(revision)
+		except Exception:
+			worker.Close()
+			raise
+		finally:
+			self.Release(worker)
+		if (result is not None):
+			returnValue = (result[0], result[1], result[3])
+		return returnValue
+
+	def Check(self, revision:str) -> tuple[str, str, int] | None:
+		returnValue:tuple[str, str, int] | None = None
+		worker:GitCatFileWorker = self.Acquire(True)
+		try:
+			result = worker.Request(revision)
+		except Exception:
+			worker.Close()
+			raise
+		finally:
+			self.Release(worker)
+		if (result is not None):
+			returnValue = (result[0], result[1], result[2])
+		return returnValue
+
+	def Close(self) -> None:
+		with self._lock:
+			for worker in self._allWorkers:
+				worker.Close()
+
 class Git:
 	CommitAttributes:dict = {
 		"Hash": "%H",
 		"AbbreviatedHash": "%h",
 		"TreeHash": "%T",
 		"AbbreviatedTreeHash": "%t",
+		"ParentHashes": "%P",
 		"AuthorName": "%an",
 		"AuthorName_MailMap": "%aN",
 		"AuthorEmail": "%ae",
@@ -132,12 +258,68 @@ class Git:
 		"RefLogSubject": "%gs"
 	}
 
+	WeekDayNames:list[str] = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+	MonthNames:list[str] = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+	TagIndexAttributes:dict = {
+		"Hash": ("%(objectname)", "%(*objectname)"),
+		"AbbreviatedHash": ("%(objectname:short)", "%(*objectname:short)"),
+		"CommitterDate_IS08601Strict": ("%(committerdate:iso-strict)", "%(*committerdate:iso-strict)"),
+		"Subject": ("%(subject)", "%(*subject)"),
+		"Body": ("%(body)", "%(*body)")
+	}
+
 	GitExecPath:Path | None = None
 	RepoPath:Path | None = None
+	Backend:str = "exec"
+		#"exec" runs the git executable, "objectstore" reads .git directly.
+	CatFileWorkers:int = 1
+	CatFilePool:GitCatFilePool | None = None
+	ObjectStore:GitObjectStore | None = None
 
-	def __init__(self, repoSearchPath:Path, execPath:Path | None = None):
+	def __init__(self, repoSearchPath:Path, execPath:Path | None = None, catFileWorkers:int = 1, backend:str | None = None):
 		self.GetRepoPathFromPath(repoSearchPath)
-		self.SetGitExecPath(execPath)
+		try:
+			self.SetGitExecPath(execPath)
+		except Exception:
+			if (backend == "exec"
+				or execPath is not None):
+				raise
+		if (backend is None):
+			if (self.GitExecPath is not None):
+				backend = "exec"
+			else:
+				backend = "objectstore"
+		if (backend not in ["exec", "objectstore"]):
+			raise ValueError(f"Unknown Git Backend {backend}")
+		self.Backend = backend
+		self.CatFileWorkers = catFileWorkers
+		self.CatFilePool = None
+		self.ObjectStore = None
+		if (self.Backend == "objectstore"):
+			self.ObjectStore = GitObjectStore(self.RepoPath)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exceptionType, exceptionValue, traceback) -> None:
+		self.Close()
+
+	def Close(self) -> None:
+		if (self.CatFilePool is not None):
+			self.CatFilePool.Close()
+			self.CatFilePool = None
+		if (self.ObjectStore is not None):
+			self.ObjectStore.Close()
+
+	def RequireGitExec(self) -> None:
+		if (self.GitExecPath is None):
+			raise  Exception("Git Not Found")
+
+	def GetCatFilePool(self) -> GitCatFilePool:
+		if (self.CatFilePool is None):
+			self.CatFilePool = GitCatFilePool(self.GitExecPath, self.RepoPath, self.CatFileWorkers)
+		return self.CatFilePool
 
 	def GetRepoPathFromPath(self, searchPath:Path) -> Path:
 		continueLoop:bool = True
@@ -161,6 +343,25 @@ class Git:
 			raise  Exception("Git Repo Not Found")
 		self.RepoPath = gitRepoDir
 
+	@staticmethod
+	def ResolveGitDirPath(repoPath:Path) -> Path:
+		#A linked worktree or a submodule has a .git file holding "gitdir: <path>" instead of a .git directory.
+		returnValue:Path = repoPath.joinpath(".git")
+		if (returnValue.is_file()):
+			returnValue = repoPath.joinpath(returnValue.read_text().strip().removeprefix("gitdir:").strip()).resolve()
+		return returnValue
+
+	@staticmethod
+	def ResolveCommonDirPath(gitDirPath:Path) -> Path:
+		#A linked worktree shares config, info/exclude and objects with its main repository through the commondir file.
+		returnValue:Path = gitDirPath
+		if (gitDirPath.joinpath("commondir").is_file()):
+			returnValue = gitDirPath.joinpath(gitDirPath.joinpath("commondir").read_text().strip()).resolve()
+		return returnValue
+
+	def GetGitDirPath(self) -> Path:
+		return Git.ResolveGitDirPath(self.RepoPath)
+
 	def SetGitExecPath(self, execPath:Path = None):
 		if (execPath is not None):
 			if (not execPath.exists()):
@@ -168,7 +369,7 @@ class Git:
 			self.GitExecPath = execPath
 		else:
 			try:
-				execPath = Path(shutil.which("git.exe"))
+				execPath = Path(shutil.which("git"))
 			except:
 				execPath = None
 			if (execPath is None):
@@ -177,82 +378,345 @@ class Git:
 				raise  Exception("Git Not Found")
 			self.GitExecPath = execPath
 
-	def GetCommit(self, commitHash:str, selectedAttributes:list | None = None) -> dict | None:
-		returnValue:dict | None = None
-		filteredAttributes:dict = self.CommitAttributes
+	def GetFilteredAttributes(self, selectedAttributes:list | None = None) -> dict:
+		returnValue:dict = self.CommitAttributes
 		if (selectedAttributes is not None
 	  		and len(selectedAttributes) > 0):
-			filteredAttributes:dict = {key: self.CommitAttributes[key] for key in selectedAttributes}
-		format:str = "|:|".join(filteredAttributes.values())
-		commitOutput:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=f" log {commitHash} -1 --format=\"format:{format}\"")
-		values:list = commitOutput.decode().split("|:|")
-		if (len(values) > 0):
-			returnValue:dict = {}
-			for index, key in enumerate(filteredAttributes.keys()):
-				if (len(values[index]) < 1
-					or values[index] == "undefined"):
-					returnValue[key] = None
-				else:
-					if (not str(key).endswith("(AsObject)")):
-						returnValue[key] = values[index]
-					elif (str(key).startswith("AuthorDate") or str(key).startswith("CommitterDate")):
-						returnValue[key] = datetime.fromisoformat(values[index])
-			returnValue["Files"] = self.GetCommitFiles(commitHash)
+			returnValue = {key: self.CommitAttributes[key] for key in selectedAttributes}
+		return returnValue
+
+	def ParseCommitValues(self, filteredAttributes:dict, values:list) -> dict:
+		returnValue:dict = {}
+		for index, key in enumerate(filteredAttributes.keys()):
+			if (index >= len(values)
+				or len(values[index]) < 1
+				or values[index] == "undefined"):
+				returnValue[key] = None
+			else:
+				if (not str(key).endswith("(AsObject)")):
+					returnValue[key] = values[index]
+				elif (str(key).startswith("AuthorDate") or str(key).startswith("CommitterDate")):
+					returnValue[key] = datetime.fromisoformat(values[index])
+		return returnValue
+
+	def FormatIdentityDates(self, prefix:str, identity:str) -> dict:
+		#Builds the %<prefix>d/D/t/i/I/s values git log would print for a "Name <email> epoch +zzzz" header.
+		returnValue:dict = {}
+		name, separator, remainder = identity.partition(" <")
+		email, separator, stamp = remainder.partition("> ")
+		epoch, separator, offset = stamp.partition(" ")
+		offsetMinutes:int = int(offset[1:3]) * 60 + int(offset[3:5])
+		if (offset.startswith("-")):
+			offsetMinutes = -offsetMinutes
+		date:datetime = datetime.fromtimestamp(int(epoch), timezone(timedelta(minutes=offsetMinutes)))
+		weekDay:str = self.WeekDayNames[date.weekday()]
+		month:str = self.MonthNames[date.month - 1]
+		returnValue[f"%{prefix}n"] = name
+		returnValue[f"%{prefix}e"] = email
+		returnValue[f"%{prefix}l"] = email.split("@")[0]
+		returnValue[f"%{prefix}d"] = f"{weekDay} {month} {date.day} {date.strftime("%H:%M:%S")} {date.year} {offset}"
+		returnValue[f"%{prefix}D"] = f"{weekDay}, {date.day} {month} {date.year} {date.strftime("%H:%M:%S")} {offset}"
+		returnValue[f"%{prefix}t"] = epoch
+		returnValue[f"%{prefix}i"] = f"{date.strftime("%Y-%m-%d %H:%M:%S")} {offset}"
+		returnValue[f"%{prefix}I"] = date.isoformat()
+		returnValue[f"%{prefix}s"] = date.strftime("%Y-%m-%d")
+		return returnValue
+
+	def ParseRawCommit(self, commitHash:str, raw:bytes) -> dict:
+		#Maps a raw commit object onto the format placeholders of CommitAttributes that can be derived from it.
+		returnValue:dict = {
+			"%H": commitHash,
+			"%h": commitHash[:7],
+			"%P": "",
+			"%e": ""
+		}
+		headerText, separator, message = raw.partition(b"\n\n")
+		encoding:str = "utf-8"
+		for line in headerText.decode(errors="replace").split("\n"):
+			if (line.startswith(" ")):
+				continue
+			key, separator, value = line.partition(" ")
+			match key:
+				case "tree":
+					returnValue["%T"] = value
+					returnValue["%t"] = value[:7]
+				case "parent":
+					returnValue["%P"] = f"{returnValue["%P"]} {value}".lstrip()
+				case "author":
+					returnValue.update(self.FormatIdentityDates("a", value))
+				case "committer":
+					returnValue.update(self.FormatIdentityDates("c", value))
+				case "encoding":
+					returnValue["%e"] = value
+					encoding = value
+		try:
+			messageText:str = message.decode(encoding, errors="replace")
+		except LookupError:
+			messageText:str = message.decode(errors="replace")
+		subject, separator, body = messageText.lstrip("\n").partition("\n\n")
+		returnValue["%s"] = " ".join(subject.strip().split("\n"))
+		returnValue["%b"] = body.lstrip("\n")
+		returnValue["%B"] = messageText
+		return returnValue
+
+	def GetAbbreviatedHash(self, objectHash:str, minimumLength:int = 7) -> str:
+		returnValue:str = None
+		if (self.ObjectStore is not None):
+			returnValue = self.ObjectStore.GetAbbreviatedHash(objectHash, minimumLength)
+		else:
+			#cat-file reports an ambiguous prefix as unresolved, so lengthen it until it resolves back to the object.
+			length:int = minimumLength
+			while (length < len(objectHash)
+				and self.ResolveRevision(objectHash[:length]) != objectHash):
+				length += 1
+			returnValue = objectHash[:length]
+		return returnValue
+
+	def ParseCommitObject(self, commitHash:str, raw:bytes) -> dict:
+		returnValue:dict = self.ParseRawCommit(commitHash, raw)
+		if (self.ObjectStore is not None):
+			#The object store knows where a shallow clone was cut, as git log does.
+			returnValue["%P"] = " ".join(self.ObjectStore.GetCommit(commitHash)[1])
+		returnValue["%h"] = self.GetAbbreviatedHash(commitHash)
+		if ("%T" in returnValue):
+			returnValue["%t"] = self.GetAbbreviatedHash(returnValue["%T"])
 		return returnValue
 
-	def GetFirstCommit(self, selectedAttributes:list | None = None) -> dict | None:
+	def GetCommitFromObject(self, revision:str, selectedAttributes:list | None = None) -> dict | None:
+		#Random-access lookup through the cat-file --batch pool, None when an attribute can not be derived.
 		returnValue:dict | None = None
-		filteredAttributes:dict = self.CommitAttributes
-		if (selectedAttributes is not None
-	  		and len(selectedAttributes) > 0):
-			filteredAttributes:dict = {key: self.CommitAttributes[key] for key in selectedAttributes}
-		format:str = "|:|".join(filteredAttributes.values())
-		commitOutput:bytes = subprocess.check_output(
+		filteredAttributes:dict = self.GetFilteredAttributes(selectedAttributes)
+		commitObject:tuple[str, bytes] | None = self.ReadCommitObject(revision)
+		if (commitObject is not None):
+			placeholders:dict = self.ParseCommitObject(commitObject[0], commitObject[1])
+			if (all(placeholder in placeholders for placeholder in filteredAttributes.values())):
+				returnValue = self.ParseCommitValues(
+					filteredAttributes,
+					[placeholders[placeholder] for placeholder in filteredAttributes.values()])
+		return returnValue
+
+	def ReadCommitObject(self, revision:str) -> tuple[str, bytes] | None:
+		#Returns (hash, raw commit object) for a revision.
+		returnValue:tuple[str, bytes] | None = None
+		if (self.ObjectStore is not None):
+			commitHash:str | None = self.ObjectStore.ResolveRevision(revision)
+			if (commitHash is not None):
+				returnValue = (commitHash, self.ObjectStore.GetCommit(commitHash)[0])
+		else:
+			commitObject:tuple[str, str, bytes] | None = self.GetCatFilePool().Read(f"{revision}^{{commit}}")
+			if (commitObject is not None):
+				returnValue = (commitObject[0], commitObject[2])
+		return returnValue
+
+	def ResolveRevision(self, revision:str) -> str | None:
+		returnValue:str | None = None
+		if (self.ObjectStore is not None):
+			returnValue = self.ObjectStore.ResolveRevision(revision)
+		else:
+			objectInfo:tuple[str, str, int] | None = self.GetCatFilePool().Check(revision)
+			if (objectInfo is not None):
+				returnValue = objectInfo[0]
+		return returnValue
+
+	def BuildLogArgs(self,
+					format:str,
+					includeRevisions:list[str] | None = None,
+					excludeRevisions:list[str] | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None,
+					includeFiles:bool = False
+				) -> list[str]:
+		returnValue:list[str] = [str(self.GitExecPath), "log", "-z", f"--format=tformat:{format}"]
+		if (includeFiles):
+			returnValue.extend(["--name-status", "--no-renames"])
+		if (lastNCommits is not None):
+			returnValue.append(f"--max-count={lastNCommits}")
+		if (afterDateTime is not None):
+			returnValue.append(f"--after={afterDateTime.isoformat()}")
+		if (beforeDateTime is not None):
+			returnValue.append(f"--before={beforeDateTime.isoformat()}")
+		if (excludeMergeCommits is not None):
+			returnValue.append("--no-merges")
+		if (rootCommitsOnly is not None):
+			returnValue.append("--max-parents=0")
+		if (includeRevisions is not None):
+			returnValue.extend(includeRevisions)
+		else:
+			returnValue.append("HEAD")
+		if (excludeRevisions is not None):
+			returnValue.extend(f"^{revision}" for revision in excludeRevisions)
+		returnValue.append("--")
+		return returnValue
+
+	def StreamLogRecords(self, args:list[str]):
+		#Yields each \x1e delimited record of a git log stream as soon as it is complete.
+		process:subprocess.Popen = subprocess.Popen(
 			executable=self.GitExecPath,
 			cwd=self.RepoPath,
-			args=f" log --max-parents=0 HEAD -1 --format=\"format:{format}\"")
-		values:list = commitOutput.decode().split("|:|")
-		if (len(values) > 0):
-			returnValue:dict = {}
-			for index, key in enumerate(filteredAttributes.keys()):
-				if (len(values[index]) < 1
-					or values[index] == "undefined"):
-					returnValue[key] = None
-				else:
-					if (not str(key).endswith("(AsObject)")):
-						returnValue[key] = values[index]
-					elif (str(key).startswith("AuthorDate") or str(key).startswith("CommitterDate")):
-						returnValue[key] = datetime.fromisoformat(values[index])
-			returnValue["Files"] = self.GetCommitFiles(returnValue["Hash"])
+			args=args,
+			stdout=subprocess.PIPE)
+		isFinished:bool = False
+		try:
+			buffer:bytes = b""
+			while (True):
+				chunk:bytes = process.stdout.read1(65536)
+				if (len(chunk) < 1):
+					break
+				buffer += chunk
+				records:list[bytes] = buffer.split(b"\x1e")
+				buffer = records.pop()
+				for record in records:
+					if (len(record) > 0):
+						yield record
+			if (len(buffer) > 0):
+				yield buffer
+			isFinished = True
+		finally:
+			if (not isFinished):
+				process.kill()
+			process.stdout.close()
+			returnCode:int = process.wait()
+			if (isFinished
+				and returnCode != 0):
+				raise subprocess.CalledProcessError(returnCode, args)
+
+	def ParseNameStatus(self, nameStatus:str) -> list[str]:
+		#--name-status -z emits <status>\0<path>\0 pairs; renames are disabled so there is one path per status.
+		returnValue:list[str] = list[str]()
+		elements:list[str] = nameStatus.lstrip("\n").split("\0")
+		for index in range(1, len(elements), 2):
+			if (len(elements[index]) > 0):
+				returnValue.append(elements[index])
 		return returnValue
 
-	def GetLastCommit(self, selectedAttributes:list | None = None) -> dict | None:
+	def StreamCommits(self,
+					includeRevisions:list[str] | None = None,
+						#Revisions to walk from, HEAD when not specified.
+					excludeRevisions:list[str] | None = None,
+						#Revisions whose history is excluded.
+						#^<revision>
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None,
+						#--max-parents=0
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				):
+		if (self.ObjectStore is not None):
+			yield from self.StreamObjectStoreCommits(
+				includeRevisions, excludeRevisions, lastNCommits,
+				afterDateTime, beforeDateTime, excludeMergeCommits, rootCommitsOnly,
+				selectedAttributes, includeFiles)
+			return
+		filteredAttributes:dict = self.GetFilteredAttributes(selectedAttributes)
+		args:list[str] = self.BuildLogArgs(self.GetLogFormat(filteredAttributes),
+			includeRevisions, excludeRevisions, lastNCommits,
+			afterDateTime, beforeDateTime, excludeMergeCommits, rootCommitsOnly, includeFiles)
+		for record in self.StreamLogRecords(args):
+			yield self.ParseLogRecord(filteredAttributes, record, includeFiles)
+
+	def GetLogFormat(self, filteredAttributes:dict) -> str:
+		return "%x1e%H%x1f" + "%x1f".join(filteredAttributes.values())
+
+	def ParseLogRecord(self, filteredAttributes:dict, record:bytes, includeFiles:bool) -> tuple[str, dict]:
+		header, separator, nameStatus = record.decode(errors="replace").partition("\0")
+		values:list = header.split("\x1f")
+		commit:dict = self.ParseCommitValues(filteredAttributes, values[1:])
+		if (includeFiles):
+			commit["Files"] = self.ParseNameStatus(nameStatus)
+		return (values[0], commit)
+
+	def StreamObjectStoreCommits(self,
+					includeRevisions:list[str] | None = None,
+					excludeRevisions:list[str] | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None,
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				):
+		#Attributes that can not be derived from the commit object (mailmap, signatures, relative dates) are None.
+		filteredAttributes:dict = self.GetFilteredAttributes(selectedAttributes)
+		if (includeRevisions is None):
+			includeRevisions = ["HEAD"]
+		includeHashes:list[str] = list[str]()
+		excludeHashes:list[str] = list[str]()
+		for revisions, hashes in [(includeRevisions, includeHashes), (excludeRevisions or [], excludeHashes)]:
+			for revision in revisions:
+				commitHash:str | None = self.ObjectStore.ResolveRevision(revision)
+				if (commitHash is None):
+					raise  Exception(f"Revision Not Found {revision}")
+				hashes.append(commitHash)
+		for commitHash, raw, parents in self.ObjectStore.WalkCommits(
+				includeHashes, excludeHashes, lastNCommits,
+				afterDateTime, beforeDateTime, excludeMergeCommits, rootCommitsOnly):
+			placeholders:dict = self.ParseCommitObject(commitHash, raw)
+			commit:dict = self.ParseCommitValues(
+				filteredAttributes,
+				[placeholders.get(placeholder, "") for placeholder in filteredAttributes.values()])
+			if (includeFiles):
+				commit["Files"] = self.ObjectStore.GetCommitFiles(commitHash)
+			yield (commitHash, commit)
+
+	def LoadCommits(self,
+					includeRevisions:list[str] | None = None,
+					excludeRevisions:list[str] | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None,
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
+				) -> list[dict]:
+		returnValue:list[dict] = list[dict]()
+		for commitHash, commit in self.StreamCommits(
+				includeRevisions, excludeRevisions, lastNCommits,
+				afterDateTime, beforeDateTime, excludeMergeCommits, rootCommitsOnly,
+				selectedAttributes, includeFiles):
+			returnValue.append(commit)
+		return returnValue
+
+	def GetCommit(self, commitHash:str, selectedAttributes:list | None = None, includeFiles:bool = True) -> dict | None:
 		returnValue:dict | None = None
-		filteredAttributes:dict = self.CommitAttributes
-		if (selectedAttributes is not None
-	  		and len(selectedAttributes) > 0):
-			filteredAttributes:dict = {key: self.CommitAttributes[key] for key in selectedAttributes}
-		format:str = "|:|".join(filteredAttributes.values())
-		commitOutput:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=f" log -1 --format=\"format:{format}\"")
-		values:list = commitOutput.decode().split("|:|")
-		if (len(values) > 0):
-			returnValue:dict = {}
-			for index, key in enumerate(filteredAttributes.keys()):
-				if (len(values[index]) < 1
-					or values[index] == "undefined"):
-					returnValue[key] = None
-				else:
-					if (not str(key).endswith("(AsObject)")):
-						returnValue[key] = values[index]
-					elif (str(key).startswith("AuthorDate") or str(key).startswith("CommitterDate")):
-						returnValue[key] = datetime.fromisoformat(values[index])
-			returnValue["Files"] = self.GetCommitFiles(returnValue["Hash"])
+		if (not includeFiles):
+			returnValue = self.GetCommitFromObject(commitHash, selectedAttributes)
+		if (returnValue is None):
+			commits:list[dict] = self.LoadCommits(
+				includeRevisions=[commitHash],
+				lastNCommits=1,
+				selectedAttributes=selectedAttributes,
+				includeFiles=includeFiles)
+			if (len(commits) > 0):
+				returnValue = commits[0]
+		return returnValue
+
+	def GetFirstCommit(self, selectedAttributes:list | None = None, includeFiles:bool = True) -> dict | None:
+		returnValue:dict | None = None
+		commits:list[dict] = self.LoadCommits(
+			lastNCommits=1,
+			rootCommitsOnly=True,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		if (len(commits) > 0):
+			returnValue = commits[0]
+		return returnValue
+
+	def GetLastCommit(self, selectedAttributes:list | None = None, includeFiles:bool = True) -> dict | None:
+		returnValue:dict | None = None
+		commits:list[dict] = self.LoadCommits(
+			lastNCommits=1,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+		if (len(commits) > 0):
+			returnValue = commits[0]
 		return returnValue
 
 	def GetCommitsBetweenHashes(self,
@@ -261,25 +725,18 @@ class Git:
 					excludeMergeCommits:bool | None = None,
 						#Exclude merge commits.
 						#--no-merges
-					selectedAttributes:list | None = None
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
 				) -> list:
-		returnValue:list | None = None
-		agrs:str = " log"
-		agrs += f" {beginHash}..{endHash}"
-		if (excludeMergeCommits is not None):
-			agrs += f" --no-merges"
-		agrs += f" --format=\"format:%H\""
-		commitsOutput:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=agrs)
-		commits:list = commitsOutput.decode().split("\n")
-		if (commits is not None
-	  		and len(commits) > 0):
-			returnValue = []
-			for hash in commits:
-				if (hash != endHash):
-					returnValue.append(self.GetCommit(hash, selectedAttributes))
+		returnValue:list = list[dict]()
+		for commitHash, commit in self.StreamCommits(
+				includeRevisions=[endHash],
+				excludeRevisions=[beginHash],
+				excludeMergeCommits=excludeMergeCommits,
+				selectedAttributes=selectedAttributes,
+				includeFiles=includeFiles):
+			if (commitHash != endHash):
+				returnValue.append(commit)
 		return returnValue
 
 	def GetCommits(self,
@@ -298,122 +755,263 @@ class Git:
 					excludeMergeCommits:bool | None = None,
 						#Exclude merge commits.
 						#--no-merges
-					selectedAttributes:list | None = None
+					selectedAttributes:list | None = None,
+					includeFiles:bool = True
 				) -> list:
-		returnValue:list | None = None
-		agrs:str = " log"
+		excludeRevisions:list[str] | None = None
 		if (afterHash is not None):
-			agrs += f" {afterHash}..HEAD"
-		if (lastNCommits is not None):
-			agrs += f" -n {lastNCommits}"
-		if (afterDateTime is not None):
-			agrs += f" -after \"{afterDateTime.isoformat()}\""
-		if (beforeDateTime is not None):
-			agrs += f" -before \"{beforeDateTime.isoformat()}\""
-		if (excludeMergeCommits is not None):
-			agrs += f" --no-merges"
-		agrs += f" --format=\"format:%H\""
-		commitsOutput:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=agrs)
-		commits:list = commitsOutput.decode().split("\n")
-		if (commits is not None
-	  		and len(commits) > 0):
-			returnValue = []
-			for hash in commits:
-				returnValue.append(self.GetCommit(hash, selectedAttributes))
-		return returnValue
+			excludeRevisions = [afterHash]
+		return self.LoadCommits(
+			excludeRevisions=excludeRevisions,
+			lastNCommits=lastNCommits,
+			afterDateTime=afterDateTime,
+			beforeDateTime=beforeDateTime,
+			excludeMergeCommits=excludeMergeCommits,
+			selectedAttributes=selectedAttributes,
+			includeFiles=includeFiles)
+
+	def IterCommits(self,
+					afterHash:str | None = None,
+						#Show only the commits created after commit specifiedc by hash.
+						#<after_hash>..HEAD
+					untilHash:str | None = None,
+						#Walk back from this commit instead of HEAD, leaving the commit itself out.
+						#<after_hash>..<until_hash>
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					includeFiles:bool = False
+				):
+		#Yields ConventionalCommit objects one at a time as git log output arrives.
+		from .Versioning import ConventionalCommit
+		includeRevisions:list[str] | None = None
+		excludeRevisions:list[str] | None = None
+		if (untilHash is not None):
+			includeRevisions = [untilHash]
+		if (afterHash is not None):
+			excludeRevisions = [afterHash]
+		for commitHash, commit in self.StreamCommits(
+				includeRevisions=includeRevisions,
+				excludeRevisions=excludeRevisions,
+				lastNCommits=lastNCommits,
+				afterDateTime=afterDateTime,
+				beforeDateTime=beforeDateTime,
+				excludeMergeCommits=excludeMergeCommits,
+				selectedAttributes=ConventionalCommit.GitAttributes,
+				includeFiles=includeFiles):
+			if (commitHash != untilHash):
+				yield ConventionalCommit.FromGitCommit(commit)
 
 	def GetCommitFiles(self, commitHash:str) -> list[str]:
 		returnValue:list[str] | None = None
-		filesOutput:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=f" diff-tree --no-commit-id --name-only -r {commitHash}")
-		files:list = filesOutput.decode().split("\n")
-		if (files is not None
-			and len(files) > 0):
+		files:list = list[str]()
+		if (self.ObjectStore is not None):
+			resolvedHash:str | None = self.ObjectStore.ResolveRevision(commitHash)
+			if (resolvedHash is not None):
+				files = self.ObjectStore.GetCommitFiles(resolvedHash, includeRoot=False)
+		else:
+			filesOutput:bytes = subprocess.check_output(
+				executable=self.GitExecPath,
+				cwd=self.RepoPath,
+				args=self.GetCommitFilesArgs(commitHash))
+			files = filesOutput.decode().split("\n")
+		if (files is not None):
 			returnValue = []
 			for file in files:
 				if (len(file) > 0):
 					returnValue.append(file)
 		return returnValue
 
-	def GetTags(self, selectedAttributes:list | None = None) -> list:
-		returnValue:list | None = None
-		tagsOutput:bytes = subprocess.check_output(
+	def GetCommitFilesArgs(self, commitHash:str) -> list[str]:
+		return [str(self.GitExecPath), "diff-tree", "--no-commit-id", "--name-only", "-r", commitHash]
+
+	def ListFiles(self, pathspecs:list[str] | None = None) -> list[Path]:
+		#Tracked files from the index, as paths under RepoPath.
+		returnValue:list[Path] = list[Path]()
+		self.RequireGitExec()
+		args:list[str] = [str(self.GitExecPath), "ls-files", "-z", "--"]
+		if (pathspecs is not None):
+			args.extend(pathspecs)
+		output:bytes = subprocess.check_output(
 			executable=self.GitExecPath,
 			cwd=self.RepoPath,
-			args=" tag --list")
-		tags:list = tagsOutput.decode().split("\n")
-		if (tags is not None
-			and len(tags) > 0):
-			returnValue = []
-			for tagName in tags:
-				if (len(tagName) > 0):
-					tag:dict = {"Name": tagName}
-					tag.update(self.GetCommit(tag["Name"], selectedAttributes))
+			args=args)
+		for relativePath in output.decode(errors="surrogateescape").split("\0"):
+			if (len(relativePath) > 0):
+				returnValue.append(self.RepoPath.joinpath(relativePath))
+		return returnValue
+
+	def GetTagIndex(self) -> list[dict]:
+		#Name, tag object hash, creator (tagger or committer) date and peeled commit attributes for every tag, in name order like git tag --list.
+		#Versions are ordered by VersionTags, which knows which tags are versions and compares them by SemVer precedence.
+		returnValue:list[dict] = list[dict]()
+		if (self.ObjectStore is not None):
+			for refName, objectHash in self.ObjectStore.GetRefs("refs/tags/").items():
+				commitObject:tuple[str, bytes] | None = self.ReadCommitObject(objectHash)
+				if (commitObject is not None):
+					placeholders:dict = self.ParseCommitObject(commitObject[0], commitObject[1])
+					tag:dict = self.ParseCommitValues(
+						self.TagIndexAttributes,
+						[placeholders["%H"], placeholders["%h"], placeholders["%cI"], placeholders["%s"], placeholders["%b"]])
+					tag["Name"] = refName.removeprefix("refs/tags/")
+					tag["TagObjectHash"] = None
+					tag["CreatorDate_IS08601Strict"] = tag["CommitterDate_IS08601Strict"]
+					tagObject:tuple[str, bytes] | None = self.ObjectStore.ReadObject(objectHash)
+					if (tagObject is not None
+						and tagObject[0] == "tag"):
+						tag["TagObjectHash"] = objectHash
+						for line in tagObject[1].partition(b"\n\n")[0].decode(errors="replace").split("\n"):
+							if (line.startswith("tagger ")):
+								tag["CreatorDate_IS08601Strict"] = self.FormatIdentityDates("t", line[7:])["%tI"]
+					returnValue.append(tag)
+			returnValue.sort(key=lambda tag: tag["Name"])
+		else:
+			output:bytes = subprocess.check_output(
+				executable=self.GitExecPath,
+				cwd=self.RepoPath,
+				args=self.GetTagIndexArgs())
+			returnValue = self.ParseTagIndex(output)
+		return returnValue
+
+	def GetTagIndexFields(self) -> list[str]:
+		returnValue:list[str] = ["%(refname:strip=2)", "%(objecttype)", "%(*objecttype)", "%(objectname)", "%(creatordate:iso-strict)"]
+		for direct, peeled in self.TagIndexAttributes.values():
+			returnValue.extend([direct, peeled])
+		return returnValue
+
+	def GetTagIndexArgs(self) -> list[str]:
+		return [str(self.GitExecPath), "for-each-ref", "--sort=refname", f"--format=%1e{"%1f".join(self.GetTagIndexFields())}", "refs/tags"]
+
+	def ParseTagIndex(self, output:bytes) -> list[dict]:
+		returnValue:list[dict] = list[dict]()
+		fieldCount:int = len(self.GetTagIndexFields())
+		for record in output.decode(errors="replace").split("\x1e"):
+			values:list[str] = record.removesuffix("\n").split("\x1f")
+			if (len(values) == fieldCount):
+				isAnnotated:bool = values[1] == "tag"
+				commitValues:list[str] = [values[index + 1 if isAnnotated else index] for index in range(5, len(values), 2)]
+				tag:dict = self.ParseCommitValues(self.TagIndexAttributes, commitValues)
+				tag["Name"] = values[0]
+				tag["TagObjectHash"] = values[3] if isAnnotated else None
+				tag["CreatorDate_IS08601Strict"] = values[4]
+				if (isAnnotated
+					and values[2] != "commit"):
+					#for-each-ref only peels one level, so tags of tags are resolved through the object.
+					tag = None
+					commitObject:tuple[str, bytes] | None = self.ReadCommitObject(values[3])
+					if (commitObject is not None):
+						tag = self.GetCommitFromObject(commitObject[0], list(self.TagIndexAttributes.keys()))
+						tag["Name"] = values[0]
+						tag["TagObjectHash"] = values[3]
+						tag["CreatorDate_IS08601Strict"] = values[4]
+				elif (values[1] != "commit"
+					and not isAnnotated):
+					tag = None
+				if (tag is not None):
 					returnValue.append(tag)
 		return returnValue
 
+	def GetTags(self, selectedAttributes:list | None = None, includeFiles:bool = True) -> list:
+		returnValue:list | None = list()
+		filteredAttributes:dict = self.GetFilteredAttributes(selectedAttributes)
+		isIndexed:bool = all(key in self.TagIndexAttributes for key in filteredAttributes.keys())
+		for tagEntry in self.GetTagIndex():
+			tag:dict = {"Name": tagEntry["Name"]}
+			if (isIndexed):
+				tag.update({key: tagEntry[key] for key in filteredAttributes.keys()})
+				if (includeFiles):
+					tag["Files"] = self.GetCommitFiles(tagEntry["Hash"])
+			else:
+				tag.update(self.GetCommit(tagEntry["Hash"], selectedAttributes, includeFiles))
+			returnValue.append(tag)
+		return returnValue
+
+	def GetOriginURL(self) -> str | None:
+		returnValue:str | None = None
+		if (self.ObjectStore is not None):
+			returnValue = self.ObjectStore.GetConfigValue("remote", "origin", "url")
+		else:
+			output:bytes = subprocess.check_output(
+				executable=self.GitExecPath,
+				cwd=self.RepoPath,
+				args=self.GetOriginURLArgs())
+			returnValue = self.ParseOriginURL(output)
+		return returnValue
+
+	def GetOriginURLArgs(self) -> list[str]:
+		return [str(self.GitExecPath), "remote", "--verbose", "show"]
+
+	def ParseOriginURL(self, output:bytes) -> str | None:
+		returnValue:str | None = None
+		remotes:list = output.decode().split("\n")
+		for line in remotes:
+			if (line.startswith("origin")
+				and line.endswith("(fetch)")):
+				returnValue = line[line.index("origin")+6:line.index("(fetch)")].strip()
+		return returnValue
+
 	def GetRepoMeta(self) -> GitRepoMeta:
+		return self.BuildRepoMeta(self.GetOriginURL())
+
+	def BuildRepoMeta(self, originURL:str | None) -> GitRepoMeta:
 		returnValue:GitRepoMeta = None
 		name:str = None
 		organization:str = None
 		url:str = None
-		output:bytes = subprocess.check_output(
-			executable=self.GitExecPath,
-			cwd=self.RepoPath,
-			args=f" remote --verbose show")
-		remotes:list = output.decode().split("\n")
-		if (remotes is not None
-	  		and len(remotes) > 0):
-			for line in remotes:
-				if (line.startswith("origin")
-					and line.endswith("(fetch)")):
-					originURL:str = line[line.index("origin")+6:line.index("(fetch)")].strip()
-					originURL = originURL[:len(originURL)-4]
-					if (originURL.startswith("https:")):
-						parsedURL = urlparse(originURL)
-						pathElements:list = parsedURL.path.split("/")
-						if (len(pathElements) == 3):
-							name = pathElements[2]
-							organization = pathElements[1]
-							url = originURL
-					else:
-						originURL = originURL[originURL.index(":")+1:]
-						urlElements:list = originURL.split("/")
-						if (len(urlElements) == 2):
-							name = urlElements[1]
-							organization = urlElements[0]
-							url = f"https://github.com/{organization}/{name}"
+		if (originURL is not None):
+			originURL = originURL.removesuffix(".git")
+			if (originURL.startswith("https:")):
+				parsedURL = urlparse(originURL)
+				pathElements:list = parsedURL.path.split("/")
+				if (len(pathElements) == 3):
+					name = pathElements[2]
+					organization = pathElements[1]
+					url = originURL
+			elif (":" in originURL):
+				originURL = originURL[originURL.index(":")+1:]
+				urlElements:list = originURL.split("/")
+				if (len(urlElements) == 2):
+					name = urlElements[1]
+					organization = urlElements[0]
+					url = f"https://github.com/{organization}/{name}"
 		returnValue = GitRepoMeta(repoPath=self.RepoPath, name=name, organization=organization, url=url)
 		return returnValue
 
 	def MakeCommit(self, message:str, paths:list[Path]) -> str:
+		#One git add for every path, fed NUL separated on stdin so neither the argument list nor odd file names get in the way,
+		#and the new commit read back from HEAD, which costs the same however long the history is.
 		returnValue:str = None
-		for path in paths:
+		self.RequireGitExec()
+		if (len(paths) > 0):
+			pathspecs:bytes = b"\0".join(os.fsencode(path.relative_to(self.RepoPath).as_posix()) for path in paths)
 			addOutput:bytes = subprocess.check_output(
 				executable=self.GitExecPath,
 				cwd=self.RepoPath,
-				args=f" add {str(path.relative_to(self.RepoPath)).replace("\\", "/")}")
+				args=[str(self.GitExecPath), "--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+				input=pathspecs)
 		commitOutput:bytes = subprocess.check_output(
 			executable=self.GitExecPath,
 			cwd=self.RepoPath,
-			args=f" commit -m\"{message}\"")
-
+			args=[str(self.GitExecPath), "commit", "--quiet", f"-m{message}"])
 		getCommitOutput:bytes = subprocess.check_output(
 			executable=self.GitExecPath,
 			cwd=self.RepoPath,
-			args=f" log --all --grep=\"{message}\" --format=\"format:%H\"")
-		returnValue = getCommitOutput.decode().split("\n")[0]
+			args=[str(self.GitExecPath), "rev-parse", "--verify", "HEAD"])
+		returnValue = getCommitOutput.decode().strip()
 		return returnValue
 
 	def TagCommit(self, tagName:str, commitHash:str):
-		tegOutput:bytes = subprocess.check_output(
+		self.RequireGitExec()
+		tagOutput:bytes = subprocess.check_output(
 			executable=self.GitExecPath,
 			cwd=self.RepoPath,
-			args=f" tag \"{tagName}\" {commitHash}")
+			args=[str(self.GitExecPath), "tag", tagName, commitHash])
+
+	def CommitAndTag(self, message:str, paths:list[Path], tagName:str) -> str:
+		#Tags the hash MakeCommit read from HEAD, so a repeated commit message can never tag an older commit.
+		returnValue:str = self.MakeCommit(message, paths)
+		self.TagCommit(tagName, returnValue)
+		return returnValue
 
 __all__ = ["GitRepoMeta", "Git"]
@@ -0,0 +1,412 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+import io
+import re
+import tomllib
+import tomli_w
+from lxml import etree
+from semver.version import Version as SemVer
+
+from .FileTransaction import FileTransaction
+
+class Manifest(ABC):
+	#One version manifest. The file is read once, lookups are cached, and Save writes it back once.
+	ManifestType:str = None
+	FilePath:Path = None
+	IsChanged:bool = False
+	StagedContent:bytes | None = None
+		#Bytes staged in an unfinished transaction; the parsed state only moves to them once it commits.
+	_content:bytes = None
+	_name:str | None = None
+	_version:SemVer | None = None
+	_isNameLoaded:bool = False
+	_isVersionLoaded:bool = False
+
+	def __init__(self, filePath:Path, content:bytes | None = None) -> None:
+		self.FilePath = filePath
+		if (content is None):
+			content = filePath.read_bytes()
+		self._content = content
+		self.IsChanged = False
+		self.StagedContent = None
+		self._name = None
+		self._version = None
+		self._isNameLoaded = False
+		self._isVersionLoaded = False
+		self.Parse()
+
+	@staticmethod
+	def Open(manifestType:str, filePath:Path) -> "Manifest":
+		manifestClasses:dict[str, type] = {
+			"PyProject": PyProjectManifest,
+			"SQLProject": SQLProjectManifest,
+			"SQLPublishProfile": SQLPublishProfileManifest
+		}
+		if (manifestType not in manifestClasses):
+			raise ValueError(f"Unknown manifest type {manifestType}, expected one of {", ".join(manifestClasses.keys())}")
+		return manifestClasses[manifestType](filePath)
+
+	@staticmethod
+	def ParseVersionText(versionText:str | None) -> SemVer | None:
+		returnValue:SemVer | None = None
+		if (versionText is not None):
+			if (versionText.startswith("v")):
+				versionText = versionText[1::]
+			returnValue = SemVer.parse(versionText)
+		return returnValue
+
+	def GetName(self) -> str | None:
+		if (not self._isNameLoaded):
+			self._name = self.LoadName()
+			self._isNameLoaded = True
+		return self._name
+
+	def GetVersion(self) -> SemVer | None:
+		if (not self._isVersionLoaded):
+			self._version = self.LoadVersion()
+			self._isVersionLoaded = True
+		return self._version
+
+	def SetVersion(self, version:SemVer) -> None:
+		#Only changes the parsed copy; nothing touches the file until Save.
+		if (self.WriteVersion(version)):
+			self._version = version
+			self._isVersionLoaded = True
+			self.IsChanged = True
+
+	def Save(self, transaction:FileTransaction | None = None) -> bool:
+		#With a transaction the new content is only staged; it reaches the file, and this manifest, in EndTransaction.
+		returnValue:bool = False
+		if (self.IsChanged):
+			content:bytes = self.Render()
+			if (transaction is not None):
+				transaction.Write(self.FilePath, content)
+				self.StagedContent = content
+				self.IsChanged = False
+			else:
+				self.FilePath.write_bytes(content)
+				self.SetContent(content)
+			returnValue = True
+		return returnValue
+
+	def EndTransaction(self, isCommitted:bool) -> None:
+		#A committed transaction moves the manifest to the staged bytes; a rolled back one restores what the file still holds.
+		if (self.StagedContent is not None):
+			if (isCommitted):
+				self.SetContent(self.StagedContent)
+			else:
+				self._version = None
+				self._isVersionLoaded = False
+				self.SetContent(self._content)
+			self.StagedContent = None
+
+	def SetContent(self, content:bytes) -> None:
+		#Anything cached from the old bytes, such as offsets, is rebuilt from content.
+		self._content = content
+		self.IsChanged = False
+		self.Parse()
+
+	@abstractmethod
+	def Parse(self) -> None:
+		pass
+
+	@abstractmethod
+	def LoadName(self) -> str | None:
+		pass
+
+	@abstractmethod
+	def LoadVersion(self) -> SemVer | None:
+		pass
+
+	@abstractmethod
+	def WriteVersion(self, version:SemVer) -> bool:
+		pass
+
+	@abstractmethod
+	def Render(self) -> bytes:
+		pass
+
+class PyProjectManifest(Manifest):
+	#A bump replaces only the bytes inside the version string's quotes, so comments, key order and formatting survive.
+	ManifestType:str = "PyProject"
+	KeyPartPattern:re.Pattern = re.compile(rb"[A-Za-z0-9_-]+|\"[^\"\r\n]*\"|'[^'\r\n]*'")
+	TablePattern:re.Pattern = re.compile(rb"[ \t]*(\[\[?)[ \t]*((?:[A-Za-z0-9_-]+|\"[^\"\r\n]*\"|'[^'\r\n]*'|[ \t]*\.[ \t]*)+?)[ \t]*\]\]?[ \t]*(?:#.*)?\r?$")
+	KeyValuePattern:re.Pattern = re.compile(rb"[ \t]*((?:[A-Za-z0-9_-]+|\"[^\"\r\n]*\"|'[^'\r\n]*'|[ \t]*\.[ \t]*)+?)[ \t]*=[ \t]*(?:\"([^\"\\\r\n]*)\"(?!\")|'([^'\r\n]*)'(?!'))")
+	TomlData:dict = None
+	_versionSpan:tuple[int, int] | None = None
+	_isVersionSpanLoaded:bool = False
+	_newVersionText:str | None = None
+
+	def Parse(self) -> None:
+		self.TomlData = tomllib.loads(self._content.decode("utf-8"))
+		self._versionSpan = None
+		self._isVersionSpanLoaded = False
+		self._newVersionText = None
+
+	def GetVersionKeyPath(self) -> tuple[str, ...]:
+		#When "version" is listed in project.dynamic, Poetry 2 keeps the literal version in [tool.poetry].
+		returnValue:tuple[str, ...] = ("project", "version")
+		projectTable:dict = self.TomlData.get("project", dict())
+		if ("version" not in projectTable
+			and "version" in projectTable.get("dynamic", list())):
+			returnValue = ("tool", "poetry", "version")
+		return returnValue
+
+	def GetValue(self, keyPath:tuple[str, ...]):
+		returnValue = self.TomlData
+		for key in keyPath:
+			returnValue = returnValue[key]
+		return returnValue
+
+	def SplitKeyPath(self, keyPath:bytes) -> tuple[str, ...]:
+		return tuple(keyPart.decode("utf-8").strip("\"'") for keyPart in self.KeyPartPattern.findall(keyPath))
+
+	def FindValueSpan(self, keyPath:tuple[str, ...]) -> tuple[int, int] | None:
+		#Byte offsets of a single-line string value, found line by line while tracking table headers and
+		#skipping multi-line strings. None when it is written some other way, such as in an inline table.
+		returnValue:tuple[int, int] | None = None
+		tablePath:tuple[str, ...] | None = tuple()
+		multilineDelimiter:bytes | None = None
+		lineStart:int = 0
+		for line in self._content.split(b"\n"):
+			if (multilineDelimiter is not None):
+				if (line.count(multilineDelimiter) % 2 == 1):
+					multilineDelimiter = None
+			else:
+				tableMatch:re.Match | None = self.TablePattern.match(line)
+				if (tableMatch is not None):
+					tablePath = self.SplitKeyPath(tableMatch[2])
+					if (tableMatch[1] == b"[["):
+						#Keys inside an array of tables are never the one being looked for.
+						tablePath = None
+				else:
+					keyValueMatch:re.Match | None = self.KeyValuePattern.match(line)
+					if (keyValueMatch is not None
+						and tablePath is not None
+						and tablePath + self.SplitKeyPath(keyValueMatch[1]) == keyPath):
+						valueGroup:int = 2
+						if (keyValueMatch[2] is None):
+							valueGroup = 3
+						returnValue = (lineStart + keyValueMatch.start(valueGroup), lineStart + keyValueMatch.end(valueGroup))
+						break
+					for delimiter in [b'"""', b"'''"]:
+						if (line.count(delimiter) % 2 == 1):
+							multilineDelimiter = delimiter
+							break
+			lineStart += len(line) + 1
+		if (returnValue is not None
+			and self._content[returnValue[0]:returnValue[1]].decode("utf-8") != self.GetValue(keyPath)):
+			returnValue = None
+		return returnValue
+
+	def GetVersionSpan(self) -> tuple[int, int] | None:
+		if (not self._isVersionSpanLoaded):
+			self._versionSpan = self.FindValueSpan(self.GetVersionKeyPath())
+			self._isVersionSpanLoaded = True
+		return self._versionSpan
+
+	def LoadName(self) -> str | None:
+		return self.TomlData["project"]["name"]
+
+	def LoadVersion(self) -> SemVer | None:
+		return SemVer.parse(self.GetValue(self.GetVersionKeyPath()))
+
+	def WriteVersion(self, version:SemVer) -> bool:
+		keyPath:tuple[str, ...] = self.GetVersionKeyPath()
+		if (self.GetVersionSpan() is not None):
+			self._newVersionText = str(version)
+		else:
+			#Falls back to a full rewrite, as before, when the value could not be located in the text.
+			self.GetValue(keyPath[:-1])[keyPath[-1]] = str(version)
+		return True
+
+	def Render(self) -> bytes:
+		returnValue:bytes = None
+		if (self._versionSpan is not None
+			and self._newVersionText is not None):
+			valueStart, valueEnd = self._versionSpan
+			returnValue = self._content[:valueStart] + self._newVersionText.encode("utf-8") + self._content[valueEnd:]
+		else:
+			returnValue = tomli_w.dumps(self.TomlData).encode("utf-8")
+		return returnValue
+
+class XMLManifest(Manifest):
+	#A bump replaces only the bytes of the version element's text, so the rest of the file, including its
+	#declaration, BOM, line endings and whitespace, is written back untouched.
+	VersionElementName:str = None
+	Tree:etree._ElementTree | None = None
+	_versionElement:etree._Element | None = None
+	_isVersionElementLoaded:bool = False
+	_versionSpan:tuple[int, int] | None = None
+	_newVersionText:str | None = None
+
+	def Parse(self) -> None:
+		#The tree is built on first lookup.
+		self.Tree = None
+		self._versionElement = None
+		self._isVersionElementLoaded = False
+		self._versionSpan = None
+		self._newVersionText = None
+
+	def __getstate__(self) -> dict:
+		#lxml trees cannot be pickled, so a manifest sent to another process leaves them behind and rebuilds them from its bytes on first use.
+		returnValue:dict = dict(self.__dict__)
+		returnValue.update(Tree=None, _versionElement=None, _isVersionElementLoaded=False, _versionSpan=None)
+		return returnValue
+
+	def GetTree(self) -> etree._ElementTree:
+		if (self.Tree is None):
+			self.Tree = etree.parse(io.BytesIO(self._content))
+		return self.Tree
+
+	def FindElement(self, xpath:etree.XPath) -> etree._Element | None:
+		returnValue:etree._Element | None = None
+		elements:list = xpath(self.GetTree())
+		if (elements is not None and len(elements) > 0):
+			returnValue = elements[0]
+		return returnValue
+
+	def FindText(self, xpath:etree.XPath) -> str | None:
+		returnValue:str | None = None
+		element:etree._Element | None = self.FindElement(xpath)
+		if (element is not None):
+			returnValue = element.text
+		return returnValue
+
+	def IsVersionElement(self, element:etree._Element) -> bool:
+		#Project/ItemGroup/SqlCmdVariable[@Include='DatabaseVersion']/VersionElementName, in any namespace.
+		returnValue:bool = False
+		variableElement:etree._Element | None = element.getparent()
+		if (variableElement is not None
+			and etree.QName(variableElement).localname == "SqlCmdVariable"
+			and variableElement.get("Include") == "DatabaseVersion"):
+			itemGroupElement:etree._Element | None = variableElement.getparent()
+			if (itemGroupElement is not None
+				and etree.QName(itemGroupElement).localname == "ItemGroup"):
+				projectElement:etree._Element | None = itemGroupElement.getparent()
+				returnValue = (projectElement is not None and etree.QName(projectElement).localname == "Project")
+		return returnValue
+
+	def GetVersionElement(self) -> etree._Element | None:
+		if (not self._isVersionElementLoaded):
+			#Walking the elements by tag is far cheaper than the equivalent local-name() XPath on large projects.
+			for element in self.GetTree().getroot().iter(f"{{*}}{self.VersionElementName}"):
+				if (self.IsVersionElement(element)):
+					self._versionElement = element
+					break
+			self._versionSpan = self.FindTextSpan(self._versionElement)
+			self._isVersionElementLoaded = True
+		return self._versionElement
+
+	def FindTextSpan(self, element:etree._Element | None) -> tuple[int, int] | None:
+		#Byte offsets of the element's text, or None when they cannot be pinned down and the tree has to be serialized instead.
+		returnValue:tuple[int, int] | None = None
+		if (element is not None
+			and element.text is not None
+			and element.sourceline is not None
+			and not self._content.startswith((b"\xff\xfe", b"\xfe\xff"))
+			and b"\x00" not in self._content[:4]):
+			lineStart:int = len(self._content) - len(self._content.split(b"\n", element.sourceline - 1)[-1])
+			lineEnd:int = self._content.find(b"\n", lineStart)
+			if (lineEnd < 0):
+				lineEnd = len(self._content)
+			localName:str = etree.QName(element).localname
+			startTagPattern:re.Pattern = re.compile(rb"<(?:[\w.-]+:)?" + re.escape(localName.encode("utf-8")) + rb"(?:\s[^<>]*)?>")
+			#sourceline is the line holding the start tag's closing ">", and a start tag may begin on an earlier line.
+			searchStart:int = max(self._content.rfind(b"<", 0, lineStart), 0)
+			startTagMatches:list[re.Match] = [startTagMatch for startTagMatch in startTagPattern.finditer(self._content, searchStart, lineEnd + 1) if startTagMatch.end() > lineStart]
+			#Several elements of the same name on one line (minified files) are told apart by document order.
+			occurrence:int = 0
+			if (len(startTagMatches) > 1):
+				for otherElement in element.getroottree().getroot().iter(f"{{*}}{localName}"):
+					if (otherElement is element):
+						break
+					if (otherElement.sourceline == element.sourceline):
+						occurrence += 1
+			startTagMatch:re.Match | None = None
+			if (occurrence < len(startTagMatches)):
+				startTagMatch = startTagMatches[occurrence]
+			if (startTagMatch is not None):
+				textStart:int = startTagMatch.end()
+				textEnd:int = self._content.find(b"<", textStart)
+				if (textEnd >= 0
+					and self._content[textStart:textEnd] == element.text.encode("utf-8")):
+					returnValue = (textStart, textEnd)
+		return returnValue
+
+	def LoadVersion(self) -> SemVer | None:
+		returnValue:SemVer | None = None
+		versionElement:etree._Element | None = self.GetVersionElement()
+		if (versionElement is not None):
+			returnValue = self.ParseVersionText(versionElement.text)
+		return returnValue
+
+	def WriteVersion(self, version:SemVer) -> bool:
+		returnValue:bool = False
+		versionElement:etree._Element | None = self.GetVersionElement()
+		if (self._versionSpan is not None):
+			self._newVersionText = f"v{version}"
+			returnValue = True
+		elif (versionElement is not None):
+			#Falls back to serializing the tree, as before, when the text bytes could not be located.
+			versionElement.text = f"v{version}"
+			returnValue = True
+		return returnValue
+
+	def Render(self) -> bytes:
+		returnValue:bytes = None
+		if (self._versionSpan is not None
+			and self._newVersionText is not None):
+			textStart, textEnd = self._versionSpan
+			returnValue = self._content[:textStart] + self._newVersionText.encode("utf-8") + self._content[textEnd:]
+		else:
+			returnValue = etree.tostring(self.GetTree(), pretty_print=True)
+		return returnValue
+
+class SQLProjectManifest(XMLManifest):
+	ManifestType:str = "SQLProject"
+	NameXPath:etree.XPath = etree.XPath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'Name']")
+	VersionElementName:str = "DefaultValue"
+
+	def LoadName(self) -> str | None:
+		return self.FindText(self.NameXPath)
+
+class SQLPublishProfileManifest(XMLManifest):
+	ManifestType:str = "SQLPublishProfile"
+	TargetDatabaseNameXPath:etree.XPath = etree.XPath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetDatabaseName']")
+	TargetConnectionStringXPath:etree.XPath = etree.XPath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetConnectionString']")
+	VersionElementName:str = "Value"
+
+	@staticmethod
+	def ParseSQLServerConnectionString(connectionString:str, removeSensitiveInfo:bool = False) -> dict:
+		returnValue:dict = dict()
+		for keyValue in connectionString.split(";"):
+			keyValue = keyValue.strip()
+			if (keyValue):
+				keyValuePair:list = keyValue.split("=")
+				key:str = ""
+				value:str = ""
+				if (len(keyValuePair) == 2):
+					key = keyValuePair[0].strip()
+					value = keyValuePair[1].strip()
+					returnValue.update({key: value})
+				elif (len(keyValuePair) == 1):
+					key = keyValuePair[0].strip()
+					value = ""
+					returnValue.update({key: value})
+		if (removeSensitiveInfo):
+			returnValue.pop("Password")
+		return returnValue
+
+	def LoadName(self) -> str | None:
+		#[server].[database], the same label VersionScanner has always shown.
+		targetServerName:str = None
+		targetDatabaseName:str = self.FindText(self.TargetDatabaseNameXPath)
+		targetConnectionString:str = self.FindText(self.TargetConnectionStringXPath)
+		if (targetConnectionString is not None):
+			connString:dict = self.ParseSQLServerConnectionString(targetConnectionString)
+			if ("Data Source" in connString.keys()):
+				targetServerName = connString["Data Source"]
+		return f"[{targetServerName}].[{targetDatabaseName}]"
+
+__all__ = ["Manifest", "PyProjectManifest", "XMLManifest", "SQLProjectManifest", "SQLPublishProfileManifest"]
@@ -0,0 +1,241 @@
+from pathlib import Path
+import fnmatch
+import os
+import re
+
+from .Git import Git
+from .ObjectStore import GitObjectStore
+
+class GitIgnoreRule:
+	#One .gitignore line, matched against paths relative to the directory holding the .gitignore.
+	BasePath:str = ""
+	Pattern:re.Pattern = None
+	IsNegated:bool = False
+	IsDirectoryOnly:bool = False
+
+	def __init__(self, basePath:str, pattern:re.Pattern, isNegated:bool, isDirectoryOnly:bool) -> None:
+		self.BasePath = basePath
+		self.Pattern = pattern
+		self.IsNegated = isNegated
+		self.IsDirectoryOnly = isDirectoryOnly
+
+	@staticmethod
+	def TranslateGlob(glob:str) -> str:
+		returnValue:str = ""
+		index:int = 0
+		while (index < len(glob)):
+			character:str = glob[index]
+			if (glob.startswith("**/", index)):
+				returnValue += "(?:.*/)?"
+				index += 3
+			elif (glob.startswith("/**", index)
+				and index + 3 == len(glob)):
+				returnValue += "/.*"
+				index += 3
+			elif (glob.startswith("**", index)):
+				returnValue += ".*"
+				index += 2
+			elif (character == "*"):
+				returnValue += "[^/]*"
+				index += 1
+			elif (character == "?"):
+				returnValue += "[^/]"
+				index += 1
+			elif (character == "["):
+				closeIndex:int = glob.find("]", index + 2)
+				if (closeIndex < 0):
+					returnValue += re.escape(character)
+					index += 1
+				else:
+					characterClass:str = glob[index + 1:closeIndex].replace("\\", "\\\\")
+					if (characterClass.startswith("!")):
+						characterClass = "^" + characterClass[1:]
+					returnValue += f"[{characterClass}]"
+					index = closeIndex + 1
+			elif (character == "\\"
+				and index + 1 < len(glob)):
+				returnValue += re.escape(glob[index + 1])
+				index += 2
+			else:
+				returnValue += re.escape(character)
+				index += 1
+		return returnValue
+
+	@staticmethod
+	def Parse(basePath:str, line:str) -> "GitIgnoreRule | None":
+		returnValue:GitIgnoreRule | None = None
+		line = line.rstrip("\r\n")
+		if (not line.endswith("\\ ")):
+			line = line.rstrip(" ")
+		if (len(line) > 0
+			and not line.startswith("#")):
+			isNegated:bool = line.startswith("!")
+			if (isNegated):
+				line = line[1:]
+			elif (line.startswith("\\!")
+				or line.startswith("\\#")):
+				line = line[1:]
+			isDirectoryOnly:bool = line.endswith("/")
+			line = line.rstrip("/")
+			if (len(line) > 0):
+				#A slash anywhere but the end anchors the pattern to the .gitignore's directory.
+				isAnchored:bool = "/" in line
+				line = line.lstrip("/")
+				expression:str = GitIgnoreRule.TranslateGlob(line)
+				if (not isAnchored):
+					expression = "(?:.*/)?" + expression
+				returnValue = GitIgnoreRule(basePath, re.compile(expression, re.DOTALL), isNegated, isDirectoryOnly)
+		return returnValue
+
+	@staticmethod
+	def ReadFile(basePath:str, filePath:Path) -> list["GitIgnoreRule"]:
+		returnValue:list[GitIgnoreRule] = list[GitIgnoreRule]()
+		try:
+			for line in filePath.read_text(encoding="utf-8", errors="replace").split("\n"):
+				rule:GitIgnoreRule | None = GitIgnoreRule.Parse(basePath, line)
+				if (rule is not None):
+					returnValue.append(rule)
+		except OSError:
+			pass
+		return returnValue
+
+	@staticmethod
+	def IsIgnored(rules:list["GitIgnoreRule"], relativePath:str, isDirectory:bool) -> bool:
+		#The last matching rule wins, so rules are checked from the deepest .gitignore upwards.
+		returnValue:bool = False
+		for rule in reversed(rules):
+			if (not rule.IsDirectoryOnly
+				or isDirectory):
+				candidatePath:str = relativePath
+				if (len(rule.BasePath) > 0):
+					candidatePath = relativePath[len(rule.BasePath) + 1:]
+				if (rule.Pattern.fullmatch(candidatePath) is not None):
+					returnValue = not rule.IsNegated
+					break
+		return returnValue
+
+class ManifestFinder:
+	#Finds every version manifest under a directory in one os.scandir walk.
+	ManifestPatterns:dict[str, str] = {
+		"PyProject": "pyproject.toml",
+		"SQLProject": "*.sqlproj",
+		"SQLPublishProfile": "*.publish.xml"
+	}
+	DefaultIgnoreDirectoryNames:list[str] = [
+		".git", ".hg", ".svn", "node_modules", "bin", "obj",
+		".venv", "venv", "__pycache__", ".tox", ".nox", ".mypy_cache", ".pytest_cache"
+	]
+	DiscoveryModes:list[str] = ["walk", "index"]
+	RootPath:Path = None
+	IgnoreDirectoryNames:set[str] = None
+	UseGitIgnore:bool = True
+	Discovery:str = "walk"
+		#walk: scan the working tree.
+		#index: ask git ls-files, so only tracked manifests are returned.
+
+	def __init__(self, rootPath:Path, ignoreDirectoryNames:list[str] | None = None, useGitIgnore:bool = True, discovery:str = "walk") -> None:
+		if (discovery not in self.DiscoveryModes):
+			raise ValueError(f"Unknown discovery mode {discovery}, expected one of {", ".join(self.DiscoveryModes)}")
+		self.RootPath = rootPath
+		if (ignoreDirectoryNames is None):
+			ignoreDirectoryNames = self.DefaultIgnoreDirectoryNames
+		self.IgnoreDirectoryNames = set(ignoreDirectoryNames)
+		self.UseGitIgnore = useGitIgnore
+		self.Discovery = discovery
+
+	def GetManifestType(self, fileName:str) -> str | None:
+		returnValue:str | None = None
+		for manifestType, pattern in self.ManifestPatterns.items():
+			if (fnmatch.fnmatch(fileName, pattern)):
+				returnValue = manifestType
+				break
+		return returnValue
+
+	def Find(self) -> dict[str, list[Path]]:
+		#Paths per manifest type, each list sorted so results do not depend on directory listing order.
+		returnValue:dict[str, list[Path]] = None
+		if (self.Discovery == "index"):
+			returnValue = self.FindInIndex()
+		else:
+			returnValue = self.FindInWorkingTree()
+		for paths in returnValue.values():
+			paths.sort()
+		return returnValue
+
+	def FindInIndex(self) -> dict[str, list[Path]]:
+		returnValue:dict[str, list[Path]] = {manifestType: list[Path]() for manifestType in self.ManifestPatterns.keys()}
+		pathspecs:list[str] = [f":(glob)**/{pattern}" for pattern in self.ManifestPatterns.values()]
+		with Git(self.RootPath, backend="exec") as gitRepo:
+			for path in gitRepo.ListFiles(pathspecs):
+				manifestType:str | None = self.GetManifestType(path.name)
+				#Tracked files deleted from the working tree are still in the index.
+				if (manifestType is not None
+					and path.is_file()):
+					returnValue[manifestType].append(path)
+		return returnValue
+
+	@staticmethod
+	def GetGlobalConfigPaths() -> list[Path]:
+		#As git reads them: GIT_CONFIG_GLOBAL replaces both, otherwise ~/.gitconfig is read after, and wins over, $XDG_CONFIG_HOME/git/config.
+		returnValue:list[Path] = list[Path]()
+		if ("GIT_CONFIG_GLOBAL" in os.environ):
+			returnValue.append(Path(os.environ["GIT_CONFIG_GLOBAL"]))
+		else:
+			returnValue.append(ManifestFinder.GetXDGConfigPath().joinpath("git", "config"))
+			returnValue.append(Path.home().joinpath(".gitconfig"))
+		return returnValue
+
+	@staticmethod
+	def GetXDGConfigPath() -> Path:
+		returnValue:Path = Path.home().joinpath(".config")
+		if (len(os.environ.get("XDG_CONFIG_HOME", "")) > 0):
+			returnValue = Path(os.environ["XDG_CONFIG_HOME"])
+		return returnValue
+
+	def GetExcludeRules(self) -> list[GitIgnoreRule]:
+		#The patterns git applies below every .gitignore: core.excludesFile first, then info/exclude, which wins over it.
+		returnValue:list[GitIgnoreRule] = list[GitIgnoreRule]()
+		commonDirPath:Path = Git.ResolveCommonDirPath(Git.ResolveGitDirPath(self.RootPath))
+		excludesFile:str | None = None
+		for configPath in [*self.GetGlobalConfigPaths(), commonDirPath.joinpath("config")]:
+			value:str | None = GitObjectStore.ReadConfigValue(configPath, "core", None, "excludesFile")
+			if (value is not None):
+				excludesFile = value
+		excludesFilePath:Path = self.GetXDGConfigPath().joinpath("git", "ignore")
+		if (excludesFile is not None):
+			excludesFilePath = self.RootPath.joinpath(os.path.expanduser(excludesFile))
+		returnValue.extend(GitIgnoreRule.ReadFile("", excludesFilePath))
+		returnValue.extend(GitIgnoreRule.ReadFile("", commonDirPath.joinpath("info", "exclude")))
+		return returnValue
+
+	def FindInWorkingTree(self) -> dict[str, list[Path]]:
+		returnValue:dict[str, list[Path]] = {manifestType: list[Path]() for manifestType in self.ManifestPatterns.keys()}
+		rootRules:list[GitIgnoreRule] = list[GitIgnoreRule]()
+		if (self.UseGitIgnore):
+			rootRules = self.GetExcludeRules()
+		pending:list[tuple[str, str, list[GitIgnoreRule]]] = [(str(self.RootPath), "", rootRules)]
+		while (len(pending) > 0):
+			directoryPath, relativeDirectoryPath, rules = pending.pop()
+			try:
+				entries:list[os.DirEntry] = list(os.scandir(directoryPath))
+			except OSError:
+				continue
+			if (self.UseGitIgnore
+				and any(entry.name == ".gitignore" for entry in entries)):
+				rules = rules + GitIgnoreRule.ReadFile(relativeDirectoryPath, Path(directoryPath, ".gitignore"))
+			for entry in entries:
+				relativePath:str = entry.name
+				if (len(relativeDirectoryPath) > 0):
+					relativePath = f"{relativeDirectoryPath}/{entry.name}"
+				if (entry.is_dir(follow_symlinks=False)):
+					if (entry.name not in self.IgnoreDirectoryNames
+						and not (len(rules) > 0 and GitIgnoreRule.IsIgnored(rules, relativePath, True))):
+						pending.append((entry.path, relativePath, rules))
+				else:
+					manifestType:str | None = self.GetManifestType(entry.name)
+					if (manifestType is not None
+						and not (len(rules) > 0 and GitIgnoreRule.IsIgnored(rules, relativePath, False))):
+						returnValue[manifestType].append(Path(entry.path))
+		return returnValue
+
+__all__ = ["GitIgnoreRule", "ManifestFinder"]
@@ -0,0 +1,708 @@
+from pathlib import Path
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime
+import heapq
+import mmap
+import os
+import struct
+import zlib
+
+class GitPackFile:
+	IndexPath:Path | None = None
+	PackPath:Path | None = None
+	ObjectCount:int = 0
+	_indexMap:mmap.mmap | None = None
+	_packMap:mmap.mmap | None = None
+	_fanout:tuple | None = None
+	_version:int = 2
+
+	def __init__(self, indexPath:Path) -> None:
+		self.IndexPath = indexPath
+		self.PackPath = indexPath.with_suffix(".pack")
+		with open(self.IndexPath, "rb") as indexFile:
+			self._indexMap = mmap.mmap(indexFile.fileno(), 0, access=mmap.ACCESS_READ)
+		with open(self.PackPath, "rb") as packFile:
+			self._packMap = mmap.mmap(packFile.fileno(), 0, access=mmap.ACCESS_READ)
+		if (self._indexMap[:4] == b"\xfftOc"):
+			self._version = struct.unpack(">I", self._indexMap[4:8])[0]
+			self._fanout = struct.unpack(">256I", self._indexMap[8:1032])
+		else:
+			self._version = 1
+			self._fanout = struct.unpack(">256I", self._indexMap[0:1024])
+		self.ObjectCount = self._fanout[255]
+
+	def GetHash(self, index:int) -> bytes:
+		returnValue:bytes = None
+		if (self._version == 1):
+			start:int = 1024 + index * 24 + 4
+		else:
+			start:int = 1032 + index * 20
+		returnValue = self._indexMap[start:start + 20]
+		return returnValue
+
+	def GetOffset(self, index:int) -> int:
+		returnValue:int = 0
+		if (self._version == 1):
+			start:int = 1024 + index * 24
+			returnValue = struct.unpack(">I", self._indexMap[start:start + 4])[0]
+		else:
+			start:int = 1032 + self.ObjectCount * 24 + index * 4
+			returnValue = struct.unpack(">I", self._indexMap[start:start + 4])[0]
+			if (returnValue & 0x80000000):
+				start = 1032 + self.ObjectCount * 28 + (returnValue & 0x7fffffff) * 8
+				returnValue = struct.unpack(">Q", self._indexMap[start:start + 8])[0]
+		return returnValue
+
+	def FindIndex(self, binaryHash:bytes) -> tuple[int, bool]:
+		#Returns (index, found); when not found index is the insertion point.
+		low:int = 0
+		if (binaryHash[0] > 0):
+			low = self._fanout[binaryHash[0] - 1]
+		high:int = self._fanout[binaryHash[0]]
+		while (low < high):
+			middle:int = (low + high) // 2
+			middleHash:bytes = self.GetHash(middle)
+			if (middleHash < binaryHash):
+				low = middle + 1
+			elif (middleHash > binaryHash):
+				high = middle
+			else:
+				return (middle, True)
+		return (low, False)
+
+	def FindOffset(self, binaryHash:bytes) -> int | None:
+		returnValue:int | None = None
+		index, found = self.FindIndex(binaryHash)
+		if (found):
+			returnValue = self.GetOffset(index)
+		return returnValue
+
+	def GetNeighbourHashes(self, binaryHash:bytes) -> list[bytes]:
+		returnValue:list[bytes] = list[bytes]()
+		index, found = self.FindIndex(binaryHash)
+		for neighbour in [index - 1, index + 1 if found else index]:
+			if (0 <= neighbour < self.ObjectCount):
+				returnValue.append(self.GetHash(neighbour))
+		return returnValue
+
+	def ReadEntryHeader(self, offset:int) -> tuple[int, int, int]:
+		#Returns (type, size, data offset) for the pack entry at offset.
+		byte:int = self._packMap[offset]
+		objectType:int = (byte >> 4) & 0x07
+		size:int = byte & 0x0f
+		shift:int = 4
+		offset += 1
+		while (byte & 0x80):
+			byte = self._packMap[offset]
+			size |= (byte & 0x7f) << shift
+			shift += 7
+			offset += 1
+		return (objectType, size, offset)
+
+	def ReadOffsetDelta(self, offset:int) -> tuple[int, int]:
+		#Returns (negative base offset, data offset) for an OFS_DELTA entry.
+		byte:int = self._packMap[offset]
+		value:int = byte & 0x7f
+		offset += 1
+		while (byte & 0x80):
+			byte = self._packMap[offset]
+			value = ((value + 1) << 7) | (byte & 0x7f)
+			offset += 1
+		return (value, offset)
+
+	def Inflate(self, offset:int, size:int) -> bytes:
+		returnValue:bytes = None
+		decompressor = zlib.decompressobj()
+		chunks:list[bytes] = list[bytes]()
+		view:memoryview = memoryview(self._packMap)
+		chunkSize:int = max(size + 64, 4096)
+		try:
+			while (not decompressor.eof
+				and offset < len(self._packMap)):
+				chunks.append(decompressor.decompress(view[offset:offset + chunkSize]))
+				offset += chunkSize
+		finally:
+			view.release()
+		returnValue = b"".join(chunks)
+		return returnValue
+
+	def ReadBytes(self, offset:int, length:int) -> bytes:
+		return self._packMap[offset:offset + length]
+
+	def Close(self) -> None:
+		if (self._indexMap is not None):
+			self._indexMap.close()
+			self._indexMap = None
+		if (self._packMap is not None):
+			self._packMap.close()
+			self._packMap = None
+
+class GitObjectStore:
+	ObjectTypes:dict = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+	RepoPath:Path | None = None
+	GitDirPath:Path | None = None
+	CommonDirPath:Path | None = None
+	DeltaBaseCacheLimit:int = 16 * 1024 * 1024
+	LimitSlop:int = 5
+	CommitCacheLimit:int = 32 * 1024 * 1024
+		#Bytes of raw commit objects kept parsed; least recently used commits are dropped first.
+	Packs:list[GitPackFile] | None = None
+	_packDirectoryStat:tuple | None = None
+	_deltaBaseCache:OrderedDict | None = None
+	_deltaBaseCacheSize:int = 0
+	_commitCache:OrderedDict | None = None
+	_commitCacheSize:int = 0
+	_packedRefs:dict[str, str] | None = None
+	_packedRefsStat:tuple | None = None
+	_shallowCommits:set[str] | None = None
+	_shallowStat:tuple | None = None
+
+	def __init__(self, repoPath:Path, deltaBaseCacheLimit:int | None = None, commitCacheLimit:int | None = None) -> None:
+		self.RepoPath = repoPath
+		self.GitDirPath = repoPath.joinpath(".git")
+		if (self.GitDirPath.is_file()):
+			gitDir:str = self.GitDirPath.read_text().strip().removeprefix("gitdir:").strip()
+			self.GitDirPath = repoPath.joinpath(gitDir).resolve()
+		self.CommonDirPath = self.GitDirPath
+		if (self.GitDirPath.joinpath("commondir").exists()):
+			self.CommonDirPath = self.GitDirPath.joinpath(self.GitDirPath.joinpath("commondir").read_text().strip()).resolve()
+		if (deltaBaseCacheLimit is not None):
+			self.DeltaBaseCacheLimit = deltaBaseCacheLimit
+		if (commitCacheLimit is not None):
+			self.CommitCacheLimit = commitCacheLimit
+		self._deltaBaseCache = OrderedDict()
+		self._deltaBaseCacheSize = 0
+		self._commitCache = OrderedDict()
+		self._commitCacheSize = 0
+		self._packedRefs = None
+		self._packedRefsStat = None
+		self._shallowCommits = None
+		self._shallowStat = None
+		self._packDirectoryStat = None
+		self.Packs = None
+
+	def Close(self) -> None:
+		if (self.Packs is not None):
+			for pack in self.Packs:
+				pack.Close()
+			self.Packs = None
+		self._packDirectoryStat = None
+		self._deltaBaseCache.clear()
+		self._deltaBaseCacheSize = 0
+		self.ClearCommitCache()
+
+	def GetPacks(self) -> list[GitPackFile]:
+		if (self.Packs is None):
+			self.Packs = list[GitPackFile]()
+			self.AddNewPacks()
+		return self.Packs
+
+	def AddNewPacks(self) -> bool:
+		#Opens packs written since the directory was last listed, such as by a concurrent fetch or repack.
+		#Packs already open stay mapped; a repacked-away pack still reads correctly until Close.
+		returnValue:bool = False
+		packDirectory:Path = self.CommonDirPath.joinpath("objects", "pack")
+		packDirectoryStat:tuple | None = None
+		if (packDirectory.exists()):
+			stat = packDirectory.stat()
+			packDirectoryStat = (stat.st_mtime_ns, stat.st_ino)
+		if (packDirectoryStat != self._packDirectoryStat):
+			self._packDirectoryStat = packDirectoryStat
+			openIndexPaths:set[Path] = set(pack.IndexPath for pack in self.Packs)
+			if (packDirectoryStat is not None):
+				for indexPath in sorted(packDirectory.glob("*.idx")):
+					if (indexPath not in openIndexPaths
+						and indexPath.with_suffix(".pack").exists()):
+						self.Packs.append(GitPackFile(indexPath))
+						returnValue = True
+		return returnValue
+
+	def CacheDeltaBase(self, key:tuple, value:tuple[str, bytes]) -> None:
+		if (len(value[1]) <= self.DeltaBaseCacheLimit):
+			if (key in self._deltaBaseCache):
+				self._deltaBaseCacheSize -= len(self._deltaBaseCache.pop(key)[1])
+			self._deltaBaseCache[key] = value
+			self._deltaBaseCacheSize += len(value[1])
+			while (self._deltaBaseCacheSize > self.DeltaBaseCacheLimit):
+				evicted:tuple[str, bytes] = self._deltaBaseCache.popitem(last=False)[1]
+				self._deltaBaseCacheSize -= len(evicted[1])
+
+	def ApplyDelta(self, base:bytes, delta:bytes) -> bytes:
+		result:bytearray = bytearray()
+		position:int = 0
+		for sizeIndex in range(2):
+			byte:int = 0x80
+			while (byte & 0x80):
+				byte = delta[position]
+				position += 1
+		deltaLength:int = len(delta)
+		while (position < deltaLength):
+			opcode:int = delta[position]
+			position += 1
+			if (opcode & 0x80):
+				copyOffset:int = 0
+				copySize:int = 0
+				for bit in range(4):
+					if (opcode & (1 << bit)):
+						copyOffset |= delta[position] << (bit * 8)
+						position += 1
+				for bit in range(3):
+					if (opcode & (1 << (4 + bit))):
+						copySize |= delta[position] << (bit * 8)
+						position += 1
+				if (copySize == 0):
+					copySize = 0x10000
+				result += base[copyOffset:copyOffset + copySize]
+			elif (opcode > 0):
+				result += delta[position:position + opcode]
+				position += opcode
+			else:
+				raise Exception("Invalid Delta Opcode")
+		return bytes(result)
+
+	def CacheCommit(self, commitHash:str, value:tuple[bytes, list[str], int, str]) -> None:
+		if (commitHash in self._commitCache):
+			self._commitCacheSize -= len(self._commitCache.pop(commitHash)[0])
+		self._commitCache[commitHash] = value
+		self._commitCacheSize += len(value[0])
+		while (self._commitCacheSize > self.CommitCacheLimit
+			and len(self._commitCache) > 1):
+			evicted:tuple[bytes, list[str], int, str] = self._commitCache.popitem(last=False)[1]
+			self._commitCacheSize -= len(evicted[0])
+
+	def ClearCommitCache(self) -> None:
+		self._commitCache.clear()
+		self._commitCacheSize = 0
+
+	def ReadPackedObject(self, pack:GitPackFile, offset:int) -> tuple[str, bytes]:
+		returnValue:tuple[str, bytes] | None = None
+		#Delta chains are unwound iteratively so long chains do not exhaust the stack.
+		chain:list[tuple[tuple, bytes]] = list[tuple[tuple, bytes]]()
+		baseKey:tuple | None = None
+		currentPack:GitPackFile = pack
+		currentOffset:int = offset
+		while (returnValue is None):
+			currentKey:tuple = (currentPack.PackPath, currentOffset)
+			if (currentKey in self._deltaBaseCache):
+				self._deltaBaseCache.move_to_end(currentKey)
+				returnValue = self._deltaBaseCache[currentKey]
+				break
+			objectType, size, dataOffset = currentPack.ReadEntryHeader(currentOffset)
+			if (objectType in self.ObjectTypes):
+				returnValue = (self.ObjectTypes[objectType], currentPack.Inflate(dataOffset, size))
+				baseKey = currentKey
+			elif (objectType == 6):
+				baseDistance, dataOffset = currentPack.ReadOffsetDelta(dataOffset)
+				chain.append((currentKey, currentPack.Inflate(dataOffset, size)))
+				currentOffset = currentOffset - baseDistance
+			elif (objectType == 7):
+				baseHash:bytes = currentPack.ReadBytes(dataOffset, 20)
+				chain.append((currentKey, currentPack.Inflate(dataOffset + 20, size)))
+				location:tuple[GitPackFile, int] | None = self.FindPackedObject(baseHash)
+				if (location is None):
+					returnValue = self.ReadLooseObject(baseHash.hex())
+					if (returnValue is None):
+						raise Exception(f"Delta Base Not Found {baseHash.hex()}")
+				else:
+					currentPack, currentOffset = location
+			else:
+				raise Exception(f"Invalid Pack Object Type {objectType}")
+		for deltaKey, delta in reversed(chain):
+			if (baseKey is not None):
+				self.CacheDeltaBase(baseKey, returnValue)
+			returnValue = (returnValue[0], self.ApplyDelta(returnValue[1], delta))
+			baseKey = deltaKey
+		return returnValue
+
+	def FindPackedObject(self, binaryHash:bytes) -> tuple[GitPackFile, int] | None:
+		returnValue:tuple[GitPackFile, int] | None = None
+		for pack in self.GetPacks():
+			offset:int | None = pack.FindOffset(binaryHash)
+			if (offset is not None):
+				returnValue = (pack, offset)
+				break
+		return returnValue
+
+	def ReadLooseObject(self, objectHash:str) -> tuple[str, bytes] | None:
+		returnValue:tuple[str, bytes] | None = None
+		objectPath:Path = self.CommonDirPath.joinpath("objects", objectHash[:2], objectHash[2:])
+		if (objectPath.exists()):
+			data:bytes = zlib.decompress(objectPath.read_bytes())
+			header, separator, content = data.partition(b"\0")
+			returnValue = (header.split(b" ")[0].decode(), content)
+		return returnValue
+
+	def ReadObject(self, objectHash:str) -> tuple[str, bytes] | None:
+		#Returns (type, content) for a full hex object hash, or None when the object does not exist.
+		returnValue:tuple[str, bytes] | None = None
+		location:tuple[GitPackFile, int] | None = self.FindPackedObject(bytes.fromhex(objectHash))
+		if (location is not None):
+			returnValue = self.ReadPackedObject(location[0], location[1])
+		else:
+			returnValue = self.ReadLooseObject(objectHash)
+			if (returnValue is None
+				and self.AddNewPacks()):
+				#A concurrent repack may have moved the object into a pack written since the packs were listed.
+				location = self.FindPackedObject(bytes.fromhex(objectHash))
+				if (location is not None):
+					returnValue = self.ReadPackedObject(location[0], location[1])
+		return returnValue
+
+	def GetPackedRefs(self) -> dict[str, str]:
+		packedRefsPath:Path = self.CommonDirPath.joinpath("packed-refs")
+		packedRefsStat:tuple | None = None
+		if (packedRefsPath.exists()):
+			stat = packedRefsPath.stat()
+			packedRefsStat = (stat.st_size, stat.st_mtime_ns)
+		if (self._packedRefs is None
+			or packedRefsStat != self._packedRefsStat):
+			self._packedRefs = dict[str, str]()
+			self._packedRefsStat = packedRefsStat
+			if (packedRefsStat is not None):
+				for line in packedRefsPath.read_text().split("\n"):
+					if (len(line) > 0
+						and not line.startswith("#")
+						and not line.startswith("^")):
+						objectHash, separator, refName = line.partition(" ")
+						self._packedRefs[refName] = objectHash
+		return self._packedRefs
+
+	def GetShallowCommits(self) -> set[str]:
+		#Commits a shallow clone was cut at; like git, they are treated as having no parents.
+		shallowPath:Path = self.CommonDirPath.joinpath("shallow")
+		shallowStat:tuple | None = None
+		if (shallowPath.exists()):
+			stat = shallowPath.stat()
+			shallowStat = (stat.st_size, stat.st_mtime_ns)
+		if (self._shallowCommits is None
+			or shallowStat != self._shallowStat):
+			if (self._shallowCommits is not None):
+				#A deepened or unshallowed clone has parents the cached commits do not list.
+				self.ClearCommitCache()
+			self._shallowCommits = set[str]()
+			self._shallowStat = shallowStat
+			if (shallowStat is not None):
+				self._shallowCommits.update(line.strip() for line in shallowPath.read_text().split("\n") if len(line.strip()) > 0)
+		return self._shallowCommits
+
+	def GetAbbreviatedHash(self, objectHash:str, minimumLength:int = 7) -> str:
+		#Shortest prefix of at least minimumLength that no other object shares, the way git abbreviates %h.
+		returnValue:str = None
+		length:int = minimumLength
+		others:list[str] = list[str]()
+		for pack in self.GetPacks():
+			others.extend(neighbour.hex() for neighbour in pack.GetNeighbourHashes(bytes.fromhex(objectHash)))
+		looseDirectory:Path = self.CommonDirPath.joinpath("objects", objectHash[:2])
+		if (looseDirectory.exists()):
+			others.extend(objectHash[:2] + name for name in os.listdir(looseDirectory))
+		for other in others:
+			if (other != objectHash):
+				commonLength:int = 0
+				while (commonLength < 40
+					and other[commonLength] == objectHash[commonLength]):
+					commonLength += 1
+				length = max(length, commonLength + 1)
+		returnValue = objectHash[:length]
+		return returnValue
+
+	def GetRefs(self, prefix:str = "refs/") -> dict[str, str]:
+		returnValue:dict[str, str] = dict[str, str]()
+		for refName, objectHash in self.GetPackedRefs().items():
+			if (refName.startswith(prefix)):
+				returnValue[refName] = objectHash
+		refsDirectory:Path = self.CommonDirPath.joinpath("refs")
+		if (refsDirectory.exists()):
+			for refPath in refsDirectory.rglob("*"):
+				if (refPath.is_file()):
+					refName:str = "refs/" + refPath.relative_to(refsDirectory).as_posix()
+					if (refName.startswith(prefix)):
+						refValue:str | None = self.ReadRef(refName)
+						if (refValue is not None):
+							returnValue[refName] = refValue
+		return returnValue
+
+	def ReadRef(self, refName:str) -> str | None:
+		returnValue:str | None = None
+		for depth in range(10):
+			refPath:Path = self.GitDirPath.joinpath(refName)
+			if (not refPath.is_file()):
+				refPath = self.CommonDirPath.joinpath(refName)
+			if (refPath.is_file()):
+				value:str = refPath.read_text().strip()
+				if (value.startswith("ref:")):
+					refName = value[4:].strip()
+					continue
+				returnValue = value
+			else:
+				returnValue = self.GetPackedRefs().get(refName)
+			break
+		return returnValue
+
+	def PeelToCommit(self, objectHash:str | None) -> str | None:
+		returnValue:str | None = None
+		while (objectHash is not None):
+			gitObject:tuple[str, bytes] | None = self.ReadObject(objectHash)
+			if (gitObject is None):
+				objectHash = None
+			elif (gitObject[0] == "tag"):
+				objectHash = gitObject[1][7:47].decode()
+			elif (gitObject[0] == "commit"):
+				returnValue = objectHash
+				objectHash = None
+			else:
+				objectHash = None
+		return returnValue
+
+	def ResolveRevision(self, revision:str) -> str | None:
+		#Supports full hashes, HEAD, ref names, ^{commit}/^{} peeling and ~n/^ first-parent suffixes.
+		returnValue:str | None = None
+		suffixes:list[str] = list[str]()
+		for suffix in ("^{commit}", "^{}"):
+			if (revision.endswith(suffix)):
+				revision = revision[:-len(suffix)]
+		while (len(revision) > 0
+			and ("~" in revision or revision.endswith("^"))):
+			if (revision.endswith("^")):
+				suffixes.insert(0, "1")
+				revision = revision[:-1]
+			else:
+				revision, separator, count = revision.rpartition("~")
+				suffixes.insert(0, count if len(count) > 0 else "1")
+		if (len(revision) == 40
+			and all(character in "0123456789abcdef" for character in revision.lower())):
+			returnValue = self.PeelToCommit(revision.lower())
+		else:
+			for refName in (revision, f"refs/{revision}", f"refs/tags/{revision}", f"refs/heads/{revision}", f"refs/remotes/{revision}", f"refs/remotes/{revision}/HEAD"):
+				refValue:str | None = self.ReadRef(refName)
+				if (refValue is not None):
+					returnValue = self.PeelToCommit(refValue)
+					break
+		for count in suffixes:
+			for step in range(int(count)):
+				if (returnValue is not None):
+					parents:list[str] = self.GetCommit(returnValue)[1]
+					returnValue = parents[0] if len(parents) > 0 else None
+		return returnValue
+
+	def GetCommit(self, commitHash:str) -> tuple[bytes, list[str], int, str]:
+		#Returns (raw object, parent hashes, committer epoch, tree hash) and memoizes the parsed header within CommitCacheLimit.
+		returnValue:tuple[bytes, list[str], int, str] | None = self._commitCache.get(commitHash)
+		if (returnValue is not None):
+			self._commitCache.move_to_end(commitHash)
+		else:
+			gitObject:tuple[str, bytes] | None = self.ReadObject(commitHash)
+			if (gitObject is None
+				or gitObject[0] != "commit"):
+				raise Exception(f"Commit Not Found {commitHash}")
+			parents:list[str] = list[str]()
+			committerDate:int = 0
+			treeHash:str = ""
+			headerText:bytes = gitObject[1].partition(b"\n\n")[0]
+			for line in headerText.split(b"\n"):
+				if (line.startswith(b"parent ")):
+					parents.append(line[7:47].decode())
+				elif (line.startswith(b"tree ")):
+					treeHash = line[5:45].decode()
+				elif (line.startswith(b"committer ")):
+					committerDate = int(line.rsplit(b" ", 2)[1])
+			if (commitHash in self.GetShallowCommits()):
+				parents = list[str]()
+			returnValue = (gitObject[1], parents, committerDate, treeHash)
+			self.CacheCommit(commitHash, returnValue)
+		return returnValue
+
+	def WalkCommits(self,
+					includeHashes:list[str],
+					excludeHashes:list[str] | None = None,
+					lastNCommits:int | None = None,
+					afterDateTime:datetime | None = None,
+					beforeDateTime:datetime | None = None,
+					excludeMergeCommits:bool | None = None,
+					rootCommitsOnly:bool | None = None
+				):
+		#Yields (hash, raw object, parents) newest first, the same order git log uses by default.
+		#Without excluded revisions commits stream as they are reached; with them the range is limited first.
+		commitHashes:Iterable[str] = None
+		if (excludeHashes is not None
+			and len(excludeHashes) > 0):
+			commitHashes = self.LimitCommits(includeHashes, excludeHashes)
+		else:
+			commitHashes = self.IterCommitHashes(includeHashes)
+		yielded:int = 0
+		for commitHash in commitHashes:
+			if (lastNCommits is not None
+				and yielded >= lastNCommits):
+				break
+			raw, parents, committerDate, treeHash = self.GetCommit(commitHash)
+			if (excludeMergeCommits is not None
+				and len(parents) > 1):
+				continue
+			if (rootCommitsOnly is not None
+				and len(parents) > 0):
+				continue
+			if (afterDateTime is not None
+				and committerDate < afterDateTime.timestamp()):
+				continue
+			if (beforeDateTime is not None
+				and committerDate > beforeDateTime.timestamp()):
+				continue
+			yielded += 1
+			yield (commitHash, raw, parents)
+
+	def IterCommitHashes(self, includeHashes:list[str]):
+		#Every commit reachable from includeHashes, newest committer date first.
+		queue:list[tuple[int, int, str]] = list[tuple[int, int, str]]()
+		seen:set[str] = set[str]()
+		for commitHash in includeHashes:
+			if (commitHash not in seen):
+				seen.add(commitHash)
+				heapq.heappush(queue, (-self.GetCommit(commitHash)[2], len(seen), commitHash))
+		while (len(queue) > 0):
+			negativeDate, order, commitHash = heapq.heappop(queue)
+			for parentHash in self.GetCommit(commitHash)[1]:
+				if (parentHash not in seen):
+					seen.add(parentHash)
+					heapq.heappush(queue, (-self.GetCommit(parentHash)[2], len(seen), parentHash))
+			yield commitHash
+
+	def LimitCommits(self, includeHashes:list[str], excludeHashes:list[str]) -> list[str]:
+		#git's limit_list: the range is fully marked before anything is returned, so a commit reachable
+		#from an excluded revision is left out even when skewed committer dates reach it late.
+		#The excluded walk goes on while it is newer than the oldest commit kept, then LimitSlop commits more.
+		returnValue:list[str] = list[str]()
+		uninteresting:dict[str, bool] = dict[str, bool]()
+		queue:list[tuple[int, int, str]] = list[tuple[int, int, str]]()
+		popped:set[str] = set[str]()
+		interestingPending:int = 0
+		slop:int = self.LimitSlop
+		oldestDate:int | None = None
+		for commitHash, isUninteresting in [(commitHash, True) for commitHash in excludeHashes] + [(commitHash, False) for commitHash in includeHashes]:
+			if (commitHash not in uninteresting):
+				uninteresting[commitHash] = isUninteresting
+				if (not isUninteresting):
+					interestingPending += 1
+				heapq.heappush(queue, (-self.GetCommit(commitHash)[2], len(uninteresting), commitHash))
+		while (len(queue) > 0
+			and slop > 0):
+			negativeDate, order, commitHash = heapq.heappop(queue)
+			popped.add(commitHash)
+			isUninteresting:bool = uninteresting[commitHash]
+			if (not isUninteresting):
+				interestingPending -= 1
+			parents:list[str] = self.GetCommit(commitHash)[1]
+			for parentHash in parents:
+				if (parentHash not in uninteresting):
+					uninteresting[parentHash] = isUninteresting
+					if (not isUninteresting):
+						interestingPending += 1
+					heapq.heappush(queue, (-self.GetCommit(parentHash)[2], len(uninteresting), parentHash))
+			if (isUninteresting):
+				interestingPending -= self.MarkUninteresting(parents, uninteresting, popped)
+				if (len(queue) > 0
+					and oldestDate is not None
+					and -queue[0][0] >= oldestDate):
+					slop = self.LimitSlop
+				elif (interestingPending > 0):
+					slop = self.LimitSlop
+				else:
+					slop -= 1
+			else:
+				oldestDate = -negativeDate
+				returnValue.append(commitHash)
+		return [commitHash for commitHash in returnValue if not uninteresting[commitHash]]
+
+	def MarkUninteresting(self, commitHashes:list[str], uninteresting:dict[str, bool], popped:set[str]) -> int:
+		#Marks commitHashes and, through the commits already walked, their ancestors; returns how many still queued were marked.
+		returnValue:int = 0
+		pending:list[str] = list(commitHashes)
+		while (len(pending) > 0):
+			commitHash:str = pending.pop()
+			if (uninteresting.get(commitHash) is False):
+				uninteresting[commitHash] = True
+				if (commitHash in popped):
+					pending.extend(self.GetCommit(commitHash)[1])
+				else:
+					returnValue += 1
+		return returnValue
+
+	def ReadTree(self, treeHash:str) -> list[tuple[str, str, str]]:
+		#Returns (mode, name, hash) entries.
+		returnValue:list[tuple[str, str, str]] = list[tuple[str, str, str]]()
+		gitObject:tuple[str, bytes] | None = self.ReadObject(treeHash)
+		if (gitObject is not None):
+			data:bytes = gitObject[1]
+			position:int = 0
+			while (position < len(data)):
+				spaceIndex:int = data.index(b" ", position)
+				nullIndex:int = data.index(b"\0", spaceIndex)
+				returnValue.append((
+					data[position:spaceIndex].decode(),
+					data[spaceIndex + 1:nullIndex].decode(errors="replace"),
+					data[nullIndex + 1:nullIndex + 21].hex()))
+				position = nullIndex + 21
+		return returnValue
+
+	def DiffTrees(self, oldTreeHash:str | None, newTreeHash:str | None, prefix:str = "") -> list[str]:
+		#Recursive equivalent of git diff-tree -r --name-only, unchanged subtrees are skipped by hash.
+		returnValue:list[str] = list[str]()
+		if (oldTreeHash != newTreeHash):
+			oldEntries:dict = dict()
+			newEntries:dict = dict()
+			if (oldTreeHash is not None):
+				oldEntries = {name: (mode, entryHash) for mode, name, entryHash in self.ReadTree(oldTreeHash)}
+			if (newTreeHash is not None):
+				newEntries = {name: (mode, entryHash) for mode, name, entryHash in self.ReadTree(newTreeHash)}
+			for name in sorted(oldEntries.keys() | newEntries.keys()):
+				oldEntry:tuple | None = oldEntries.get(name)
+				newEntry:tuple | None = newEntries.get(name)
+				if (oldEntry == newEntry):
+					continue
+				oldIsTree:bool = oldEntry is not None and oldEntry[0] == "40000"
+				newIsTree:bool = newEntry is not None and newEntry[0] == "40000"
+				if (oldIsTree or newIsTree):
+					returnValue.extend(self.DiffTrees(
+						oldEntry[1] if oldIsTree else None,
+						newEntry[1] if newIsTree else None,
+						f"{prefix}{name}/"))
+				if ((oldEntry is not None and not oldIsTree)
+					or (newEntry is not None and not newIsTree)):
+					returnValue.append(f"{prefix}{name}")
+		return returnValue
+
+	def GetCommitFiles(self, commitHash:str, includeRoot:bool = True) -> list[str]:
+		#Like git log --name-only, a root commit lists every file; without includeRoot it lists none, like git diff-tree.
+		returnValue:list[str] = list[str]()
+		raw, parents, committerDate, treeHash = self.GetCommit(commitHash)
+		if (len(parents) == 0
+			and includeRoot):
+			returnValue = self.DiffTrees(None, treeHash)
+		elif (len(parents) == 1):
+			returnValue = self.DiffTrees(self.GetCommit(parents[0])[3], treeHash)
+		return returnValue
+
+	def GetConfigValue(self, section:str, subsection:str | None, key:str) -> str | None:
+		return GitObjectStore.ReadConfigValue(self.CommonDirPath.joinpath("config"), section, subsection, key)
+
+	@staticmethod
+	def ReadConfigValue(configPath:Path, section:str, subsection:str | None, key:str) -> str | None:
+		#The last value of key in one git config file, or None when the file or the key is missing.
+		returnValue:str | None = None
+		if (configPath.is_file()):
+			header:str = f"[{section}]"
+			if (subsection is not None):
+				header = f"[{section} \"{subsection}\"]"
+			isInSection:bool = False
+			for line in configPath.read_text().split("\n"):
+				line = line.strip()
+				if (line.startswith("[")):
+					isInSection = line.lower().startswith(header.lower()) if subsection is None else line.startswith(header)
+				elif (isInSection
+					and "=" in line):
+					name, separator, value = line.partition("=")
+					if (name.strip().lower() == key.lower()):
+						returnValue = value.strip().strip("\"")
+		return returnValue
+
+__all__ = ["GitPackFile", "GitObjectStore"]
@@ -1,18 +1,33 @@
 from FancyBoxes import *
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import io
 import json
+import os
+import re
+import sys
+import tempfile
+import time
+import warnings
+from array import array
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
-import tomllib
-import tomli_w
+from collections import Counter
+from collections.abc import Iterable
+from typing import TextIO
 from semver.version import Version as SemVer
 import datetime
 from enum import Enum
 from termcolor import cprint, colored
-from lxml import etree
 
 from .Git import Git
 from .Git import GitRepoMeta
+from .ManifestFinder import ManifestFinder
+from .Manifest import Manifest, SQLPublishProfileManifest
+from .FileTransaction import FileTransaction
 
 class CommitType(Enum):
 	Unknown = 0
@@ -56,27 +71,35 @@ class VersionSegment(Enum):
 	Prerelease = 5
 
 class ConventionalCommitFooter:
-	Tag:str | None = None
-	Value:str | None = None
+	__slots__ = ("Tag", "Value")
+	Tag:str | None
+	Value:str | None
 
 	def __init__(self, tag:str, value:str) -> None:
 		self.Tag = tag
 		self.Value = value
 
 class ConventionalCommit:
-	Hash:str | None = None
-	AbbreviatedHash:str | None = None
-	CommitterDate:datetime.datetime | None = None
-	Subject:str | None = None
-	Body:str | None = None
-	Type:CommitType = CommitType.Unknown
-	Scope:str | None = None
-	IsBreakingChange:bool = False
-	BreakingChangeDescription:str | None = None
-	Description:str | None = None
-	Paragraphs:list[str] | None = []
-	Footers:list[ConventionalCommitFooter] | None = []
-	Files:list[str] | None = []
+	GitAttributes:list[str] = ["Hash", "AbbreviatedHash", "CommitterDate_IS08601Strict", "Subject", "Body"]
+	CommitTypeNames:dict[str, CommitType] = {commitType.name.upper(): commitType for commitType in CommitType if commitType != CommitType.Unknown}
+	SubjectPattern:re.Pattern = re.compile(r"(\w+)(?:\(([^():]*)\))?(!)?:(.*)", re.DOTALL)
+
+	#Slotted, so the attributes below are per instance and assigned in __init__ rather than shared class defaults.
+	__slots__ = ("Hash", "AbbreviatedHash", "CommitterDate", "Subject", "Body", "Type", "Scope", "IsBreakingChange",
+		"BreakingChangeDescription", "Description", "Paragraphs", "Footers", "Files")
+	Hash:str | None
+	AbbreviatedHash:str | None
+	CommitterDate:datetime.datetime | None
+	Subject:str | None
+	Body:str | None
+	Type:CommitType
+	Scope:str | None
+	IsBreakingChange:bool
+	BreakingChangeDescription:str | None
+	Description:str | None
+	Paragraphs:list[str] | None
+	Footers:list[ConventionalCommitFooter] | None
+	Files:list[str] | None
 
 	def __init__(self,
 			hash:str| None = None,
@@ -87,6 +110,14 @@ class ConventionalCommit:
 			files:list[str] | None = None) -> None:
 		self.Hash = hash
 		self.AbbreviatedHash = abbreviatedHash
+		self.CommitterDate = None
+		self.Type = CommitType.Unknown
+		self.Scope = None
+		self.IsBreakingChange = False
+		self.BreakingChangeDescription = None
+		self.Description = None
+		self.Paragraphs = list[str]()
+		self.Footers = list[ConventionalCommitFooter]()
 		if isinstance(committerDate, datetime.datetime):
 			self.CommitterDate = committerDate
 		elif isinstance(committerDate, str):
@@ -105,92 +136,286 @@ class ConventionalCommit:
 			self.Files = None
 
 	def TryParseCommitType(self, value:str) -> CommitType:
-		returnValue:CommitType = CommitType.Unknown
-		match value.upper():
-			case "FEAT": returnValue = CommitType.Feat
-			case "FIX": returnValue = CommitType.Fix
-			case "DOCS": returnValue = CommitType.Docs
-			case "STYLE": returnValue = CommitType.Style
-			case "REFACTOR": returnValue = CommitType.Refactor
-			case "PERF": returnValue = CommitType.Perf
-			case "TEST": returnValue = CommitType.Test
-			case "BUILD": returnValue = CommitType.Build
-			case "CI": returnValue = CommitType.CI
-			case "CHORE": returnValue = CommitType.Chore
-			case "REVERT": returnValue = CommitType.Revert
-			case _: returnValue = CommitType.Unknown
-		return returnValue
+		return ConventionalCommit.CommitTypeNames.get(value.upper(), CommitType.Unknown)
 
 	def ParseSubject(self) -> None:
+		#<type>[(<scope>)][!]:<description>; anything else is CommitType.Unknown with the whole subject as its description.
 		self.Type = CommitType.Unknown
 		self.Scope = None
 		self.IsBreakingChange = False
 		self.BreakingChangeDescription = None
 		self.Description= None
-		typeScopeBreak = self.Subject[:self.Subject.index(":")]
-		self.IsBreakingChange = typeScopeBreak.endswith("!")
-		self.Description = self.Subject[self.Subject.index(":")+1:].strip()
-		if ("(" in typeScopeBreak):
-			self.Type = self.TryParseCommitType(typeScopeBreak[:typeScopeBreak.index("(")])
+		match:re.Match | None = ConventionalCommit.SubjectPattern.match(self.Subject)
+		if (match is not None):
+			self.Type = ConventionalCommit.CommitTypeNames.get(match.group(1).upper(), CommitType.Unknown)
+			self.Scope = match.group(2)
+			self.IsBreakingChange = match.group(3) is not None
+			self.Description = match.group(4).strip()
 		else:
-			if (self.IsBreakingChange):
-				self.Type = self.TryParseCommitType(typeScopeBreak[:(len(typeScopeBreak) - 1)])
-			else:
-				self.Type = self.TryParseCommitType(typeScopeBreak)
-		if ("(" in typeScopeBreak
-			and ")" in typeScopeBreak):
-			self.Scope = typeScopeBreak[typeScopeBreak.index("(")+1:typeScopeBreak.index(")")]
+			#Not a conventional commit (merges, "Initial commit", "feat(a:b): c", ...).
+			self.Description = self.Subject.strip()
 
 	def ParseBody(self) -> None:
 		self.Paragraphs = list[str]()
 		self.Footers = list[ConventionalCommitFooter]()
-		isInParagraph:bool = False
-		paragraph:str = ""
-		lines:list = self.Body.replace("\r\n", "\n").split("\n")
-		for line in lines:
-			isBlank:bool = False
-			isBreakingChange:bool = False
-			isFooter:bool = False
-			if (isInParagraph):
-				if (len(line) > 0):
+		paragraph:str | None = None
+		for line in self.Body.replace("\r\n", "\n").split("\n"):
+			if (len(line) == 0):
+				if (paragraph is not None):
+					self.Paragraphs.append(paragraph)
+					paragraph = None
+			else:
+				if (paragraph is not None):
 					if (paragraph.endswith(" ")):
 						paragraph += line
 					else:
 						paragraph += f" {line}"
-				else:
-					self.Paragraphs.append(paragraph)
-					paragraph = ""
-					isInParagraph = False
-			if (len(line) == 0):
-				isBlank = True
-			if (line.startswith("BREAKING CHANGES:")):
-				self.IsBreakingChange
-				isBreakingChange = True
-				self.BreakingChangeDescription = line[line.index(":")+1:].strip()
-			if (":" in line):
-				tag:str = line[:line.index(":")]
-				if (" " not in tag):
-					isFooter = True
-					value:str = line[line.index(":")+1:].strip()
-					self.Footers.append(ConventionalCommitFooter(tag, value))
-			if (not isBlank
-				and not isBreakingChange
-				and not isFooter
-				and not isInParagraph):
-				isInParagraph = True
-				paragraph = line
-			if (not isBlank
-				and not isBreakingChange
-				and not isFooter
-				and not isInParagraph):
-				pass
-		
+				isBreakingChangeOrFooter:bool = False
+				tag, separator, value = line.partition(":")
+				if (len(separator) > 0):
+					if (tag == "BREAKING CHANGES"):
+						isBreakingChangeOrFooter = True
+						self.BreakingChangeDescription = value.strip()
+					elif (" " not in tag):
+						isBreakingChangeOrFooter = True
+						self.Footers.append(ConventionalCommitFooter(tag, value.strip()))
+				if (paragraph is None
+					and not isBreakingChangeOrFooter):
+					paragraph = line
+
+	@staticmethod
+	def ParseMany(commits:Iterable[dict | str]) -> list["ConventionalCommit"]:
+		#Git commit dictionaries (see GitAttributes) or bare subjects.
+		returnValue:list[ConventionalCommit] = list[ConventionalCommit]()
+		for commit in commits:
+			if isinstance(commit, str):
+				returnValue.append(ConventionalCommit(subject=commit))
+			else:
+				returnValue.append(ConventionalCommit.FromGitCommit(commit))
+		return returnValue
+
+	@staticmethod
+	def FromGitCommit(commit:dict) -> "ConventionalCommit":
+		#Builds a commit from a Git commit dictionary holding at least GitAttributes.
+		files:list[str] | None = None
+		if ("Files" in commit.keys()):
+			files = commit["Files"]
+		return ConventionalCommit(
+			hash=commit["Hash"],
+			abbreviatedHash=commit["AbbreviatedHash"],
+			committerDate=commit["CommitterDate_IS08601Strict"],
+			subject=commit["Subject"],
+			body=commit["Body"],
+			files=files
+		)
+
+	@staticmethod
+	def FromDict(dictionary:dict) -> "ConventionalCommit":
+		#Restores a commit written by VersionTags.CommitToDict without parsing the subject and body again.
+		returnValue:ConventionalCommit = ConventionalCommit()
+		returnValue.Hash = dictionary["Hash"]
+		returnValue.AbbreviatedHash = dictionary["AbbreviatedHash"]
+		if (dictionary["CommitterDate"] is not None):
+			returnValue.CommitterDate = datetime.datetime.fromisoformat(dictionary["CommitterDate"])
+		returnValue.Subject = dictionary["Subject"]
+		returnValue.Body = dictionary["Body"]
+		returnValue.Type = CommitType[dictionary["Type"]]
+		returnValue.Scope = dictionary["Scope"]
+		returnValue.IsBreakingChange = dictionary["IsBreakingChange"]
+		returnValue.BreakingChangeDescription = dictionary["BreakingChangeDescription"]
+		returnValue.Description = dictionary["Description"]
+		returnValue.Paragraphs = list(dictionary["Paragraphs"])
+		returnValue.Footers = [ConventionalCommitFooter(footer["Tag"], footer["Value"]) for footer in dictionary["Footers"]]
+		returnValue.Files = dictionary.get("Files")
+		return returnValue
+
 	def __str__(self) -> str:
 		committerDate:str|None = None
 		if (isinstance(self.CommitterDate, datetime.datetime)):
 			committerDate = self.CommitterDate.isoformat()
 		return f"{self.Hash}\t{self.AbbreviatedHash}\t{committerDate}\t{self.Subject}"
 	
+class CommitTable:
+	#Column oriented storage for large commit ranges. Rows are materialized as ConventionalCommit on access,
+	#so a table can stand in for list[ConventionalCommit] wherever commits are only appended and iterated.
+	#The parsed subject is kept in columns, so hot paths read them through the Get* accessors without building rows,
+	#and a materialized row only parses its body again.
+	__slots__ = ("HashSize", "Hashes", "AbbreviatedHashLengths", "Types", "BreakingChanges", "CommitterDates",
+		"CommitterDateOffsets", "ScopeIndexes", "Scopes", "ScopeIndexesByName", "Subjects", "SubjectEnds", "Bodies", "BodyEnds",
+		"DescriptionStarts", "DescriptionEnds", "Descriptions", "Files")
+	NoDate:int = -(2 ** 63)
+	NoOffset:int = -(2 ** 31)
+	HashSize:int
+	Hashes:bytearray
+	AbbreviatedHashLengths:bytearray
+	Types:bytearray
+	BreakingChanges:bytearray
+	CommitterDates:array
+	CommitterDateOffsets:array
+	ScopeIndexes:array
+	Scopes:list[str]
+	ScopeIndexesByName:dict[str, int]
+	Subjects:bytearray
+	SubjectEnds:array
+	Bodies:bytearray
+	BodyEnds:array
+	DescriptionStarts:array
+	DescriptionEnds:array
+	Descriptions:dict[int, str]
+	Files:dict[int, list[str]]
+
+	def __init__(self, commits:Iterable[ConventionalCommit] | None = None) -> None:
+		self.HashSize = 20
+		self.Hashes = bytearray()
+		self.AbbreviatedHashLengths = bytearray()
+		self.Types = bytearray()
+		self.BreakingChanges = bytearray()
+		self.CommitterDates = array("q")
+		self.CommitterDateOffsets = array("i")
+		self.ScopeIndexes = array("i")
+		self.Scopes = list[str]()
+		self.ScopeIndexesByName = dict[str, int]()
+		#Subjects and bodies are concatenated UTF-8, row n spans [end of row n-1, end of row n).
+		self.Subjects = bytearray()
+		self.SubjectEnds = array("q")
+		self.Bodies = bytearray()
+		self.BodyEnds = array("q")
+		#The description is a slice of the row's subject, [start, end) in characters, with -1 for none.
+		#Descriptions that are not a slice of the subject are kept whole in Descriptions.
+		self.DescriptionStarts = array("i")
+		self.DescriptionEnds = array("i")
+		self.Descriptions = dict[int, str]()
+		#Most rows have no files loaded, so only rows that do are kept.
+		self.Files = dict[int, list[str]]()
+		if (commits is not None):
+			self.extend(commits)
+
+	def __len__(self) -> int:
+		return len(self.Types)
+
+	def __iter__(self):
+		for index in range(len(self.Types)):
+			yield self.GetCommit(index)
+
+	def __getitem__(self, index:int) -> ConventionalCommit:
+		return self.GetCommit(range(len(self.Types))[index])
+
+	def append(self, commit:ConventionalCommit) -> None:
+		hashBytes:bytes = bytes.fromhex(commit.Hash)
+		if (len(self.Types) == 0):
+			#SHA-1 repositories store 20 bytes per hash, SHA-256 repositories 32.
+			self.HashSize = len(hashBytes)
+		if (len(hashBytes) != self.HashSize):
+			raise ValueError(f"Hash {commit.Hash} does not match the table's {self.HashSize} byte hashes")
+		self.Hashes.extend(hashBytes)
+		self.AbbreviatedHashLengths.append(len(commit.AbbreviatedHash or ""))
+		self.Types.append(commit.Type.value)
+		self.BreakingChanges.append(commit.IsBreakingChange)
+		if (commit.CommitterDate is not None):
+			self.CommitterDates.append(int(commit.CommitterDate.timestamp()))
+			offset:datetime.timedelta | None = commit.CommitterDate.utcoffset()
+			self.CommitterDateOffsets.append(self.NoOffset if offset is None else int(offset.total_seconds()))
+		else:
+			self.CommitterDates.append(self.NoDate)
+			self.CommitterDateOffsets.append(self.NoOffset)
+		scopeIndex:int = -1
+		if (commit.Scope is not None):
+			scopeIndex = self.ScopeIndexesByName.get(commit.Scope, -1)
+			if (scopeIndex < 0):
+				scopeIndex = len(self.Scopes)
+				self.Scopes.append(sys.intern(commit.Scope))
+				self.ScopeIndexesByName[commit.Scope] = scopeIndex
+		self.ScopeIndexes.append(scopeIndex)
+		self.SetFiles(len(self.Types) - 1, commit.Files)
+		self.Subjects.extend((commit.Subject or "").encode())
+		self.SubjectEnds.append(len(self.Subjects))
+		descriptionStart:int = -1
+		if (commit.Description is not None):
+			descriptionStart = (commit.Subject or "").find(commit.Description)
+			if (descriptionStart < 0):
+				self.Descriptions[len(self.Types) - 1] = commit.Description
+		self.DescriptionStarts.append(descriptionStart)
+		self.DescriptionEnds.append(descriptionStart if descriptionStart < 0 else descriptionStart + len(commit.Description))
+		self.Bodies.extend((commit.Body or "").encode())
+		self.BodyEnds.append(len(self.Bodies))
+
+	def extend(self, commits:Iterable[ConventionalCommit]) -> None:
+		for commit in commits:
+			self.append(commit)
+
+	def GetHash(self, index:int) -> str:
+		return self.Hashes[index * self.HashSize:(index + 1) * self.HashSize].hex()
+
+	def GetAbbreviatedHash(self, index:int) -> str | None:
+		return self.GetHash(index)[:self.AbbreviatedHashLengths[index]] or None
+
+	def GetType(self, index:int) -> CommitType:
+		return CommitType(self.Types[index])
+
+	def GetIsBreakingChange(self, index:int) -> bool:
+		return self.BreakingChanges[index] == 1
+
+	def GetDescription(self, index:int) -> str | None:
+		returnValue:str | None = self.Descriptions.get(index)
+		if (returnValue is None
+			and self.DescriptionStarts[index] > -1):
+			returnValue = (self.GetSubject(index) or "")[self.DescriptionStarts[index]:self.DescriptionEnds[index]]
+		return returnValue
+
+	def GetScope(self, index:int) -> str | None:
+		returnValue:str | None = None
+		scopeIndex:int = self.ScopeIndexes[index]
+		if (scopeIndex > -1):
+			returnValue = self.Scopes[scopeIndex]
+		return returnValue
+
+	def GetCommitterDate(self, index:int) -> datetime.datetime | None:
+		returnValue:datetime.datetime | None = None
+		if (self.CommitterDates[index] != self.NoDate):
+			if (self.CommitterDateOffsets[index] == self.NoOffset):
+				returnValue = datetime.datetime.fromtimestamp(self.CommitterDates[index])
+			else:
+				returnValue = datetime.datetime.fromtimestamp(
+					self.CommitterDates[index],
+					datetime.timezone(datetime.timedelta(seconds=self.CommitterDateOffsets[index])))
+		return returnValue
+
+	def GetText(self, text:bytearray, ends:array, index:int) -> str | None:
+		begin:int = 0
+		if (index > 0):
+			begin = ends[index - 1]
+		return text[begin:ends[index]].decode() or None
+
+	def GetSubject(self, index:int) -> str | None:
+		return self.GetText(self.Subjects, self.SubjectEnds, index)
+
+	def GetBody(self, index:int) -> str | None:
+		return self.GetText(self.Bodies, self.BodyEnds, index)
+
+	def SetFiles(self, index:int, files:list[str] | None) -> None:
+		if (files is not None
+			and len(files) > 0):
+			self.Files[index] = files
+		else:
+			self.Files.pop(index, None)
+
+	def GetCommit(self, index:int) -> ConventionalCommit:
+		returnValue:ConventionalCommit = ConventionalCommit(
+			hash=self.GetHash(index),
+			abbreviatedHash=self.GetAbbreviatedHash(index),
+			committerDate=self.GetCommitterDate(index),
+			files=self.Files.get(index)
+		)
+		returnValue.Subject = self.GetSubject(index)
+		returnValue.Type = self.GetType(index)
+		returnValue.Scope = self.GetScope(index)
+		returnValue.IsBreakingChange = self.GetIsBreakingChange(index)
+		returnValue.Description = self.GetDescription(index)
+		returnValue.Body = self.GetBody(index)
+		if (returnValue.Body):
+			returnValue.ParseBody()
+		return returnValue
+
 class ConventionalCommitStats:
 	Unknown:int = 0
 	Breaking:int = 0
@@ -206,20 +431,46 @@ class ConventionalCommitStats:
 	Chore:int = 0
 	Revert:int = 0
 
-	def __init__(self, commits:list[ConventionalCommit] | None) -> None:
-		if (commits is not None):
-			self.Breaking = sum(c.IsBreakingChange for c in commits)
-			self.Feat = sum(c.Type == CommitType.Feat for c in commits)
-			self.Fix = sum(c.Type == CommitType.Fix for c in commits)
-			self.Docs = sum(c.Type == CommitType.Docs for c in commits)
-			self.Style = sum(c.Type == CommitType.Style for c in commits)
-			self.Refactor = sum(c.Type == CommitType.Refactor for c in commits)
-			self.Perf = sum(c.Type == CommitType.Perf for c in commits)
-			self.Test = sum(c.Type == CommitType.Test for c in commits)
-			self.Build = sum(c.Type == CommitType.Build for c in commits)
-			self.CI = sum(c.Type == CommitType.CI for c in commits)
-			self.Chore = sum(c.Type == CommitType.Chore for c in commits)
-			self.Revert = sum(c.Type == CommitType.Revert for c in commits)
+	#Every CommitType has a counter attribute of the same name, plus Breaking.
+
+	def __init__(self, commits:list[ConventionalCommit] | CommitTable | None) -> None:
+		breaking:int = 0
+		typeCounts:Counter = Counter()
+		if (isinstance(commits, CommitTable)):
+			breaking = commits.BreakingChanges.count(1)
+			typeCounts = Counter({CommitType(value): count for value, count in Counter(commits.Types).items()})
+		elif (commits is not None):
+			for commit in commits:
+				typeCounts[commit.Type] += 1
+				breaking += commit.IsBreakingChange
+		self.Breaking = breaking
+		for commitType in CommitType:
+			setattr(self, commitType.name, typeCounts[commitType])
+
+	def AddCommit(self, commit:ConventionalCommit) -> None:
+		name:str = commit.Type.name
+		setattr(self, name, getattr(self, name) + 1)
+		self.Breaking += commit.IsBreakingChange
+
+	def GetCounts(self) -> dict[str, int]:
+		returnValue:dict[str, int] = {"Breaking": self.Breaking}
+		for commitType in CommitType:
+			returnValue[commitType.name] = getattr(self, commitType.name)
+		return returnValue
+
+	def Combine(self, other:"ConventionalCommitStats", sign:int) -> "ConventionalCommitStats":
+		returnValue:ConventionalCommitStats = ConventionalCommitStats(None)
+		otherCounts:dict[str, int] = other.GetCounts()
+		for name, count in self.GetCounts().items():
+			setattr(returnValue, name, count + (sign * otherCounts[name]))
+		return returnValue
+
+	def __add__(self, other:"ConventionalCommitStats") -> "ConventionalCommitStats":
+		#Merges, e.g. per tag stats into per major version or whole history totals.
+		return self.Combine(other, 1)
+
+	def __sub__(self, other:"ConventionalCommitStats") -> "ConventionalCommitStats":
+		return self.Combine(other, -1)
 
 	def GetBadges(self, excludeZeros:bool = True,
 					breakingColor:str = "FF2121", featColor:str="C2EDCE", fixColor:str="CBD5F0",
@@ -256,6 +507,13 @@ class ConventionalCommitStats:
 			returnValue.append(f"![Revert-{self.Revert}](https://img.shields.io/badge/reverts-{self.Revert}-{revertColor})")
 		return returnValue
 
+	@staticmethod
+	def FromDict(dictionary:dict) -> "ConventionalCommitStats":
+		returnValue:ConventionalCommitStats = ConventionalCommitStats(None)
+		for key, value in dictionary.items():
+			setattr(returnValue, key, value)
+		return returnValue
+
 	def Serializable(self) -> dict:
 		return {
 			"Breaking": self.Breaking,
@@ -279,15 +537,18 @@ class VersionTag:
 	Name:str | None = None
 	Version:SemVer | None = None
 	TagCommit:ConventionalCommit | None = None
-	Commits:list[ConventionalCommit] = []
+	Commits:list[ConventionalCommit] | CommitTable | None = None
 	Stats:ConventionalCommitStats | None = None
+	UseCommitTable:bool = False
 
 	def __init__(self,
 			name:str | None = None,
 			version:SemVer | str | None = None,
 			tagCommit:ConventionalCommit | None = None,
-			commits:list[ConventionalCommit] | None = None
+			commits:list[ConventionalCommit] | CommitTable | None = None,
+			useCommitTable:bool = False
 			) -> None:
+		self.UseCommitTable = useCommitTable
 		self.Name = name
 		if isinstance(version, SemVer):
 			self.Version = version
@@ -303,40 +564,32 @@ class VersionTag:
 		if isinstance(commit, ConventionalCommit):
 			self.TagCommit = commit
 		elif isinstance(commit, dict):
-			files:list[str] | None = None
-			if ("Files" in commit.keys()):
-				files = commit["Files"]
-			self.TagCommit = ConventionalCommit(
-				hash=commit["Hash"],
-				abbreviatedHash=commit["AbbreviatedHash"],
-				committerDate=commit["CommitterDate_IS08601Strict"],
-				subject=commit["Subject"],
-				body=commit["Body"],
-				files=files
-			)
+			self.TagCommit = ConventionalCommit.FromGitCommit(commit)
 
 	def AppendCommit(self, commit:ConventionalCommit | dict) -> None:
 		if (self.Commits is None):
-			self.Commits = list[ConventionalCommit]()
+			if (self.UseCommitTable):
+				self.Commits = CommitTable()
+			else:
+				self.Commits = list[ConventionalCommit]()
+		if isinstance(commit, dict):
+			commit = ConventionalCommit.FromGitCommit(commit)
 		if isinstance(commit, ConventionalCommit):
 			self.Commits.append(commit)
-		elif isinstance(commit, dict):
-			files:list[str] | None = None
-			if ("Files" in commit.keys()):
-				files = commit["Files"]
-			self.Commits.append(ConventionalCommit(
-				hash=commit["Hash"],
-				abbreviatedHash=commit["AbbreviatedHash"],
-				committerDate=commit["CommitterDate_IS08601Strict"],
-				subject=commit["Subject"],
-				body=commit["Body"],
-				files=files
-			))
+			#Kept current as commits arrive, so SetStats is only needed after replacing Commits wholesale.
+			if (self.Stats is None):
+				self.Stats = ConventionalCommitStats(None)
+			self.Stats.AddCommit(commit)
 
 	def AppendCommits(self, commits:list[dict]) -> None:
 		for commit in commits:
 			self.AppendCommit(commit)
 
+	def ExtendFromIterator(self, commits:Iterable[ConventionalCommit | dict]) -> None:
+		#Consumes a generator such as Git.IterCommits without materializing an intermediate list.
+		for commit in commits:
+			self.AppendCommit(commit)
+
 	def SetStats(self) -> None:
 		self.Stats = ConventionalCommitStats(self.Commits)
 
@@ -344,54 +597,128 @@ class VersionTags:
 	GitRepo:Git | None = None
 	RepoPath:Path | None = None
 	RepoMeta:GitRepoMeta | None = None
-	_list:list[VersionTag] = list[VersionTag]()
+	FilesLoaded:bool = False
+	UseHistoryCache:bool = False
+	UseCommitTable:bool = False
+	HistoryCacheSchemaVersion:int = 2
+	PackageName:str | None = None
+	PackagePath:Path | None = None
+		#Package directory relative to RepoPath; the package's changelog is written there.
+	TagPrefix:str = ""
+		#Namespace of this instance's tags, "<package>@" for a package and empty for the repository's own v1.2.3 tags.
+	#Ascending by version, with _sortedKeys (Versioning.GetVersionSortKey) kept parallel for bisect. Iteration and indexing are newest first.
+	_sortedTags:list[VersionTag] = None
+	_sortedKeys:list[tuple] = None
+	_tagsByName:dict[str, VersionTag] = None
 
 	def __iter__(self):
-		return self._list.__iter__()
+		return reversed(self._sortedTags)
 
 	def __getitem__(self, item):
-		return self._list[item]
+		returnValue:VersionTag | list[VersionTag] = None
+		if (isinstance(item, slice)):
+			returnValue = self._sortedTags[::-1][item]
+		else:
+			returnValue = self._sortedTags[-1 - range(len(self._sortedTags))[item]]
+		return returnValue
 
-	def __init__(self, repoSearchPath:Path | None = None) -> None:
+	def __len__(self) -> int:
+		return len(self._sortedTags)
+
+	def __init__(self, repoSearchPath:Path | None = None, includeFiles:bool = False, backend:str | None = None, useHistoryCache:bool = False, useCommitTable:bool = False,
+			packageName:str | None = None, packagePath:Path | None = None) -> None:
+		#Opt in: the cache is written under .git/ccsvgit-cache.
+		self.UseHistoryCache = useHistoryCache
+		#Keeps each tag's commits in a CommitTable, which is far smaller for large histories.
+		self.UseCommitTable = useCommitTable
+		self.PackageName = packageName
+		self.PackagePath = packagePath
+		self.TagPrefix = ""
+		if (packageName is not None):
+			self.TagPrefix = self.GetTagPrefix(packageName)
+			#The history cache holds a single namespace, so packages do not share it with the repository.
+			self.UseHistoryCache = False
+		self.Clear()
 		if (repoSearchPath is not None
 	  		and repoSearchPath.exists()):
-			self.GitRepo = Git(repoSearchPath)
-			self.LoadFromRepo()
-			self._list = sorted(self._list, key=lambda vt: vt.Version, reverse=True)
+			self.GitRepo = Git(repoSearchPath, backend=backend)
+			self.LoadFromRepo(includeFiles)
+
+	@staticmethod
+	def GetTagPrefix(packageName:str) -> str:
+		#Characters git does not allow in a ref name, and "@", become "-".
+		return re.sub(r"[^A-Za-z0-9._/-]+", "-", packageName).strip("-./") + "@"
+
+	def IsOwnTag(self, tagName:str) -> bool:
+		returnValue:bool = False
+		if (len(self.TagPrefix) > 0):
+			returnValue = tagName.startswith(self.TagPrefix)
+		else:
+			returnValue = "@" not in tagName
+		return returnValue
+
+	def Clear(self) -> None:
+		self._sortedTags = list[VersionTag]()
+		self._sortedKeys = list[tuple]()
+		self._tagsByName = dict[str, VersionTag]()
 
 	def Add(self, versionTag:VersionTag) -> None:
-		self._list.append(versionTag)
+		#Inserted ahead of equal versions, so equal versions iterate in the order they were added.
+		key:tuple = Versioning.GetVersionSortKey(str(versionTag.Version))
+		index:int = bisect.bisect_left(self._sortedKeys, key)
+		self._sortedKeys.insert(index, key)
+		self._sortedTags.insert(index, versionTag)
+		self._tagsByName[versionTag.Name] = versionTag
+
+	def Remove(self, versionTag:VersionTag) -> None:
+		index:int = bisect.bisect_left(self._sortedKeys, Versioning.GetVersionSortKey(str(versionTag.Version)))
+		while (self._sortedTags[index] is not versionTag):
+			index += 1
+		del self._sortedKeys[index]
+		del self._sortedTags[index]
+		if (self._tagsByName.get(versionTag.Name) is versionTag):
+			del self._tagsByName[versionTag.Name]
 
 	def GetLatest(self) -> VersionTag:
 		returnValue:VersionTag = None
-		if (len(self._list) > 0):
-			sortedList:list[VersionTag] = sorted(self._list, key=lambda vt: vt.Version, reverse=True)
-			returnValue = sortedList[0]
+		if (len(self._sortedTags) > 0):
+			returnValue = self._sortedTags[-1]
 		return returnValue
 
+	def GetByName(self, name:str) -> VersionTag | None:
+		return self._tagsByName.get(name)
+
+	def GetRange(self, lowerVersion:SemVer | str, upperVersion:SemVer | str, includeUpper:bool = False) -> list[VersionTag]:
+		#Tags from lowerVersion (inclusive) to upperVersion, newest first.
+		lowerKey:tuple = Versioning.GetVersionSortKey(str(lowerVersion))
+		upperKey:tuple = Versioning.GetVersionSortKey(str(upperVersion))
+		beginIndex:int = bisect.bisect_left(self._sortedKeys, lowerKey)
+		endIndex:int = bisect.bisect_left(self._sortedKeys, upperKey)
+		if (includeUpper):
+			endIndex = bisect.bisect_right(self._sortedKeys, upperKey)
+		return self._sortedTags[beginIndex:endIndex][::-1]
+
 	def SetLatestVersion(self, latestVersion:SemVer) -> None:
-		if (len(self._list) > 0):
-			sortedList:list[VersionTag] = sorted(self._list, key=lambda vt: vt.Version, reverse=True)
-			findVersion:SemVer = sortedList[0].Version
-			index:int = next((index for index, vt in enumerate(self._list) if vt.Version == findVersion), -1)
-			versionTag:VersionTag = self._list[index]
+		if (len(self._sortedTags) > 0):
+			versionTag:VersionTag = self._sortedTags[-1]
+			self.Remove(versionTag)
 			versionTag.Version = latestVersion
-			versionTag.Name = f"v{versionTag.Version}"
-			self._list[index] = versionTag
+			versionTag.Name = f"{self.TagPrefix}v{versionTag.Version}"
+			self.Add(versionTag)
 
-	def CreatePrerelease(self, commits:list[dict]):
+	def CreatePrerelease(self, commits:Iterable[ConventionalCommit | dict]):
 		untaggedSemVer:SemVer = SemVer.parse("0.0.0")
 		
-		if (len(self._list) > 0):
+		if (len(self._sortedTags) > 0):
 			untaggedSemVer = self.GetLatest().Version
 
 		prereleaseTag:VersionTag = VersionTag(
 				name="v_Untagged",
 				tagCommit=None,
-				version=untaggedSemVer
+				version=untaggedSemVer,
+				useCommitTable=self.UseCommitTable
 			)
-		prereleaseTag.AppendCommits(commits)
-		prereleaseTag.SetStats()
+		prereleaseTag.ExtendFromIterator(commits)
 		if (prereleaseTag.Stats.Breaking > 0):
 			prereleaseTag.Version = prereleaseTag.Version.bump_major()
 		elif (prereleaseTag.Stats.Feat > 0):
@@ -399,8 +726,8 @@ class VersionTags:
 		else:
 			prereleaseTag.Version = prereleaseTag.Version.bump_minor()
 		prereleaseTag.Version = prereleaseTag.Version.bump_prerelease("prerelease")
-		prereleaseTag.Name = f"v{prereleaseTag.Version}"
-		self._list.append(prereleaseTag)
+		prereleaseTag.Name = f"{self.TagPrefix}v{prereleaseTag.Version}"
+		self.Add(prereleaseTag)
 
 	def VersionToDict(self, version:SemVer | None) -> dict:
 		returnValue:dict = {}
@@ -456,11 +783,16 @@ class VersionTags:
 
 	def Serializable(self) -> list[dict]:
 		returnValue:list[dict] = list[dict]()
-		sortedList:list[VersionTag] = sorted(self._list, key=lambda vt: vt.Version, reverse=True)
-		for versionTag in sortedList:
+		for versionTag in self:
 			serializableCommits:list[dict] = list[dict]()
-			for commit in sorted(versionTag.Commits, key=lambda c: c.CommitterDate is not None and c.CommitterDate, reverse=True):
-				serializableCommits.append(self.CommitToDict(commit))
+			commits:list[ConventionalCommit] | CommitTable = versionTag.Commits or []
+			if (isinstance(commits, CommitTable)):
+				#Sorted on the date column, so each row is materialized once, for its output.
+				for index in sorted(range(len(commits)), key=lambda index: commits.CommitterDates[index], reverse=True):
+					serializableCommits.append(self.CommitToDict(commits.GetCommit(index)))
+			else:
+				for commit in sorted(commits, key=lambda c: c.CommitterDate is not None and c.CommitterDate, reverse=True):
+					serializableCommits.append(self.CommitToDict(commit))
 			versionTagDictionary:dict = {
 				"Name": versionTag.Name,
 				"Version": self.VersionToDict(versionTag.Version),
@@ -471,44 +803,210 @@ class VersionTags:
 			returnValue.append(versionTagDictionary)
 		return returnValue
 
-	def LoadFromRepo(self) -> None:
+	def LoadFromRepo(self, includeFiles:bool = False) -> None:
 		self.RepoPath = self.GitRepo.RepoPath
 		self.RepoMeta = self.GitRepo.GetRepoMeta()
-		selectedAttributes:list = ["Hash", "AbbreviatedHash", "CommitterDate_IS08601Strict", "Subject", "Body"]
-		nextBeginCommit:dict = self.GitRepo.GetFirstCommit(selectedAttributes)
-		self._list = list[VersionTag]()
-		isFirst:bool = True
-		for tag in self.GitRepo.GetTags(selectedAttributes):
-			commits:list = []
-			commits = self.GitRepo.GetCommitsBetweenHashes(nextBeginCommit["Hash"], tag["Hash"], True, selectedAttributes)
-			if (isFirst):
-				commits.append(nextBeginCommit)
-				isFirst = False
+		tags:list[dict] = self.GitRepo.GetTags(ConventionalCommit.GitAttributes, includeFiles)
+		pendingRanges, historyCache, updatedHistoryCache, nextBeginCommit = self.PrepareTagRanges(tags, includeFiles)
+		if (self.NeedsFirstCommit(pendingRanges, nextBeginCommit)):
+			pendingRanges, nextBeginCommit = self.SetFirstCommit(pendingRanges, nextBeginCommit,
+				self.GitRepo.GetFirstCommit(ConventionalCommit.GitAttributes, includeFiles))
+		for versionTag, beginCommit, beginHash in pendingRanges:
+			versionTag.ExtendFromIterator(self.GitRepo.IterCommits(
+				afterHash=beginCommit["Hash"],
+				untilHash=versionTag.TagCommit.Hash,
+				excludeMergeCommits=True,
+				includeFiles=includeFiles))
+		self.FinishTagRanges(pendingRanges, historyCache, updatedHistoryCache, includeFiles)
+		self.CreatePrerelease(self.GitRepo.IterCommits(
+					afterHash=nextBeginCommit["Hash"],
+					includeFiles=includeFiles))
+
+	async def LoadFromRepoAsync(self, repoSearchPath:Path | None = None, includeFiles:bool = False, maxConcurrency:int = 8) -> None:
+		#Same result as LoadFromRepo, but the commit ranges of tags missing from the history cache are fetched concurrently.
+		from .AsyncGit import AsyncGit
+		if (repoSearchPath is None
+			and self.GitRepo is None):
+			raise ValueError("LoadFromRepoAsync needs a repoSearchPath when VersionTags was created without one")
+		if (repoSearchPath is not None):
+			#The replaced repository's cat-file workers are stopped rather than left to the garbage collector.
+			if (self.GitRepo is not None):
+				self.GitRepo.Close()
+			self.GitRepo = Git(repoSearchPath, backend="exec")
+		asyncGit:AsyncGit = AsyncGit(self.GitRepo.RepoPath, execPath=self.GitRepo.GitExecPath, maxConcurrency=maxConcurrency)
+		try:
+			self.RepoPath = self.GitRepo.RepoPath
+			self.RepoMeta, tags = await asyncio.gather(
+				asyncGit.GetRepoMeta(),
+				asyncGit.GetTags(ConventionalCommit.GitAttributes, includeFiles))
+			pendingRanges, historyCache, updatedHistoryCache, nextBeginCommit = self.PrepareTagRanges(tags, includeFiles)
+			if (self.NeedsFirstCommit(pendingRanges, nextBeginCommit)):
+				pendingRanges, nextBeginCommit = self.SetFirstCommit(pendingRanges, nextBeginCommit,
+					await asyncGit.GetFirstCommit(ConventionalCommit.GitAttributes, includeFiles))
+			ranges:list[list[dict]] = await asyncio.gather(*[
+				asyncGit.GetCommitsBetweenHashes(beginCommit["Hash"], versionTag.TagCommit.Hash, True, ConventionalCommit.GitAttributes, includeFiles)
+				for versionTag, beginCommit, beginHash in pendingRanges])
+			for (versionTag, beginCommit, beginHash), commits in zip(pendingRanges, ranges):
+				versionTag.AppendCommits(commits)
+			self.FinishTagRanges(pendingRanges, historyCache, updatedHistoryCache, includeFiles)
+			self.CreatePrerelease(await asyncGit.GetCommits(
+						afterHash=nextBeginCommit["Hash"],
+						selectedAttributes=ConventionalCommit.GitAttributes,
+						includeFiles=includeFiles))
+		finally:
+			asyncGit.Close()
+
+	def PrepareTagRanges(self, tags:list[dict], includeFiles:bool) -> tuple[list[tuple[VersionTag, dict | None, str | None]], dict, dict, dict | None]:
+		#Adds a VersionTag per tag, restoring cached ranges, and returns the (versionTag, beginCommit, beginHash) ranges still to be loaded.
+		#Nothing here runs git: a range starting at the root commit, and nextBeginCommit when there are no tags, are left as None for SetFirstCommit.
+		self.FilesLoaded = includeFiles
+		pendingRanges:list[tuple[VersionTag, dict, str | None]] = list[tuple[VersionTag, dict, str | None]]()
+		historyCache:dict = dict()
+		if (self.UseHistoryCache):
+			historyCache = self.LoadHistoryCache()
+		updatedHistoryCache:dict = dict()
+		nextBeginCommit:dict | None = None
+		#Ranges are built from each tag to the next, so the tags are walked in SemVer precedence (v2.0.0-rc.1 before v2.0.0).
+		tags = sorted((tag for tag in tags if self.IsOwnTag(tag["Name"])), key=lambda tag: Versioning.GetVersionSortKey(tag["Name"][len(self.TagPrefix):]))
+		self.Clear()
+		for tag in tags:
 			versionTag:VersionTag = VersionTag(
 				name=tag["Name"],
-				version=tag["Name"]
+				version=tag["Name"][len(self.TagPrefix):],
+				useCommitTable=self.UseCommitTable
 			)
 			versionTag.SetTagCommit(tag)
-			versionTag.AppendCommits(commits)
-			versionTag.SetStats()
+			#A range is fully determined by the hashes at both ends, so an entry stays valid while neither moved.
+			beginHash:str | None = None
+			if (nextBeginCommit is not None):
+				beginHash = nextBeginCommit["Hash"]
+			cacheEntry:dict | None = historyCache.get(tag["Name"])
+			if (cacheEntry is not None
+				and cacheEntry["Hash"] == tag["Hash"]
+				and cacheEntry["BeginHash"] == beginHash
+				and (cacheEntry["IncludesFiles"] or not includeFiles)):
+				commits:list[ConventionalCommit] = list[ConventionalCommit]()
+				for commitDictionary in cacheEntry["Commits"]:
+					commit:ConventionalCommit = ConventionalCommit.FromDict(commitDictionary)
+					if (not includeFiles):
+						commit.Files = None
+					commits.append(commit)
+				#The cached counts are restored as they are rather than counted again commit by commit.
+				if (len(commits) > 0
+					and self.UseCommitTable):
+					versionTag.Commits = CommitTable(commits)
+				elif (len(commits) > 0):
+					versionTag.Commits = commits
+				versionTag.Stats = ConventionalCommitStats.FromDict(cacheEntry["Stats"])
+				updatedHistoryCache[tag["Name"]] = cacheEntry
+			else:
+				pendingRanges.append((versionTag, nextBeginCommit, beginHash))
 			self.Add(versionTag)
 			nextBeginCommit = tag
-		self.CreatePrerelease(self.GitRepo.GetCommits(
-					afterHash=nextBeginCommit["Hash"],
-					selectedAttributes=selectedAttributes))
+		return (pendingRanges, historyCache, updatedHistoryCache, nextBeginCommit)
+
+	def NeedsFirstCommit(self, pendingRanges:list[tuple[VersionTag, dict | None, str | None]], nextBeginCommit:dict | None) -> bool:
+		#Cached tags never need the root commit, so it is only looked up for an uncached first range or a repository without tags.
+		return (nextBeginCommit is None
+			or any(beginCommit is None for versionTag, beginCommit, beginHash in pendingRanges))
+
+	def SetFirstCommit(self, pendingRanges:list[tuple[VersionTag, dict | None, str | None]], nextBeginCommit:dict | None, firstCommit:dict | None) -> tuple[list[tuple[VersionTag, dict, str | None]], dict | None]:
+		returnValue:tuple[list[tuple[VersionTag, dict, str | None]], dict | None] = (
+			[(versionTag, firstCommit if beginCommit is None else beginCommit, beginHash) for versionTag, beginCommit, beginHash in pendingRanges],
+			firstCommit if nextBeginCommit is None else nextBeginCommit)
+		return returnValue
+
+	def FinishTagRanges(self, pendingRanges:list[tuple[VersionTag, dict, str | None]], historyCache:dict, updatedHistoryCache:dict, includeFiles:bool) -> None:
+		for versionTag, beginCommit, beginHash in pendingRanges:
+			if (beginHash is None):
+				#The first tag's range starts at the root commit, which is part of it.
+				versionTag.AppendCommit(beginCommit)
+			updatedHistoryCache[versionTag.Name] = {
+				"Hash": versionTag.TagCommit.Hash,
+				"BeginHash": beginHash,
+				"IncludesFiles": includeFiles,
+				"Commits": [dict(self.CommitToDict(commit), Files=commit.Files) for commit in (versionTag.Commits or [])],
+				"Stats": versionTag.Stats.GetCounts()
+			}
+		if (self.UseHistoryCache
+			and updatedHistoryCache != historyCache):
+			self.SaveHistoryCache(updatedHistoryCache)
+
+	def GetHistoryCachePath(self) -> Path:
+		return self.GitRepo.GetGitDirPath().joinpath("ccsvgit-cache", "history.json")
+
+	def LoadHistoryCache(self) -> dict:
+		returnValue:dict = dict()
+		cachePath:Path = self.GetHistoryCachePath()
+		if (cachePath.exists()):
+			try:
+				cache:dict = json.loads(cachePath.read_text(encoding="utf-8"))
+				if (cache.get("SchemaVersion") == self.HistoryCacheSchemaVersion):
+					returnValue = cache["Tags"]
+			except (ValueError, KeyError, OSError):
+				returnValue = dict()
+		return returnValue
+
+	def SaveHistoryCache(self, tags:dict) -> None:
+		#Written to a temporary file and swapped in so concurrent readers never see a partial cache.
+		cachePath:Path = self.GetHistoryCachePath()
+		cachePath.parent.mkdir(parents=True, exist_ok=True)
+		fileDescriptor, temporaryPath = tempfile.mkstemp(dir=cachePath.parent, prefix=".history.", suffix=".tmp")
+		try:
+			with os.fdopen(fileDescriptor, "w", encoding="utf-8") as cacheFile:
+				json.dump({"SchemaVersion": self.HistoryCacheSchemaVersion, "Tags": tags}, cacheFile)
+			os.replace(temporaryPath, cachePath)
+		except BaseException:
+			Path(temporaryPath).unlink(missing_ok=True)
+			raise
+
+	def LoadFiles(self) -> None:
+		filesByHash:dict[str, list[str]] = dict[str, list[str]]()
+		for commitHash, commit in self.GitRepo.StreamCommits(selectedAttributes=["Hash"], includeFiles=True):
+			filesByHash[commitHash] = commit["Files"]
+		for versionTag in self:
+			commits:list[ConventionalCommit] = list[ConventionalCommit]()
+			if (isinstance(versionTag.Commits, CommitTable)):
+				#Table rows are copies, so the files are written back into the table itself.
+				for index in range(len(versionTag.Commits)):
+					versionTag.Commits.SetFiles(index, filesByHash.get(versionTag.Commits.GetHash(index)) or None)
+			elif (versionTag.Commits is not None):
+				commits.extend(versionTag.Commits)
+			if (versionTag.TagCommit is not None):
+				commits.append(versionTag.TagCommit)
+			for commit in commits:
+				files:list[str] | None = filesByHash.get(commit.Hash)
+				if (files is not None
+					and len(files) > 0):
+					commit.Files = files
+				else:
+					commit.Files = None
+		self.FilesLoaded = True
 
 	def ToJSON(self) -> str:
 		return json.dumps(self.Serializable(), indent=4)
 
 	def GetChangeLogMarkdown(self, includeChangedFilesInChangeLog:bool = False) -> str:
-		retrunValue:str = ""
+		stream:io.StringIO = io.StringIO()
+		self.WriteChangeLogMarkdown(stream, includeChangedFilesInChangeLog)
+		return stream.getvalue()
+
+	def WriteChangeLogMarkdown(self, stream:TextIO, includeChangedFilesInChangeLog:bool = False) -> None:
+		#Writes one line at a time so the changelog is never held in memory as a whole.
 		repoURL:str = ""
+		if (includeChangedFilesInChangeLog
+			and not self.FilesLoaded
+			and self.GitRepo is not None):
+			self.LoadFiles()
+		title:str = "CHANGELOG"
+		if (self.PackageName is not None):
+			title = f"{self.PackageName} - CHANGELOG"
 		if (self.RepoMeta is not None):
 			repoURL = self.RepoMeta.URL
-			retrunValue = f"# {self.RepoMeta.Organization}/{self.RepoMeta.Name} - CHANGELOG\n---\n\n"
+			stream.write(f"# {self.RepoMeta.Organization}/{self.RepoMeta.Name} - {title}\n---\n\n")
 		else:
-			retrunValue = f"# CHANGELOG\n---\n\n"
-		for versionTag in self._list:
+			stream.write(f"# {title}\n---\n\n")
+		for versionTag in self:
 			tagDate:str = ""
 			badges:str = "&nbsp;&nbsp;&nbsp;".join(versionTag.Stats.GetBadges())
 			if (versionTag.TagCommit is not None
@@ -516,78 +1014,220 @@ class VersionTags:
 				tagDate = versionTag.TagCommit.CommitterDate.strftime("%Y-%m-%d")
 			else:
 				tagDate = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d")
-			retrunValue = f"{retrunValue}## [{versionTag.Name}]({repoURL}/releases/tag/{versionTag.Name}) ({tagDate})\n"
-			retrunValue = f"{retrunValue}{badges}\n"
-			if (versionTag.Commits is not None and len(versionTag.Commits) > 0):
+			stream.write(f"## [{versionTag.Name}]({repoURL}/releases/tag/{versionTag.Name}) ({tagDate})\n")
+			stream.write(f"{badges}\n")
+			if (isinstance(versionTag.Commits, CommitTable)
+				and len(versionTag.Commits) > 0):
+				#Read straight from the columns; no row is materialized.
+				commitTable:CommitTable = versionTag.Commits
+				for index in range(len(commitTable)):
+					self.WriteChangeLogCommit(stream, repoURL, includeChangedFilesInChangeLog,
+						commitTable.GetType(index), commitTable.GetScope(index), commitTable.GetDescription(index),
+						commitTable.GetHash(index), commitTable.GetAbbreviatedHash(index), commitTable.GetCommitterDate(index), commitTable.Files.get(index))
+			elif (versionTag.Commits is not None and len(versionTag.Commits) > 0):
 				for commit in versionTag.Commits:
-					commitText:str = ""
-					commitDate:str = ""
-					subject:str = f"{str(commit.Type).lower()}:{commit.Description}"
-					commitLink:str = f"[{commit.AbbreviatedHash}]({repoURL}/commit/{commit.Hash})"
-					if (commit.CommitterDate is not None):
-						commitDate = commit.CommitterDate.strftime("%Y-%m-%d")
-					if (commit.Scope is not None):
-						if (commit.Scope in self.RepoMeta.ScopeLinks.keys()):
-							subject:str = f"{str(commit.Type).lower()}([{commit.Scope}]({self.RepoMeta.ScopeLinks[commit.Scope]})):{commit.Description}"
-						else:
-							subject:str = f"{str(commit.Type).lower()}({commit.Scope}):{commit.Description}"
-					commitText = f"{commit.Type.GetEmoji()} {subject} - {commitLink} {commitDate}"
-					if (includeChangedFilesInChangeLog
-		 				and commit.Files is not None
-		 				and len(commit.Files) > 0):
-						for file in commit.Files:
-							commitText += f"\n	* {file}"
-					retrunValue = f"{retrunValue}* {commitText}\n"
+					self.WriteChangeLogCommit(stream, repoURL, includeChangedFilesInChangeLog,
+						commit.Type, commit.Scope, commit.Description,
+						commit.Hash, commit.AbbreviatedHash, commit.CommitterDate, commit.Files)
 			else:
-				retrunValue = f"{retrunValue}* NO COMMITS FOUND\n"
-		return retrunValue
-
-	def SaveChangeLog(self, filePath:Path|None = None, includeChangedFilesInChangeLog:bool = False) -> None:
-		if (filePath is None):
+				stream.write("* NO COMMITS FOUND\n")
+
+	def WriteChangeLogCommit(self, stream:TextIO, repoURL:str, includeChangedFilesInChangeLog:bool,
+			commitType:CommitType, scope:str | None, description:str | None,
+			commitHash:str, abbreviatedHash:str | None, committerDate:datetime.datetime | None, files:list[str] | None) -> None:
+		commitDate:str = ""
+		subject:str = f"{str(commitType).lower()}:{description}"
+		commitLink:str = f"[{abbreviatedHash}]({repoURL}/commit/{commitHash})"
+		if (committerDate is not None):
+			commitDate = committerDate.strftime("%Y-%m-%d")
+		if (scope is not None):
+			if (scope in self.RepoMeta.ScopeLinks.keys()):
+				subject:str = f"{str(commitType).lower()}([{scope}]({self.RepoMeta.ScopeLinks[scope]})):{description}"
+			else:
+				subject:str = f"{str(commitType).lower()}({scope}):{description}"
+		stream.write(f"* {commitType.GetEmoji()} {subject} - {commitLink} {commitDate}")
+		if (includeChangedFilesInChangeLog
+			and files is not None
+			and len(files) > 0):
+			for file in files:
+				stream.write(f"\n	* {file}")
+		stream.write("\n")
+
+	def SaveChangeLog(self, filePath:Path|None = None, includeChangedFilesInChangeLog:bool = False, transaction:FileTransaction | None = None) -> None:
+		if (filePath is None
+			and self.PackagePath is not None):
+			filePath = self.RepoPath.joinpath(self.PackagePath, "CHANGELOG.md")
+		elif (filePath is None):
 			filePath = self.RepoPath.joinpath("CHANGELOG.md")
-		filePath.write_text(self.GetChangeLogMarkdown(includeChangedFilesInChangeLog=includeChangedFilesInChangeLog), encoding="utf-16")
+		if (transaction is not None):
+			with transaction.Open(filePath, encoding="utf-16") as changeLogFile:
+				self.WriteChangeLogMarkdown(changeLogFile, includeChangedFilesInChangeLog=includeChangedFilesInChangeLog)
+		else:
+			#Rendered into a temporary file beside the changelog, so a failure part way through leaves the previous one in place.
+			with FileTransaction() as changeLogTransaction:
+				with changeLogTransaction.Open(filePath, encoding="utf-16") as changeLogFile:
+					self.WriteChangeLogMarkdown(changeLogFile, includeChangedFilesInChangeLog=includeChangedFilesInChangeLog)
 
 	def SaveJSON(self, filePath:Path) -> None:
 		filePath.write_text(self.ToJSON())
 
-	def CommitVersion(self, tagName:str, message:str, paths:list[Path]):
-		commitHash:str = self.GitRepo.MakeCommit(message, paths)
-		self.GitRepo.TagCommit(tagName, commitHash)
+	def CommitVersion(self, tagName:str, message:str, paths:list[Path]) -> str:
+		return self.GitRepo.CommitAndTag(message, paths, tagName)
 
 class VersionScanner:
+	Executors:list[str] = ["thread", "process"]
 	RepoPath:Path|None = None
 	PyProjectPaths:list[Path] = list[Path]()
 	SQLProjectPaths:list[Path] = list[Path]()
 	SQLPublishProfilePaths:list[Path] = list[Path]()
 	Versions:list[dict] = list[dict]()
-
-	def __init__(self, searchPath:Path) -> None:
+	Errors:list[dict] = list[dict]()
+		#Manifests that could not be read, as {Type, RelativePath, Error}; they are left out of Versions.
+	Manifests:dict[Path, Manifest] = dict[Path, Manifest]()
+		#Parsed manifests by path; pass them to Versioning so a bump does not read the files again.
+	UseScanCache:bool = False
+	ScanCacheSchemaVersion:int = 1
+
+	def __init__(self, searchPath:Path, ignoreDirectoryNames:list[str] | None = None, useGitIgnore:bool = True, discovery:str = "walk",
+			workers:int = 1, executor:str = "thread", useScanCache:bool = False) -> None:
+		#workers > 1 parses manifests concurrently; lxml releases the GIL, so threads scale for the XML manifests.
+		#useScanCache keeps each manifest's result keyed by its stat, so unchanged files are not read again.
+		if (executor not in self.Executors):
+			raise ValueError(f"Unknown executor {executor}, expected one of {", ".join(self.Executors)}")
+		self.PyProjectPaths = list[Path]()
+		self.SQLProjectPaths = list[Path]()
+		self.SQLPublishProfilePaths = list[Path]()
+		self.Versions = list[dict]()
+		self.Errors = list[dict]()
+		self.Manifests = dict[Path, Manifest]()
+		self.UseScanCache = useScanCache
 		self.RepoPath = self.GetRepoPathFromPath(searchPath)
 		if (self.RepoPath is not None):
-			for path in self.RepoPath.rglob("pyproject.toml"):
-				self.PyProjectPaths.append(path)
-				self.Versions.append({
-						"Type": "PyProject",
-						"RelativePath": path.relative_to(self.RepoPath),
-						"ProjectName": self.GetPyProjectName(path),
-						"Version": self.GetPyProjectVersion(path)
-				})
-			for path in self.RepoPath.rglob("*.sqlproj"):
-				self.SQLProjectPaths.append(path)
-				self.Versions.append({
-						"Type": "SQLProject",
+			manifestPaths:dict[str, list[Path]] = ManifestFinder(self.RepoPath, ignoreDirectoryNames, useGitIgnore, discovery).Find()
+			self.PyProjectPaths.extend(manifestPaths["PyProject"])
+			self.SQLProjectPaths.extend(manifestPaths["SQLProject"])
+			self.SQLPublishProfilePaths.extend(manifestPaths["SQLPublishProfile"])
+			manifests:list[tuple[str, Path]] = list[tuple[str, Path]]()
+			for manifestType in ["PyProject", "SQLProject", "SQLPublishProfile"]:
+				manifests.extend((manifestType, path) for path in manifestPaths[manifestType])
+			self.ReadManifests(manifests, workers, executor)
+
+	def ReadManifests(self, manifests:list[tuple[str, Path]], workers:int, executor:str) -> None:
+		results:list[tuple[str | None, SemVer | None, str | None, Manifest | None] | None] = [None] * len(manifests)
+		fileStats:list[list[int] | None] = [None] * len(manifests)
+		scanCache:dict = dict()
+		updatedScanCache:dict = dict()
+		#Files modified after this point may change again within the same mtime tick, so they are not cached.
+		scanStartTime:int = time.time_ns()
+		if (self.UseScanCache):
+			scanCache = self.LoadScanCache()
+			for index, (manifestType, path) in enumerate(manifests):
+				try:
+					fileStat:os.stat_result = path.stat()
+					fileStats[index] = [fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino]
+				except OSError:
+					fileStats[index] = None
+				cacheEntry:dict | None = scanCache.get(path.relative_to(self.RepoPath).as_posix())
+				if (cacheEntry is not None
+					and fileStats[index] is not None
+					and cacheEntry["Type"] == manifestType
+					and cacheEntry["Stat"] == fileStats[index]):
+					#A cached manifest is not read at all; Versioning opens it if a bump needs it.
+					results[index] = (cacheEntry["ProjectName"], Manifest.ParseVersionText(cacheEntry["Version"]), cacheEntry["Error"], None)
+		pendingIndexes:list[int] = [index for index, result in enumerate(results) if result is None]
+		pendingResults:list[tuple[str | None, SemVer | None, str | None, Manifest | None]] = self.ParseManifests([manifests[index] for index in pendingIndexes], workers, executor)
+		for index, result in zip(pendingIndexes, pendingResults):
+			results[index] = result
+		for (manifestType, path), fileStatValues, (projectName, version, error, manifest) in zip(manifests, fileStats, results):
+			if (manifest is not None):
+				#Under the process executor the manifest was parsed in a worker and this is its pickled copy.
+				self.Manifests[path] = manifest
+			if (error is not None):
+				#A manifest that could not be read is left out in every executor mode.
+				self.Manifests.pop(path, None)
+				self.Errors.append({
+						"Type": manifestType,
 						"RelativePath": path.relative_to(self.RepoPath),
-						"ProjectName": self.GetSQLProjectName(path),
-						"Version": self.GetSQLProjectVersion(path)
+						"Error": error
 				})
-			for path in self.RepoPath.rglob("*.publish.xml"):
-				self.SQLPublishProfilePaths.append(path)
+			else:
 				self.Versions.append({
-						"Type": "SQLPublishProfile",
+						"Type": manifestType,
 						"RelativePath": path.relative_to(self.RepoPath),
-						"ProjectName": self.GetSQLPublishProfileName(path),
-						"Version": self.GetSQLPublishProfileVersion(path)
+						"ProjectName": projectName,
+						"Version": version
 				})
+			if (fileStatValues is not None
+				and fileStatValues[1] < scanStartTime):
+				versionText:str | None = None
+				if (version is not None):
+					versionText = str(version)
+				updatedScanCache[path.relative_to(self.RepoPath).as_posix()] = {
+					"Type": manifestType,
+					"Stat": fileStatValues,
+					"ProjectName": projectName,
+					"Version": versionText,
+					"Error": error
+				}
+		if (self.UseScanCache
+			and updatedScanCache != scanCache):
+			self.SaveScanCache(updatedScanCache)
+
+	def ParseManifests(self, manifests:list[tuple[str, Path]], workers:int, executor:str) -> list[tuple[str | None, SemVer | None, str | None, Manifest | None]]:
+		returnValue:list[tuple[str | None, SemVer | None, str | None, Manifest | None]] = None
+		manifestTypes:list[str] = [manifestType for manifestType, path in manifests]
+		paths:list[Path] = [path for manifestType, path in manifests]
+		if (workers > 1
+			and len(manifests) > 1):
+			poolExecutor:concurrent.futures.Executor = None
+			if (executor == "process"):
+				poolExecutor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+			else:
+				poolExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+			with poolExecutor:
+				#map yields in submission order, so Versions comes out the same as a serial scan.
+				returnValue = list(poolExecutor.map(self.ReadManifest, manifestTypes, paths, chunksize=max(1, len(manifests) // (workers * 4))))
+		else:
+			returnValue = list(map(self.ReadManifest, manifestTypes, paths))
+		return returnValue
+
+	def GetScanCachePath(self) -> Path:
+		return Git.ResolveGitDirPath(self.RepoPath).joinpath("ccsvgit-cache", "manifests.json")
+
+	def LoadScanCache(self) -> dict:
+		returnValue:dict = dict()
+		cachePath:Path = self.GetScanCachePath()
+		if (cachePath.exists()):
+			try:
+				cache:dict = json.loads(cachePath.read_text(encoding="utf-8"))
+				if (cache.get("SchemaVersion") == self.ScanCacheSchemaVersion):
+					returnValue = cache["Manifests"]
+			except (ValueError, KeyError, OSError):
+				returnValue = dict()
+		return returnValue
+
+	def SaveScanCache(self, manifests:dict) -> None:
+		#Written to a temporary file and swapped in, so concurrent scans never see a partial cache; the last writer wins.
+		cachePath:Path = self.GetScanCachePath()
+		cachePath.parent.mkdir(parents=True, exist_ok=True)
+		fileDescriptor, temporaryPath = tempfile.mkstemp(dir=cachePath.parent, prefix=".manifests.", suffix=".tmp")
+		try:
+			with os.fdopen(fileDescriptor, "w", encoding="utf-8") as cacheFile:
+				json.dump({"SchemaVersion": self.ScanCacheSchemaVersion, "Manifests": manifests}, cacheFile)
+			os.replace(temporaryPath, cachePath)
+		except BaseException:
+			Path(temporaryPath).unlink(missing_ok=True)
+			raise
+
+	def ReadManifest(self, manifestType:str, path:Path) -> tuple[str | None, SemVer | None, str | None, Manifest | None]:
+		#(project name, version, error, manifest); the error is a string and the manifest pickles, so results can cross process boundaries.
+		returnValue:tuple[str | None, SemVer | None, str | None, Manifest | None] = (None, None, None, None)
+		try:
+			manifest:Manifest = self.GetManifest(manifestType, path)
+			returnValue = (manifest.GetName(), manifest.GetVersion(), None, manifest)
+		except Exception as exception:
+			returnValue = (None, None, f"{type(exception).__name__}: {exception}", None)
+		return returnValue
 
 	def GetRepoPathFromPath(self, searchPath:Path) -> Path:
 		continueLoop:bool = True
@@ -611,86 +1251,33 @@ class VersionScanner:
 			raise  Exception("Git Repo Not Found")
 		return gitRepoDir
 
-	def GetPyProjectName(self, tomlPath:Path) -> str:
-		returnValue:str = None
-		tomlData:dict = tomllib.loads(tomlPath.read_text())
-		returnValue = tomlData["project"]["name"]
+	def GetManifest(self, manifestType:str, path:Path) -> Manifest:
+		returnValue:Manifest | None = self.Manifests.get(path)
+		if (returnValue is None):
+			returnValue = Manifest.Open(manifestType, path)
+			self.Manifests[path] = returnValue
 		return returnValue
 
+	def GetPyProjectName(self, tomlPath:Path) -> str:
+		return self.GetManifest("PyProject", tomlPath).GetName()
+
 	def GetPyProjectVersion(self, tomlPath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tomlData:dict = tomllib.loads(tomlPath.read_text())
-		returnValue = SemVer.parse(tomlData["project"]["version"])
-		return returnValue
+		return self.GetManifest("PyProject", tomlPath).GetVersion()
 
 	def GetSQLProjectName(self, sqlProjPath:Path) -> str:
-		returnValue:str = None
-		tree = etree.parse(sqlProjPath)
-		projectNameElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'Name']")
-		if (projectNameElement is not None and len(projectNameElement) > 0):
-			returnValue = projectNameElement[0].text
-		return returnValue
+		return self.GetManifest("SQLProject", sqlProjPath).GetName()
 
 	def GetSQLProjectVersion(self, sqlProjPath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tree = etree.parse(sqlProjPath)
-		defaultDatabaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'DefaultValue']")
-		if (defaultDatabaseVersionElement is not None and len(defaultDatabaseVersionElement) > 0):
-			versionText:str = defaultDatabaseVersionElement[0].text
-			if (versionText.startswith("v")):
-				versionText = versionText[1::]
-			returnValue = SemVer.parse(versionText)
-		return returnValue
+		return self.GetManifest("SQLProject", sqlProjPath).GetVersion()
 
 	def GetSQLPublishProfileName(self, sqlPublishProfilePath:Path) -> str:
-		returnValue:str = None
-		targetServerName:str = None
-		targetDatabaseName:str = None
-		targetConnectionString:str = None
-		tree = etree.parse(sqlPublishProfilePath)
-		targetDatabaseNameElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetDatabaseName']")
-		if (targetDatabaseNameElement is not None and len(targetDatabaseNameElement) > 0):
-			targetDatabaseName = targetDatabaseNameElement[0].text
-		targetConnectionStringElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetConnectionString']")
-		if (targetConnectionStringElement is not None and len(targetConnectionStringElement) > 0):
-			targetConnectionString = targetConnectionStringElement[0].text
-		if (targetConnectionString is not None):
-			connString:dict = self.ParseSQLServerConnectionString(targetConnectionString)
-			if ("Data Source" in connString.keys()):
-				targetServerName = connString["Data Source"]
-		returnValue = f"[{targetServerName}].[{targetDatabaseName}]"
-		return returnValue
+		return self.GetManifest("SQLPublishProfile", sqlPublishProfilePath).GetName()
 
 	def GetSQLPublishProfileVersion(self, sqlPublishProfilePath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tree = etree.parse(sqlPublishProfilePath)
-		databaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'Value']")
-		if (databaseVersionElement is not None and len(databaseVersionElement) > 0):
-			versionText:str = databaseVersionElement[0].text
-			if (versionText.startswith("v")):
-				versionText = versionText[1::]
-			returnValue = SemVer.parse(versionText)
-		return returnValue
+		return self.GetManifest("SQLPublishProfile", sqlPublishProfilePath).GetVersion()
 
 	def ParseSQLServerConnectionString(self, connectionString:str, removeSensitiveInfo:bool = False) -> dict:
-		returnValue:dict = dict()
-		for keyValue in connectionString.split(";"):
-			keyValue = keyValue.strip()
-			if (keyValue):
-				keyValuePair:list = keyValue.split("=")
-				key:str = ""
-				value:str = ""
-				if (len(keyValuePair) == 2):
-					key = keyValuePair[0].strip()
-					value = keyValuePair[1].strip()
-					returnValue.update({key: value})
-				elif (len(keyValuePair) == 1):
-					key = keyValuePair[0].strip()
-					value = ""
-					returnValue.update({key: value})
-		if (removeSensitiveInfo):
-			returnValue.pop("Password")
-		return returnValue
+		return SQLPublishProfileManifest.ParseSQLServerConnectionString(connectionString, removeSensitiveInfo)
 
 	def GetFancyTable(self,
 		borderColor:str|None=None,
@@ -874,6 +1461,156 @@ class VersionScanner:
 			returnValue += f"{pathString}\n\t{nameString}\t{typeString}\t\t{versionString}\n"
 		return returnValue
 
+class PackageVersionTags:
+	#Per-package versioning for a monorepo: every project directory found by a VersionScanner is a package
+	#with its own tag namespace (<package>@v1.2.3), VersionTags and changelog.
+	#All packages are loaded from one walk of the history; a commit belongs to each package whose files it touched.
+	GitAttributes:list[str] = ConventionalCommit.GitAttributes + ["ParentHashes"]
+	PackageManifestTypes:list[str] = ["PyProject", "SQLProject"]
+		#Publish profiles deploy a project rather than being one, so they do not make a package.
+	GitRepo:Git | None = None
+	RepoPath:Path | None = None
+	RepoMeta:GitRepoMeta | None = None
+	UseCommitTable:bool = False
+	Packages:dict[str, VersionTags] = dict[str, VersionTags]()
+		#Package name to its VersionTags.
+	PackageNames:dict[str, str] = dict[str, str]()
+		#Package directory (relative posix path, "" for the repository root) to package name.
+
+	def __iter__(self):
+		return iter(self.Packages.values())
+
+	def __getitem__(self, packageName:str) -> VersionTags:
+		return self.Packages[packageName]
+
+	def __len__(self) -> int:
+		return len(self.Packages)
+
+	def __init__(self, versionScanner:VersionScanner, includeFiles:bool = False, backend:str | None = None, useCommitTable:bool = False) -> None:
+		self.UseCommitTable = useCommitTable
+		self.Packages = dict[str, VersionTags]()
+		self.PackageNames = dict[str, str]()
+		if (versionScanner.RepoPath is not None):
+			self.GitRepo = Git(versionScanner.RepoPath, backend=backend)
+			self.RepoPath = self.GitRepo.RepoPath
+			self.RepoMeta = self.GitRepo.GetRepoMeta()
+			self.AddPackages(versionScanner.Versions)
+			self.LoadFromRepo(includeFiles)
+
+	def AddPackages(self, versions:list[dict]) -> None:
+		#The first manifest of a directory names its package.
+		tagPrefixes:dict[str, str] = dict[str, str]()
+		for version in versions:
+			packagePath:Path = version["RelativePath"].parent
+			packageDirectory:str = packagePath.as_posix()
+			if (packageDirectory == "."):
+				packageDirectory = ""
+			if (version["Type"] in self.PackageManifestTypes
+				and version["ProjectName"] is not None
+				and packageDirectory not in self.PackageNames):
+				packageName:str = version["ProjectName"]
+				tagPrefix:str = VersionTags.GetTagPrefix(packageName)
+				if (tagPrefix in tagPrefixes):
+					raise  Exception(f"Packages {tagPrefixes[tagPrefix]} and {packageName} share the tag prefix {tagPrefix}")
+				tagPrefixes[tagPrefix] = packageName
+				self.PackageNames[packageDirectory] = packageName
+				packageVersionTags:VersionTags = VersionTags(useCommitTable=self.UseCommitTable, packageName=packageName, packagePath=packagePath)
+				packageVersionTags.GitRepo = self.GitRepo
+				packageVersionTags.RepoPath = self.RepoPath
+				packageVersionTags.RepoMeta = self.RepoMeta
+				self.Packages[packageName] = packageVersionTags
+
+	def GetPackageName(self, filePath:str) -> str | None:
+		#The package of the deepest package directory holding filePath.
+		returnValue:str | None = None
+		directory:str = filePath
+		while (returnValue is None
+			and len(directory) > 0):
+			directory = directory.rpartition("/")[0]
+			returnValue = self.PackageNames.get(directory)
+		return returnValue
+
+	def LoadFromRepo(self, includeFiles:bool = False) -> None:
+		packagesByPrefix:dict[str, VersionTags] = {packageVersionTags.TagPrefix: packageVersionTags for packageVersionTags in self.Packages.values()}
+		tagsByPackage:dict[str, list[dict]] = {packageName: list[dict]() for packageName in self.Packages.keys()}
+		for tag in self.GitRepo.GetTags(ConventionalCommit.GitAttributes, False):
+			tagPrefix, separator, version = tag["Name"].rpartition("@")
+			packageVersionTags:VersionTags | None = packagesByPrefix.get(f"{tagPrefix}@")
+			if (len(separator) > 0
+				and packageVersionTags is not None):
+				tagsByPackage[packageVersionTags.PackageName].append(tag)
+		#The single walk: parents of every commit, for ranges, and the commits each package touched, newest first.
+		parentHashes:dict[str, list[str]] = dict[str, list[str]]()
+		commitsByPackage:dict[str, list[dict]] = {packageName: list[dict]() for packageName in self.Packages.keys()}
+		includeRevisions:list[str] = ["HEAD"]
+		includeRevisions.extend(sorted(set(tag["Hash"] for tags in tagsByPackage.values() for tag in tags)))
+		for commitHash, commit in self.GitRepo.StreamCommits(includeRevisions=includeRevisions, selectedAttributes=self.GitAttributes, includeFiles=True):
+			parentHashes[commitHash] = (commit["ParentHashes"] or "").split()
+			#Merge commits are left out, as they are from the repository's tag ranges.
+			if (len(parentHashes[commitHash]) < 2):
+				filesByPackage:dict[str, list[str]] = dict[str, list[str]]()
+				for filePath in commit["Files"]:
+					packageName:str | None = self.GetPackageName(filePath)
+					if (packageName is not None):
+						filesByPackage.setdefault(packageName, list[str]()).append(filePath)
+				for packageName, files in filesByPackage.items():
+					packageCommit:dict = dict(commit, Files=None)
+					if (includeFiles):
+						packageCommit["Files"] = files
+					commitsByPackage[packageName].append(packageCommit)
+		for packageName, packageVersionTags in self.Packages.items():
+			self.LoadPackage(packageVersionTags, tagsByPackage[packageName], commitsByPackage[packageName], parentHashes)
+			packageVersionTags.FilesLoaded = includeFiles
+
+	def LoadPackage(self, packageVersionTags:VersionTags, tags:list[dict], commits:list[dict], parentHashes:dict[str, list[str]]) -> None:
+		#Like VersionTags.LoadFromRepo, a commit belongs to the lowest version tag it is reachable from and the rest go to the prerelease.
+		packageVersionTags.Clear()
+		tags = sorted(tags, key=lambda tag: Versioning.GetVersionSortKey(tag["Name"][len(packageVersionTags.TagPrefix):]))
+		versionTags:list[VersionTag] = list[VersionTag]()
+		tagIndexes:dict[str, int] = dict[str, int]()
+		for index, tag in enumerate(tags):
+			versionTag:VersionTag = VersionTag(
+				name=tag["Name"],
+				version=tag["Name"][len(packageVersionTags.TagPrefix):],
+				useCommitTable=self.UseCommitTable
+			)
+			versionTag.SetTagCommit(tag)
+			versionTags.append(versionTag)
+			pendingHashes:list[str] = [tag["Hash"]]
+			while (len(pendingHashes) > 0):
+				commitHash:str = pendingHashes.pop()
+				if (commitHash not in tagIndexes):
+					tagIndexes[commitHash] = index
+					pendingHashes.extend(parentHashes.get(commitHash, []))
+		tagHashes:set[str] = set(tag["Hash"] for tag in tags)
+		untaggedCommits:list[dict] = list[dict]()
+		for commit in commits:
+			#A tag's own commit is its TagCommit rather than one of its commits.
+			if (commit["Hash"] not in tagHashes):
+				index:int | None = tagIndexes.get(commit["Hash"])
+				if (index is None):
+					untaggedCommits.append(commit)
+				else:
+					versionTags[index].AppendCommit(commit)
+		for versionTag in versionTags:
+			packageVersionTags.Add(versionTag)
+		packageVersionTags.CreatePrerelease(untaggedCommits)
+
+	def SaveChangeLogs(self, includeChangedFilesInChangeLog:bool = False, transaction:FileTransaction | None = None) -> list[Path]:
+		#Writes each package's CHANGELOG.md into its directory and returns the paths written.
+		returnValue:list[Path] = list[Path]()
+		for packageVersionTags in self.Packages.values():
+			filePath:Path = self.RepoPath.joinpath(packageVersionTags.PackagePath, "CHANGELOG.md")
+			packageVersionTags.SaveChangeLog(filePath, includeChangedFilesInChangeLog, transaction)
+			returnValue.append(filePath)
+		return returnValue
+
+	def Serializable(self) -> dict[str, list[dict]]:
+		return {packageName: packageVersionTags.Serializable() for packageName, packageVersionTags in self.Packages.items()}
+
+	def ToJSON(self) -> str:
+		return json.dumps(self.Serializable(), indent=4)
+
 class Versioning:
 	RepoSearchPath:Path | None = None
 	RepoVersionTags:VersionTags | None = None
@@ -881,46 +1618,200 @@ class Versioning:
 	SQLProjectPaths:list[Path] = list[Path]()
 	SQLPublishProfilePaths:list[Path] = list[Path]()
 	ChangedFiles:list[dict] = list[dict]()
+	Manifests:dict[Path, Manifest] = dict[Path, Manifest]()
+	BumpModes:list[str] = ["interactive", "auto"]
+	Transaction:FileTransaction | None = None
+		#While a bump runs, the changelog and manifest writes are staged here and land together at the end.
+
+	@staticmethod
+	@functools.lru_cache(maxsize=65536)
+	def GetVersionSortKey(version:str) -> tuple:
+		#SemVer 2.0 precedence: build metadata is ignored, a prerelease sorts below its release,
+		#numeric identifiers compare numerically and below alphanumeric ones, and more identifiers win a tie.
+		core, separator, prerelease = version.removeprefix("v").partition("+")[0].partition("-")
+		prereleaseKey:tuple = (1,)
+		if (len(separator) > 0):
+			prereleaseKey = (0,) + tuple((0, int(identifier), "") if identifier.isdecimal() else (1, 0, identifier) for identifier in prerelease.split("."))
+		return (tuple(int(element) for element in core.split(".")), prereleaseKey)
 
 	@staticmethod
 	def VersionToBytes(version:str) -> bytes:
-		returnValue:bytes = None
-		if (version.startswith("v")):
-			version = version[1::]
-		versionHex:str = ""
-		for element in version.split("."):
-			versionHex += ''.join(format(x, '02x') for x in int(element).to_bytes(4))
-		returnValue = bytes.fromhex(versionHex)
-		return returnValue
+		#Deprecated: compare GetVersionSortKey instead, which also orders prereleases. Still the release numbers as 4 big-endian bytes each.
+		warnings.warn("Versioning.VersionToBytes is deprecated, use Versioning.GetVersionSortKey", DeprecationWarning, stacklevel=2)
+		return b"".join(element.to_bytes(4) for element in Versioning.GetVersionSortKey(version)[0])
+
+	@staticmethod
+	def SortVersions(versions:Iterable[str], reverse:bool = False) -> list[str]:
+		return sorted(versions, key=Versioning.GetVersionSortKey, reverse=reverse)
+
+	@staticmethod
+	def MaxVersion(versions:Iterable[str]) -> str | None:
+		return max(versions, key=Versioning.GetVersionSortKey, default=None)
 
 	@staticmethod
 	def VersionCompare(firstVersion:str, secondVersion:str) -> str:
 		returnValue:str = "="
-		firstVersionBytes:bytes = Versioning.VersionToBytes(firstVersion)
-		secondVersionBytes:bytes = Versioning.VersionToBytes(secondVersion)
-		if (firstVersionBytes == secondVersionBytes):
+		firstVersionKey:tuple = Versioning.GetVersionSortKey(firstVersion)
+		secondVersionKey:tuple = Versioning.GetVersionSortKey(secondVersion)
+		if (firstVersionKey == secondVersionKey):
 			returnValue = "="
-		elif (firstVersionBytes < secondVersionBytes):
+		elif (firstVersionKey < secondVersionKey):
 			returnValue = "<"
-		elif (firstVersionBytes > secondVersionBytes):
+		elif (firstVersionKey > secondVersionKey):
 			returnValue = ">"
 		return returnValue
 
-	def __init__(self, repoSearchPath:Path | None = None) -> None:
+	def __init__(self, repoSearchPath:Path | None = None, ignoreDirectoryNames:list[str] | None = None, useGitIgnore:bool = True, discovery:str = "walk",
+			manifests:Iterable[Manifest] | None = None) -> None:
+		self.PyProjectPaths = list[Path]()
+		self.SQLProjectPaths = list[Path]()
+		self.SQLPublishProfilePaths = list[Path]()
+		self.ChangedFiles = list[dict]()
+		self.Manifests = dict[Path, Manifest]()
+		self.Transaction = None
+		if (manifests is not None):
+			self.Manifests.update((manifest.FilePath, manifest) for manifest in manifests)
 		self.RepoSearchPath = repoSearchPath
 		if (self.RepoSearchPath is not None):
 			self.RepoVersionTags = VersionTags(repoSearchPath)
-			for path in self.RepoVersionTags.RepoPath.rglob("pyproject.toml"):
-				self.PyProjectPaths.append(path)
-			for path in self.RepoVersionTags.RepoPath.rglob("*.sqlproj"):
-				self.SQLProjectPaths.append(path)
-			for path in self.RepoVersionTags.RepoPath.rglob("*.publish.xml"):
-				self.SQLPublishProfilePaths.append(path)
-
-	def BumpAndTag(self, includeChangedFilesInChangeLog:bool = False) -> None:
+			manifestPaths:dict[str, list[Path]] = ManifestFinder(self.RepoVersionTags.RepoPath, ignoreDirectoryNames, useGitIgnore, discovery).Find()
+			self.PyProjectPaths.extend(manifestPaths["PyProject"])
+			self.SQLProjectPaths.extend(manifestPaths["SQLProject"])
+			self.SQLPublishProfilePaths.extend(manifestPaths["SQLPublishProfile"])
+
+	def BumpAndTag(self, includeChangedFilesInChangeLog:bool = False, mode:str = "interactive",
+			finalVersion:SemVer | str | None = None, workers:int = 1, makeCommit:bool = True) -> dict | None:
+		#interactive: prompt for the final version of the repo and of each manifest.
+		#auto: no prompts or per-file output; every manifest gets finalVersion and a result dict is returned.
+		if (mode not in self.BumpModes):
+			raise ValueError(f"Unknown bump mode {mode}, expected one of {", ".join(self.BumpModes)}")
+		returnValue:dict | None = None
+		if (mode == "auto"):
+			returnValue = self.BumpAndTagBatch(includeChangedFilesInChangeLog, finalVersion, workers, makeCommit)
+		else:
+			self.BumpAndTagInteractive(includeChangedFilesInChangeLog)
+		return returnValue
+
+	def BumpAndTagBatch(self, includeChangedFilesInChangeLog:bool = False, finalVersion:SemVer | str | None = None, workers:int = 1, makeCommit:bool = True) -> dict | None:
+		#finalVersion defaults to the finalized unreleased version. Nothing is written or committed when any manifest fails.
+		returnValue:dict | None = None
+		#Each batch reports only its own files; PrintOutChangedFiles reads the latest batch.
+		self.ChangedFiles = list[dict]()
+		if (self.RepoVersionTags is not None):
+			if (finalVersion is None):
+				finalVersion = self.RepoVersionTags.GetLatest().Version.finalize_version()
+			elif (isinstance(finalVersion, str)):
+				finalVersion = SemVer.parse(finalVersion.removeprefix("v"))
+			unreleasedVersion:SemVer = self.RepoVersionTags.GetLatest().Version
+			self.RepoVersionTags.SetLatestVersion(finalVersion)
+			tagName:str = self.RepoVersionTags.GetLatest().Name
+			self.BeginTransaction()
+			results:list[dict] = None
+			errors:list[dict] = list[dict]()
+			isWritten:bool = False
+			try:
+				try:
+					self.RepoVersionTags.SaveChangeLog(includeChangedFilesInChangeLog=includeChangedFilesInChangeLog, transaction=self.Transaction)
+					results = self.ApplyVersionPlan(self.GetVersionPlan(finalVersion), workers)
+				except BaseException:
+					self.EndTransaction(False)
+					raise
+				for result in results:
+					if (result["Error"] is not None):
+						errors.append({
+							"Type": result["Type"],
+							"Path": result["Path"],
+							"Error": result["Error"]
+						})
+				#A failed manifest rolls back every staged write, so the tree is never left partly bumped.
+				self.EndTransaction(len(errors) == 0)
+				isWritten = (len(errors) == 0)
+			finally:
+				if (not isWritten):
+					#Nothing was written, so the unreleased version goes back to what the history says.
+					self.RepoVersionTags.SetLatestVersion(unreleasedVersion)
+			changedFilePaths:list[Path] = list[Path]()
+			changedFiles:list[dict] = list[dict]()
+			changedFiles.append({
+				"Type": "ChangeLog",
+				"Path": self.RepoVersionTags.RepoMeta.ChangeLogPath,
+				"IsChanged": isWritten,
+				"PreviousVersion": None,
+				"NewVersion": None
+			})
+			if (isWritten):
+				changedFilePaths.append(self.RepoVersionTags.RepoMeta.ChangeLogPath)
+			for result in results:
+				if (result["Error"] is None):
+					del result["Error"]
+					if (not isWritten):
+						result["IsChanged"] = False
+						result["NewVersion"] = None
+					changedFiles.append(result)
+					if (result["IsChanged"]):
+						changedFilePaths.append(result["Path"])
+			isCommitted:bool = False
+			if (makeCommit
+				and isWritten):
+				self.RepoVersionTags.CommitVersion(tagName, f"build: bump version to {finalVersion}", changedFilePaths)
+				isCommitted = True
+			self.ChangedFiles = changedFiles
+			returnValue = {
+				"Version": finalVersion,
+				"TagName": tagName,
+				"ChangedFiles": changedFiles,
+				"Errors": errors,
+				"IsWritten": isWritten,
+				"IsCommitted": isCommitted
+			}
+		return returnValue
+
+	def GetVersionPlan(self, finalVersion:SemVer) -> list[dict]:
+		returnValue:list[dict] = list[dict]()
+		for manifestType, paths in [("PyProject", self.PyProjectPaths), ("SQLProject", self.SQLProjectPaths), ("SQLPublishProfile", self.SQLPublishProfilePaths)]:
+			for path in paths:
+				returnValue.append({
+					"Type": manifestType,
+					"Path": path,
+					"NewVersion": finalVersion
+				})
+		return returnValue
+
+	def ApplyVersionPlan(self, versionPlan:list[dict], workers:int = 1) -> list[dict]:
+		#Results come back in plan order. Each manifest is a separate file, so they are bumped independently.
+		returnValue:list[dict] = None
+		if (workers > 1
+			and len(versionPlan) > 1):
+			with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as poolExecutor:
+				returnValue = list(poolExecutor.map(self.ApplyVersion, versionPlan))
+		else:
+			returnValue = list(map(self.ApplyVersion, versionPlan))
+		return returnValue
+
+	def ApplyVersion(self, planEntry:dict) -> dict:
+		returnValue:dict = {
+			"Type": planEntry["Type"],
+			"Path": planEntry["Path"],
+			"IsChanged": False,
+			"PreviousVersion": None,
+			"NewVersion": None,
+			"Error": None
+		}
+		try:
+			manifest:Manifest = self.GetManifest(planEntry["Type"], planEntry["Path"])
+			returnValue["PreviousVersion"] = manifest.GetVersion()
+			if (returnValue["PreviousVersion"] != planEntry["NewVersion"]):
+				manifest.SetVersion(planEntry["NewVersion"])
+				if (manifest.Save(self.Transaction)):
+					returnValue["IsChanged"] = True
+					returnValue["NewVersion"] = planEntry["NewVersion"]
+		except Exception as exception:
+			returnValue["Error"] = f"{type(exception).__name__}: {exception}"
+		return returnValue
+
+	def BumpAndTagInteractive(self, includeChangedFilesInChangeLog:bool = False) -> None:
 		changedFilePaths:list[Path] = list[Path]()
 		if (self.RepoVersionTags is not None):
-			self.RepoVersionTags.SaveChangeLog(includeChangedFilesInChangeLog=includeChangedFilesInChangeLog)
 			versionTag:VersionTag = self.RepoVersionTags.GetLatest()
 			outputMessage:str = BuildBox(
 				text="BUMP, COMMIT, AND TAG",
@@ -947,36 +1838,43 @@ class Versioning:
 			print(outputMessage)
 
 			self.RepoVersionTags.SetLatestVersion(finalVersion)
-			self.RepoVersionTags.SaveChangeLog()
-			changedFilePaths.append(self.RepoVersionTags.RepoMeta.ChangeLogPath)
-			self.ChangedFiles.append({
-				"Type": "ChangeLog",
-				"Path": self.RepoVersionTags.RepoMeta.ChangeLogPath,
-				"IsChanged": True,
-				"PreviousVersion": None,
-				"NewVersion": None
-			})
+			#The changelog and manifests are staged and only written once every file has been evaluated.
+			self.BeginTransaction()
+			try:
+				self.RepoVersionTags.SaveChangeLog(includeChangedFilesInChangeLog=includeChangedFilesInChangeLog, transaction=self.Transaction)
+				changedFilePaths.append(self.RepoVersionTags.RepoMeta.ChangeLogPath)
+				self.ChangedFiles.append({
+					"Type": "ChangeLog",
+					"Path": self.RepoVersionTags.RepoMeta.ChangeLogPath,
+					"IsChanged": True,
+					"PreviousVersion": None,
+					"NewVersion": None
+				})
 
-			print()
-			print(colored("Scanning for pyproject.toml files...", color="green"))
-			for tomlPath in self.PyProjectPaths:
-				if (self.EvaluatePyProjectVersion(tomlPath, finalVersion)):
-					changedFilePaths.append(tomlPath)
 				print()
+				print(colored("Scanning for pyproject.toml files...", color="green"))
+				for tomlPath in self.PyProjectPaths:
+					if (self.EvaluatePyProjectVersion(tomlPath, finalVersion)):
+						changedFilePaths.append(tomlPath)
+					print()
 
-			print()
-			print(colored("Scanning for *.sqlproj files...", color="green"))
-			for sqlProjectPath in self.SQLProjectPaths:
-				if (self.EvaluateSQLProjectVersion(sqlProjectPath, finalVersion)):
-					changedFilePaths.append(sqlProjectPath)
 				print()
+				print(colored("Scanning for *.sqlproj files...", color="green"))
+				for sqlProjectPath in self.SQLProjectPaths:
+					if (self.EvaluateSQLProjectVersion(sqlProjectPath, finalVersion)):
+						changedFilePaths.append(sqlProjectPath)
+					print()
 
-			print()
-			print(colored("Scanning for *.publish.xml files...", color="green"))
-			for sqlPublishProfilePath in self.SQLPublishProfilePaths:
-				if (self.EvaluateSQLPublishProfileVersion(sqlPublishProfilePath, finalVersion)):
-					changedFilePaths.append(sqlPublishProfilePath)
 				print()
+				print(colored("Scanning for *.publish.xml files...", color="green"))
+				for sqlPublishProfilePath in self.SQLPublishProfilePaths:
+					if (self.EvaluateSQLPublishProfileVersion(sqlPublishProfilePath, finalVersion)):
+						changedFilePaths.append(sqlPublishProfilePath)
+					print()
+			except BaseException:
+				self.EndTransaction(False)
+				raise
+			self.EndTransaction(True)
 
 			print(BuildBox(
 					text="RESULTS",
@@ -1002,6 +1900,35 @@ class Versioning:
 			else:
 				print(colored("NO COMMIT WAS MADE", "red"))
 
+	def GetManifest(self, manifestType:str, path:Path) -> Manifest:
+		returnValue:Manifest | None = self.Manifests.get(path)
+		if (returnValue is None):
+			returnValue = Manifest.Open(manifestType, path)
+			self.Manifests[path] = returnValue
+		return returnValue
+
+	def SaveManifestVersion(self, manifestType:str, path:Path, version:SemVer) -> None:
+		manifest:Manifest = self.GetManifest(manifestType, path)
+		manifest.SetVersion(version)
+		manifest.Save(self.Transaction)
+
+	def BeginTransaction(self) -> FileTransaction:
+		self.Transaction = FileTransaction()
+		return self.Transaction
+
+	def EndTransaction(self, isCommit:bool) -> None:
+		transaction:FileTransaction = self.Transaction
+		self.Transaction = None
+		try:
+			if (isCommit):
+				transaction.Commit()
+			else:
+				transaction.Rollback()
+		finally:
+			#Manifests may be shared with a VersionScanner, so they are moved to the bytes now on disk rather than dropped.
+			for manifest in self.Manifests.values():
+				manifest.EndTransaction(transaction.IsCommitted)
+
 	def PrintOutChangedFiles(self) -> None:
 		outputMessage = colored("The following file modifications have been made.\n", color="green")
 		outputMessage += colored("red = changed", color="red")
@@ -1129,16 +2056,10 @@ class Versioning:
 		return returnValue
 
 	def GetPyProjectName(self, tomlPath:Path) -> str:
-		returnValue:str = None
-		tomlData:dict = tomllib.loads(tomlPath.read_text())
-		returnValue = tomlData["project"]["name"]
-		return returnValue
+		return self.GetManifest("PyProject", tomlPath).GetName()
 
 	def GetPyProjectVersion(self, tomlPath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tomlData:dict = tomllib.loads(tomlPath.read_text())
-		returnValue = SemVer.parse(tomlData["project"]["version"])
-		return returnValue
+		return self.GetManifest("PyProject", tomlPath).GetVersion()
 
 	def EvaluateSQLProjectVersion(self, path:Path, finalVersion:SemVer) -> bool:
 		returnValue:bool = False
@@ -1227,35 +2148,16 @@ class Versioning:
 		return returnValue
 
 	def SetPyProjectVersion(self, tomlPath:Path, version:SemVer):
-		tomlData:dict = tomllib.loads(tomlPath.read_text())
-		tomlData["project"]["version"] = str(version)
-		tomlPath.write_text(tomli_w.dumps(tomlData))
+		self.SaveManifestVersion("PyProject", tomlPath, version)
 
 	def GetSQLProjectName(self, sqlProjPath:Path) -> str:
-		returnValue:str = None
-		tree = etree.parse(sqlProjPath)
-		projectNameElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'Name']")
-		if (projectNameElement is not None and len(projectNameElement) > 0):
-			returnValue = projectNameElement[0].text
-		return returnValue
+		return self.GetManifest("SQLProject", sqlProjPath).GetName()
 
 	def GetSQLProjectVersion(self, sqlProjPath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tree = etree.parse(sqlProjPath)
-		defaultDatabaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'DefaultValue']")
-		if (defaultDatabaseVersionElement is not None and len(defaultDatabaseVersionElement) > 0):
-			versionText:str = defaultDatabaseVersionElement[0].text
-			if (versionText.startswith("v")):
-				versionText = versionText[1::]
-			returnValue = SemVer.parse(versionText)
-		return returnValue
+		return self.GetManifest("SQLProject", sqlProjPath).GetVersion()
 
 	def SetSQLProjectVersion(self, sqlProjPath:Path, version:SemVer):
-		tree = etree.parse(sqlProjPath)
-		defaultDatabaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'DefaultValue']")
-		if (defaultDatabaseVersionElement is not None and len(defaultDatabaseVersionElement) > 0):
-			defaultDatabaseVersionElement[0].text = f"v{version}"
-		sqlProjPath.write_bytes(etree.tostring(tree, pretty_print=True))
+		self.SaveManifestVersion("SQLProject", sqlProjPath, version)
 
 	def EvaluateSQLPublishProfileVersion(self, path:Path, finalVersion:SemVer) -> bool:
 		returnValue:bool = False
@@ -1344,64 +2246,19 @@ class Versioning:
 		return returnValue
 
 	def ParseSQLServerConnectionString(self, connectionString:str, removeSensitiveInfo:bool = False) -> dict:
-		returnValue:dict = dict()
-		for keyValue in connectionString.split(";"):
-			keyValue = keyValue.strip()
-			if (keyValue):
-				keyValuePair:list = keyValue.split("=")
-				key:str = ""
-				value:str = ""
-				if (len(keyValuePair) == 2):
-					key = keyValuePair[0].strip()
-					value = keyValuePair[1].strip()
-					returnValue.update({key: value})
-				elif (len(keyValuePair) == 1):
-					key = keyValuePair[0].strip()
-					value = ""
-					returnValue.update({key: value})
-		if (removeSensitiveInfo):
-			returnValue.pop("Password")
-		return returnValue
+		return SQLPublishProfileManifest.ParseSQLServerConnectionString(connectionString, removeSensitiveInfo)
 
 	def GetSQLPublishProfileName(self, sqlPublishProfilePath:Path) -> str:
-		returnValue:str = None
-		targetServerName:str = None
-		targetDatabaseName:str = None
-		targetConnectionString:str = None
-		tree = etree.parse(sqlPublishProfilePath)
-		targetDatabaseNameElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetDatabaseName']")
-		if (targetDatabaseNameElement is not None and len(targetDatabaseNameElement) > 0):
-			targetDatabaseName = targetDatabaseNameElement[0].text
-		targetConnectionStringElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'PropertyGroup']/*[local-name() = 'TargetConnectionString']")
-		if (targetConnectionStringElement is not None and len(targetConnectionStringElement) > 0):
-			targetConnectionString = targetConnectionStringElement[0].text
-		if (targetConnectionString is not None):
-			connString:dict = self.ParseSQLServerConnectionString(targetConnectionString)
-			if ("Data Source" in connString.keys()):
-				targetServerName = connString["Data Source"]
-		returnValue = f"{sqlPublishProfilePath.name} - [{targetServerName}].[{targetDatabaseName}]"
-		return returnValue
+		return f"{sqlPublishProfilePath.name} - {self.GetManifest("SQLPublishProfile", sqlPublishProfilePath).GetName()}"
 
 	def GetSQLPublishProfileVersion(self, sqlPublishProfilePath:Path) -> SemVer:
-		returnValue:SemVer = None
-		tree = etree.parse(sqlPublishProfilePath)
-		databaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'Value']")
-		if (databaseVersionElement is not None and len(databaseVersionElement) > 0):
-			versionText:str = databaseVersionElement[0].text
-			if (versionText.startswith("v")):
-				versionText = versionText[1::]
-			returnValue = SemVer.parse(versionText)
-		return returnValue
+		return self.GetManifest("SQLPublishProfile", sqlPublishProfilePath).GetVersion()
 
 	def SetSQLPublishProfileVersion(self, sqlPublishProfilePath:Path, version:SemVer):
-		tree = etree.parse(sqlPublishProfilePath)
-		databaseVersionElement = tree.xpath("//*[local-name() = 'Project']/*[local-name() = 'ItemGroup']/*[local-name() = 'SqlCmdVariable' and @Include='DatabaseVersion']/*[local-name() = 'Value']")
-		if (databaseVersionElement is not None and len(databaseVersionElement) > 0):
-			databaseVersionElement[0].text = f"v{version}"
-		sqlPublishProfilePath.write_bytes(etree.tostring(tree, pretty_print=True))
+		self.SaveManifestVersion("SQLPublishProfile", sqlPublishProfilePath, version)
 
 __all__ = ["CommitType", "VersionSegment",
-		   "ConventionalCommitFooter", "ConventionalCommit",
+		   "ConventionalCommitFooter", "ConventionalCommit", "CommitTable",
 		   "ConventionalCommitStats",
 		   "VersionTag", "VersionTags",
-		   "VersionScanner", "Versioning"]
+		   "VersionScanner", "PackageVersionTags", "Versioning"]
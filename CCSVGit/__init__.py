@@ -1,2 +1,7 @@
+from .ObjectStore import *
 from .Git import *
+from .AsyncGit import *
+from .FileTransaction import *
+from .ManifestFinder import *
+from .Manifest import *
 from .Versioning import *
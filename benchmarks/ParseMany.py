@@ -0,0 +1,36 @@
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CCSVGit import ConventionalCommit
+
+#Times ConventionalCommit.ParseMany on generated subjects; the target is more than 1M subjects per minute.
+#	python benchmarks/ParseMany.py [subject count]
+
+def GetSubjects(count:int) -> list[str]:
+	returnValue:list[str] = list[str]()
+	random.seed(0)
+	types:list[str] = ["feat", "fix", "docs", "style", "refactor", "perf", "test", "build", "ci", "chore", "revert", "wip"]
+	scopes:list[str] = ["", "(api)", "(core)", "(parser)"]
+	for index in range(count):
+		match index % 20:
+			case 0: returnValue.append(f"Merge branch 'feature-{index}'")
+			case 1: returnValue.append("Initial commit")
+			case _: returnValue.append(f"{random.choice(types)}{random.choice(scopes)}{"!" if index % 7 == 0 else ""}: change number {index}")
+	return returnValue
+
+def Main(count:int) -> None:
+	subjects:list[str] = GetSubjects(count)
+	startTime:float = time.perf_counter()
+	commits:list[ConventionalCommit] = ConventionalCommit.ParseMany(subjects)
+	elapsedTime:float = time.perf_counter() - startTime
+	subjectsPerMinute:float = len(commits) / elapsedTime * 60
+	print(f"{len(commits):,} subjects in {elapsedTime:.3f}s, {subjectsPerMinute:,.0f} subjects per minute")
+	if (subjectsPerMinute < 1000000):
+		sys.exit("Below 1,000,000 subjects per minute")
+
+if (__name__ == "__main__"):
+	Main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,97 @@
+from pathlib import Path
+import os
+import shutil
+import subprocess
+import tempfile
+
+class GitFixture:
+	#A throwaway repository built with the git executable, so each backend can be compared with git itself.
+	RepoPath:Path = None
+	ExecPath:Path | None = None
+	Environment:dict[str, str] = None
+	_temporaryDirectory:tempfile.TemporaryDirectory = None
+	_commitCount:int = 0
+
+	def __init__(self, repoPath:Path | None = None) -> None:
+		self._commitCount = 0
+		if (repoPath is None):
+			self._temporaryDirectory = tempfile.TemporaryDirectory(prefix="ccsvgit-")
+			repoPath = Path(self._temporaryDirectory.name).joinpath("repo")
+			repoPath.mkdir()
+		self.RepoPath = repoPath
+		self.ExecPath = self.GetExecPath()
+		#Neither the user's configuration nor the clock may change the objects written.
+		self.Environment = dict(os.environ,
+			GIT_CONFIG_GLOBAL=os.devnull,
+			GIT_CONFIG_NOSYSTEM="1",
+			GIT_CONFIG_COUNT="1",
+			GIT_CONFIG_KEY_0="advice.nestedTag",
+			GIT_CONFIG_VALUE_0="false",
+			GIT_AUTHOR_NAME="Fixture",
+			GIT_AUTHOR_EMAIL="fixture@example.com",
+			GIT_COMMITTER_NAME="Fixture",
+			GIT_COMMITTER_EMAIL="fixture@example.com")
+		if (not self.RepoPath.joinpath(".git").exists()):
+			self.Run("init", "--quiet", "--initial-branch=main")
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exceptionType, exceptionValue, traceback) -> None:
+		self.Close()
+
+	@staticmethod
+	def GetExecPath() -> Path | None:
+		returnValue:Path | None = None
+		execPath:str | None = shutil.which("git")
+		if (execPath is not None):
+			returnValue = Path(execPath)
+		return returnValue
+
+	@staticmethod
+	def IsAvailable() -> bool:
+		return GitFixture.GetExecPath() is not None
+
+	def Run(self, *args:str) -> str:
+		return subprocess.check_output(["git", *args], cwd=self.RepoPath, env=self.Environment).decode().strip()
+
+	def WriteFile(self, relativePath:str, content:str) -> Path:
+		returnValue:Path = self.RepoPath.joinpath(relativePath)
+		returnValue.parent.mkdir(parents=True, exist_ok=True)
+		returnValue.write_text(content, encoding="utf-8")
+		return returnValue
+
+	def Commit(self, message:str, files:dict[str, str] | None = None, epoch:int | None = None) -> str:
+		#Commits are a minute apart unless epoch says otherwise, which lets a test skew committer dates.
+		self._commitCount += 1
+		if (epoch is None):
+			epoch = 1700000000 + self._commitCount * 60
+		for relativePath, content in (files or {f"file{self._commitCount}.txt": message}).items():
+			self.WriteFile(relativePath, content)
+		self.Run("add", "--all")
+		self.Environment["GIT_AUTHOR_DATE"] = f"{epoch} +0000"
+		self.Environment["GIT_COMMITTER_DATE"] = f"{epoch} +0000"
+		self.Run("commit", "--quiet", "--allow-empty", "-m", message)
+		return self.Run("rev-parse", "HEAD")
+
+	def Tag(self, tagName:str, revision:str = "HEAD", message:str | None = None) -> None:
+		if (message is None):
+			self.Run("tag", tagName, revision)
+		else:
+			self.Run("tag", "-a", "-m", message, tagName, revision)
+
+	def Clone(self, depth:int | None = None) -> "GitFixture":
+		#The clone lives inside this fixture's directory and is removed with it.
+		clonePath:Path = self.RepoPath.parent.joinpath(f"clone{len(list(self.RepoPath.parent.iterdir()))}")
+		args:list[str] = ["clone", "--quiet"]
+		if (depth is not None):
+			args.append(f"--depth={depth}")
+		self.Run(*args, self.RepoPath.as_uri(), str(clonePath))
+		return GitFixture(clonePath)
+
+	def Close(self) -> None:
+		if (self._temporaryDirectory is not None):
+			self._temporaryDirectory.cleanup()
+			self._temporaryDirectory = None
+
+__all__ = ["GitFixture"]
@@ -0,0 +1,82 @@
+from pathlib import Path
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from CCSVGit import FileTransaction
+
+class FileTransactionTests(unittest.TestCase):
+	def setUp(self) -> None:
+		self.Directory = tempfile.TemporaryDirectory()
+		self.DirectoryPath = Path(self.Directory.name)
+		self.FirstPath = self.DirectoryPath.joinpath("first.txt")
+		self.SecondPath = self.DirectoryPath.joinpath("second.txt")
+		self.NewPath = self.DirectoryPath.joinpath("new.txt")
+		self.FirstPath.write_bytes(b"first")
+		self.SecondPath.write_bytes(b"second")
+
+	def tearDown(self) -> None:
+		self.Directory.cleanup()
+
+	def GetFiles(self) -> dict[str, bytes]:
+		return {path.name: path.read_bytes() for path in self.DirectoryPath.iterdir()}
+
+	def test_CommitReplacesAllFiles(self) -> None:
+		with FileTransaction() as transaction:
+			transaction.Write(self.FirstPath, b"first changed")
+			with transaction.Open(self.NewPath, "utf-8") as newFile:
+				newFile.write("new")
+			self.assertEqual(self.FirstPath.read_bytes(), b"first")
+		self.assertTrue(transaction.IsCommitted)
+		self.assertEqual(self.GetFiles(), {"first.txt": b"first changed", "second.txt": b"second", "new.txt": b"new"})
+
+	def test_FailedReplaceRestoresOriginals(self) -> None:
+		transaction:FileTransaction = FileTransaction()
+		transaction.Write(self.FirstPath, b"first changed")
+		transaction.Write(self.NewPath, b"new")
+		transaction.Write(self.SecondPath, b"second changed")
+		replace = os.replace
+		replacedPaths:list[Path] = list[Path]()
+		#Only the third staged file fails; the replaces that restore backups go through.
+		def FailThirdReplace(source, target) -> None:
+			replacedPaths.append(Path(target))
+			if (len(replacedPaths) == 3):
+				raise OSError("disk full")
+			replace(source, target)
+		with mock.patch("CCSVGit.FileTransaction.os.replace", side_effect=FailThirdReplace):
+			with self.assertRaises(OSError):
+				transaction.Commit()
+		self.assertEqual(replacedPaths[:3], [self.FirstPath, self.NewPath, self.SecondPath])
+		self.assertFalse(transaction.IsCommitted)
+		self.assertTrue(transaction.IsRolledBack)
+		self.assertEqual(self.GetFiles(), {"first.txt": b"first", "second.txt": b"second"})
+
+	def test_ExceptionInBlockRollsBack(self) -> None:
+		with self.assertRaises(RuntimeError):
+			with FileTransaction() as transaction:
+				transaction.Write(self.FirstPath, b"first changed")
+				transaction.Open(self.NewPath).write(b"new")
+				raise RuntimeError("failed")
+		self.assertTrue(transaction.IsRolledBack)
+		self.assertEqual(self.GetFiles(), {"first.txt": b"first", "second.txt": b"second"})
+		with self.assertRaises(Exception):
+			transaction.Write(self.FirstPath, b"late")
+
+	@unittest.skipUnless(Path("/proc/self/status").exists(), "the umask is only readable from /proc on Linux")
+	def test_NewFilesFollowUmaskWithoutSettingIt(self) -> None:
+		previousUmask:int = os.umask(0o027)
+		try:
+			with mock.patch("CCSVGit.FileTransaction.os.umask") as umask:
+				with FileTransaction() as transaction:
+					transaction.Write(self.NewPath, b"new")
+					self.FirstPath.chmod(0o600)
+					transaction.Write(self.FirstPath, b"first changed")
+			umask.assert_not_called()
+		finally:
+			os.umask(previousUmask)
+		self.assertEqual(self.NewPath.stat().st_mode & 0o777, 0o640)
+		self.assertEqual(self.FirstPath.stat().st_mode & 0o777, 0o600)
+
+if (__name__ == "__main__"):
+	unittest.main()
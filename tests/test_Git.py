@@ -0,0 +1,249 @@
+from pathlib import Path
+import asyncio
+import concurrent.futures
+import types
+import unittest
+
+from CCSVGit import AsyncGit, CommitType, ConventionalCommit, Git
+from CCSVGit.Git import GitCatFilePool
+from GitFixture import GitFixture
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class GitLogTests(unittest.TestCase):
+	Attributes:list[str] = ["Hash", "AbbreviatedHash", "Subject", "Body", "CommitterDate_IS08601Strict"]
+
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def GetGit(self) -> Git:
+		return Git(self.Fixture.RepoPath, execPath=self.Fixture.ExecPath)
+
+	def GetExpectedCommit(self, commitHash:str) -> dict:
+		#Each value read on its own, so no record or field separator is involved.
+		returnValue:dict = dict()
+		for name, placeholder in [("Hash", "%H"), ("AbbreviatedHash", "%h"), ("Subject", "%s"), ("CommitterDate_IS08601Strict", "%cI")]:
+			returnValue[name] = self.Fixture.Run("log", "-1", f"--format={placeholder}", commitHash)
+		returnValue["Body"] = self.Fixture.Run("log", "-1", "--format=%b", commitHash) or None
+		return returnValue
+
+	def GetCommitValues(self, commit:dict) -> dict:
+		returnValue:dict = {name: commit[name] for name in self.Attributes}
+		if (returnValue["Body"] is not None):
+			returnValue["Body"] = returnValue["Body"].strip()
+		return returnValue
+
+	def test_StreamedRecordsMatchGitLog(self) -> None:
+		#The long body spans several pipe reads, so records have to be put back together across chunks.
+		self.Fixture.Commit("feat: first")
+		self.Fixture.Commit("fix(core): second\n\nBody line\n\nRefs: #1")
+		self.Fixture.Commit("docs: long body\n\n" + "\n".join(f"Line {index} " + "x" * 100 for index in range(1000)))
+		self.Fixture.Commit("chore: subject with: colons")
+		commits:list[dict] = self.GetGit().LoadCommits(selectedAttributes=self.Attributes)
+		self.assertEqual([commit["Hash"] for commit in commits], self.Fixture.Run("log", "--format=%H").split("\n"))
+		for commit in commits:
+			self.assertEqual(self.GetCommitValues(commit), self.GetExpectedCommit(commit["Hash"]))
+
+	def test_CommitsBetweenHashes(self) -> None:
+		commitHashes:list[str] = [self.Fixture.Commit(f"feat: change {index}") for index in range(5)]
+		gitRepo:Git = self.GetGit()
+		commits:list[dict] = gitRepo.GetCommitsBetweenHashes(commitHashes[1], commitHashes[4], selectedAttributes=self.Attributes)
+		self.assertEqual([commit["Hash"] for commit in commits], [commitHashes[3], commitHashes[2]])
+		commits = gitRepo.GetCommits(afterHash=commitHashes[2], selectedAttributes=self.Attributes)
+		self.assertEqual([commit["Hash"] for commit in commits], [commitHashes[4], commitHashes[3]])
+		self.assertEqual(gitRepo.GetFirstCommit(self.Attributes)["Hash"], commitHashes[0])
+		self.assertEqual(gitRepo.GetLastCommit(self.Attributes)["Hash"], commitHashes[4])
+
+	def test_FilesFromNameStatus(self) -> None:
+		#-z keeps paths with spaces and non-ASCII characters unquoted.
+		self.Fixture.Commit("feat: add", {"src/a.txt": "a", "src/b c.txt": "b", "docs/é.md": "e"})
+		self.Fixture.Run("rm", "--quiet", "src/a.txt")
+		self.Fixture.Commit("fix: modify and delete", {"src/b c.txt": "b2"})
+		self.Fixture.Run("mv", "docs/é.md", "docs/renamed.md")
+		self.Fixture.Commit("docs: rename", {"README.md": "readme"})
+		gitRepo:Git = self.GetGit()
+		commits:list[dict] = gitRepo.LoadCommits(selectedAttributes=["Subject"], includeFiles=True)
+		self.assertEqual([(commit["Subject"], commit["Files"]) for commit in commits], [
+			("docs: rename", ["README.md", "docs/renamed.md", "docs/é.md"]),
+			("fix: modify and delete", ["src/a.txt", "src/b c.txt"]),
+			("feat: add", ["docs/é.md", "src/a.txt", "src/b c.txt"])])
+		commits = gitRepo.LoadCommits(selectedAttributes=["Subject"], includeFiles=False)
+		self.assertEqual([list(commit.keys()) for commit in commits], [["Subject"]] * 3)
+		self.assertEqual(gitRepo.GetLastCommit(["Subject"], includeFiles=True)["Files"], ["README.md", "docs/renamed.md", "docs/é.md"])
+
+	def test_IterCommitsYieldsConventionalCommits(self) -> None:
+		commitHashes:list[str] = [
+			self.Fixture.Commit("feat: first"),
+			self.Fixture.Commit("fix(core)!: second\n\nBREAKING CHANGE: changed", {"src/a.txt": "a"}),
+			self.Fixture.Commit("docs: third"),
+			self.Fixture.Commit("feat(api): fourth")]
+		commits = self.GetGit().IterCommits(afterHash=commitHashes[0], untilHash=commitHashes[3], includeFiles=True)
+		self.assertIsInstance(commits, types.GeneratorType)
+		commits = list(commits)
+		self.assertTrue(all(isinstance(commit, ConventionalCommit) for commit in commits))
+		self.assertEqual([commit.Hash for commit in commits], [commitHashes[2], commitHashes[1]])
+		self.assertEqual((commits[1].Type, commits[1].Scope, commits[1].IsBreakingChange), (CommitType.Fix, "core", True))
+		self.assertEqual(commits[1].Files, ["src/a.txt"])
+
+	def test_ClosingStreamStopsGit(self) -> None:
+		for index in range(3):
+			self.Fixture.Commit(f"feat: change {index}")
+		commits = self.GetGit().StreamCommits(selectedAttributes=self.Attributes)
+		commitHash, commit = next(commits)
+		self.assertEqual(commitHash, commit["Hash"])
+		commits.close()
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class GitCatFileTests(unittest.TestCase):
+	Attributes:list[str] = ["Hash", "AbbreviatedHash", "TreeHash", "AuthorName", "AuthorEmail", "AuthorDate_RFC2822", "AuthorDate_IS08601Strict",
+		"CommitterDate_date", "CommitterDate_UnixTimestamp", "CommitterDate_IS08601Like", "Subject", "Body"]
+
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def GetGit(self, catFileWorkers:int = 1) -> Git:
+		return Git(self.Fixture.RepoPath, execPath=self.Fixture.ExecPath, catFileWorkers=catFileWorkers)
+
+	def test_ObjectMatchesLog(self) -> None:
+		commitHashes:list[str] = [
+			self.Fixture.Commit("feat: first"),
+			self.Fixture.Commit("fix(core): second\n\nBody line\n\nRefs: #1")]
+		self.Fixture.Tag("v1.0.0", message="Release")
+		with self.GetGit() as gitRepo:
+			for revision in commitHashes + ["v1.0.0"]:
+				commit:dict | None = gitRepo.GetCommitFromObject(revision, self.Attributes)
+				self.assertIsNotNone(commit)
+				self.assertEqual(commit, gitRepo.LoadCommits(includeRevisions=[revision], lastNCommits=1, selectedAttributes=self.Attributes, includeFiles=False)[0])
+			self.assertIsNone(gitRepo.GetCommitFromObject("0" * 40, self.Attributes))
+			self.assertEqual(gitRepo.ResolveRevision("v1.0.0^{commit}"), commitHashes[1])
+
+	def test_CloseStopsWorkers(self) -> None:
+		commitHash:str = self.Fixture.Commit("feat: first")
+		with self.GetGit() as gitRepo:
+			catFilePool:GitCatFilePool = gitRepo.GetCatFilePool()
+			self.assertEqual(catFilePool.Read(commitHash)[1], "commit")
+			self.assertEqual(catFilePool.Check("HEAD")[0], commitHash)
+			processes:list = [worker.Process for worker in catFilePool._allWorkers]
+			catFilePool.Close()
+			self.assertEqual([worker.Process for worker in catFilePool._allWorkers], [None, None])
+			self.assertTrue(all(process.returncode is not None for process in processes))
+			#A closed worker starts a new process on its next request.
+			self.assertEqual(gitRepo.ResolveRevision("HEAD"), commitHash)
+		self.assertIsNone(gitRepo.CatFilePool)
+		self.assertTrue(all(worker.Process is None for worker in catFilePool._allWorkers))
+
+	def test_PoolIsBounded(self) -> None:
+		commitHashes:list[str] = [self.Fixture.Commit(f"feat: change {index}") for index in range(4)]
+		with self.GetGit(catFileWorkers=2) as gitRepo:
+			with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+				self.assertEqual(list(executor.map(gitRepo.ResolveRevision, commitHashes * 5)), commitHashes * 5)
+			self.assertLessEqual(len(gitRepo.GetCatFilePool()._allWorkers), 2)
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class GitTagTests(unittest.TestCase):
+	def setUp(self) -> None:
+		#Lightweight, annotated and nested tags, with numbers that sort differently as text.
+		self.Fixture = GitFixture()
+		self.Fixture.Commit("feat: first")
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("fix(core): second\n\nBody line\n\nRefs: #1")
+		self.Fixture.Tag("v1.10.0", message="Release")
+		self.Fixture.Commit("docs: third")
+		self.Fixture.Tag("v1.9.0")
+		self.Fixture.Tag("v2.0.0", "v1.10.0", "Tag of a tag")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def test_TagIndexMatchesBetweenBackends(self) -> None:
+		with Git(self.Fixture.RepoPath, backend="exec") as execRepo, Git(self.Fixture.RepoPath, backend="objectstore") as objectStoreRepo:
+			execTags:list[dict] = execRepo.GetTagIndex()
+			self.assertEqual([tag["Name"] for tag in execTags], ["v1.0.0", "v1.10.0", "v1.9.0", "v2.0.0"])
+			self.assertEqual(execTags[3]["Hash"], execTags[1]["Hash"])
+			self.assertEqual(execTags[1]["Subject"], "fix(core): second")
+			self.assertIsNone(execTags[0]["TagObjectHash"])
+			self.assertEqual(execTags[1]["TagObjectHash"], self.Fixture.Run("rev-parse", "v1.10.0"))
+			self.assertEqual(objectStoreRepo.GetTagIndex(), execTags)
+
+	def test_IndexedTagsMatchCommitLookups(self) -> None:
+		attributes:list[str] = list(Git.TagIndexAttributes.keys())
+		with Git(self.Fixture.RepoPath, backend="exec") as gitRepo:
+			for tag in gitRepo.GetTags(attributes, includeFiles=False):
+				with self.subTest(tag=tag["Name"]):
+					self.assertEqual(tag, {"Name": tag["Name"], **gitRepo.GetCommit(tag["Name"], attributes, includeFiles=False)})
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class GitCommitTests(unittest.TestCase):
+	def setUp(self) -> None:
+		#Git runs the commit itself, so the identity has to be in the repository's own configuration.
+		self.Fixture = GitFixture()
+		self.Fixture.Run("config", "user.name", "Fixture")
+		self.Fixture.Run("config", "user.email", "fixture@example.com")
+		self.Fixture.Commit("build: bump version to 1.0.0")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def test_CommitAndTagStagesOnlyTheGivenPaths(self) -> None:
+		#A repeated message, and file names git would otherwise read as pathspec magic or globs.
+		paths:list[Path] = [self.Fixture.WriteFile(relativePath, "changed") for relativePath in ["*.txt", ":(top)odd name.txt", "src/é.txt"]]
+		self.Fixture.WriteFile("unstaged.txt", "left alone")
+		with Git(self.Fixture.RepoPath, backend="exec") as gitRepo:
+			commitHash:str = gitRepo.CommitAndTag("build: bump version to 1.0.0", paths, "v1.0.0")
+		self.assertEqual(commitHash, self.Fixture.Run("rev-parse", "HEAD"))
+		self.assertEqual(self.Fixture.Run("rev-parse", "v1.0.0"), commitHash)
+		self.assertEqual(self.Fixture.Run("-c", "core.quotePath=false", "show", "--name-only", "--format=", "HEAD").split("\n"),
+			["*.txt", ":(top)odd name.txt", "src/é.txt"])
+		self.assertEqual(self.Fixture.Run("status", "--porcelain", "--untracked-files=all"), "?? unstaged.txt")
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class AsyncGitTests(unittest.TestCase):
+	Attributes:list[str] = ["Hash", "AbbreviatedHash", "Subject", "Body", "CommitterDate_IS08601Strict"]
+
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+		self.CommitHashes:list[str] = [
+			self.Fixture.Commit("feat: first", {"src/a.txt": "a"}),
+			self.Fixture.Commit("fix(core): second\n\nBody line", {"src/a.txt": "a2", "README.md": "readme"})]
+		self.Fixture.Tag("v1.0.0")
+		self.CommitHashes.append(self.Fixture.Commit("docs: third", {"README.md": "readme2"}))
+		self.Fixture.Tag("v1.1.0", message="Release")
+		self.CommitHashes.append(self.Fixture.Commit("feat: fourth"))
+		self.Fixture.Run("remote", "add", "origin", "https://example.com/owner/repo.git")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	async def LoadAll(self, asyncRepo:AsyncGit) -> list:
+		return list(await asyncio.gather(
+			asyncRepo.GetCommits(selectedAttributes=self.Attributes),
+			asyncRepo.GetCommits(afterHash=self.CommitHashes[1], selectedAttributes=self.Attributes, includeFiles=False),
+			asyncRepo.GetCommitsBetweenHashes(self.CommitHashes[0], self.CommitHashes[3], selectedAttributes=self.Attributes),
+			asyncRepo.GetCommit(self.CommitHashes[1], self.Attributes),
+			asyncRepo.GetTags(self.Attributes),
+			asyncRepo.GetCommitFiles(self.CommitHashes[1]),
+			asyncRepo.GetFirstCommit(self.Attributes)))
+
+	def test_MatchesGit(self) -> None:
+		with Git(self.Fixture.RepoPath, backend="exec") as gitRepo, AsyncGit(self.Fixture.RepoPath, maxConcurrency=2) as asyncRepo:
+			self.assertEqual(asyncio.run(self.LoadAll(asyncRepo)), [
+				gitRepo.GetCommits(selectedAttributes=self.Attributes),
+				gitRepo.GetCommits(afterHash=self.CommitHashes[1], selectedAttributes=self.Attributes, includeFiles=False),
+				gitRepo.GetCommitsBetweenHashes(self.CommitHashes[0], self.CommitHashes[3], selectedAttributes=self.Attributes),
+				gitRepo.GetCommit(self.CommitHashes[1], self.Attributes),
+				gitRepo.GetTags(self.Attributes),
+				gitRepo.GetCommitFiles(self.CommitHashes[1]),
+				gitRepo.GetFirstCommit(self.Attributes)])
+			self.assertEqual(asyncio.run(asyncRepo.GetRepoMeta()).ToDict(), gitRepo.GetRepoMeta().ToDict())
+
+	def test_RejectsZeroConcurrency(self) -> None:
+		with self.assertRaises(ValueError):
+			AsyncGit(self.Fixture.RepoPath, maxConcurrency=0)
+
+if (__name__ == "__main__"):
+	unittest.main()
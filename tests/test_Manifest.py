@@ -0,0 +1,96 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from semver.version import Version as SemVer
+
+from CCSVGit import FileTransaction, Manifest, PyProjectManifest, SQLProjectManifest, SQLPublishProfileManifest, XMLManifest
+
+class ManifestTests(unittest.TestCase):
+	def setUp(self) -> None:
+		self.Directory = tempfile.TemporaryDirectory()
+		self.DirectoryPath = Path(self.Directory.name)
+
+	def tearDown(self) -> None:
+		self.Directory.cleanup()
+
+	def Bump(self, manifestType:str, fileName:str, content:bytes, version:str) -> bytes:
+		filePath:Path = self.DirectoryPath.joinpath(fileName)
+		filePath.write_bytes(content)
+		manifest:Manifest = Manifest.Open(manifestType, filePath)
+		manifest.SetVersion(SemVer.parse(version))
+		self.assertTrue(manifest.Save())
+		self.assertEqual(manifest.GetVersion(), SemVer.parse(version))
+		self.assertEqual(Manifest.Open(manifestType, filePath).GetVersion(), SemVer.parse(version))
+		return filePath.read_bytes()
+
+	def test_OpenRejectsUnknownType(self) -> None:
+		with self.assertRaises(ValueError):
+			Manifest.Open("Cargo", self.DirectoryPath.joinpath("Cargo.toml"))
+
+	def test_ManifestTypesMustImplementEveryMethod(self) -> None:
+		#XMLManifest leaves LoadName to the SQL manifests, so it cannot be opened on its own.
+		filePath:Path = self.DirectoryPath.joinpath("Database.sqlproj")
+		filePath.write_bytes(b"<Project />")
+		for manifestType in [Manifest, XMLManifest]:
+			with self.subTest(manifestType=manifestType.__name__):
+				with self.assertRaises(TypeError):
+					manifestType(filePath)
+
+class PyProjectManifestTests(ManifestTests):
+	def test_SplicePreservesFormatting(self) -> None:
+		content:bytes = (b"# Package\r\n[project]\r\nname = 'package'  # the name\r\n"
+			b"description = \"\"\"\r\nversion = \"0.0.0\"\r\n\"\"\"\r\nversion   =   \"1.2.3\"   # bumped by CI\r\n"
+			b"\r\n[[tool.items]]\r\nversion = \"9.9.9\"\r\n")
+		self.assertEqual(self.Bump("PyProject", "pyproject.toml", content, "1.3.0-rc.1"),
+			content.replace(b"\"1.2.3\"", b"\"1.3.0-rc.1\""))
+
+	def test_DynamicVersionSplicesPoetryTable(self) -> None:
+		content:bytes = (b"[project]\nname = \"package\"\ndynamic = [\"version\"]\n\n"
+			b"[tool.poetry]\nversion = '2.0.0' # poetry\npackages = [{ include = \"package\" }]\n")
+		self.assertEqual(self.Bump("PyProject", "pyproject.toml", content, "2.1.0"),
+			content.replace(b"'2.0.0'", b"'2.1.0'"))
+
+	def test_InlineTableFallsBackToRewrite(self) -> None:
+		content:bytes = b"project = { name = \"package\", version = \"1.0.0\" }\n"
+		self.assertIn(b"version = \"1.1.0\"", self.Bump("PyProject", "pyproject.toml", content, "1.1.0"))
+
+	def test_TransactionOnlyMovesContentOnCommit(self) -> None:
+		filePath:Path = self.DirectoryPath.joinpath("pyproject.toml")
+		filePath.write_bytes(b"[project]\nname = \"package\"\nversion = \"1.0.0\"\n")
+		manifest:PyProjectManifest = PyProjectManifest(filePath)
+		for isCommitted, expectedVersion in [(False, "1.0.0"), (True, "2.0.0")]:
+			transaction:FileTransaction = FileTransaction()
+			manifest.SetVersion(SemVer.parse("2.0.0"))
+			self.assertTrue(manifest.Save(transaction))
+			if (isCommitted):
+				transaction.Commit()
+			else:
+				transaction.Rollback()
+			manifest.EndTransaction(transaction.IsCommitted)
+			self.assertEqual(manifest.GetVersion(), SemVer.parse(expectedVersion))
+			self.assertEqual(PyProjectManifest(filePath).GetVersion(), SemVer.parse(expectedVersion))
+
+class XMLManifestTests(ManifestTests):
+	def test_SQLProjectSplicesDatabaseVersion(self) -> None:
+		content:bytes = ("\ufeff<?xml version=\"1.0\" encoding=\"utf-8\"?>\r\n"
+			"<Project DefaultTargets=\"Build\" xmlns=\"http://schemas.microsoft.com/developer/msbuild/2003\">\r\n"
+			"  <PropertyGroup>\r\n    <Name>Database</Name>\r\n  </PropertyGroup>\r\n"
+			"  <ItemGroup>\r\n    <SqlCmdVariable Include=\"Other\"><DefaultValue>v1.0.0</DefaultValue></SqlCmdVariable>\r\n"
+			"    <SqlCmdVariable Include=\"DatabaseVersion\">\r\n      <DefaultValue>v1.0.0</DefaultValue>\r\n      <Value>$(SqlCmdVar__1)</Value>\r\n"
+			"    </SqlCmdVariable>\r\n  </ItemGroup>\r\n</Project>\r\n").encode("utf-8")
+		expected:bytes = content.replace(b"      <DefaultValue>v1.0.0<", b"      <DefaultValue>v1.1.0<")
+		self.assertEqual(self.Bump("SQLProject", "Database.sqlproj", content, "1.1.0"), expected)
+		self.assertEqual(SQLProjectManifest(self.DirectoryPath.joinpath("Database.sqlproj")).GetName(), "Database")
+
+	def test_PublishProfileSplicesValue(self) -> None:
+		content:bytes = (b"<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<Project ToolsVersion=\"Current\">\n"
+			b"  <PropertyGroup>\n    <TargetDatabaseName>Database</TargetDatabaseName>\n"
+			b"    <TargetConnectionString>Data Source=server;Integrated Security=True</TargetConnectionString>\n  </PropertyGroup>\n"
+			b"  <ItemGroup>\n    <SqlCmdVariable Include=\"DatabaseVersion\">\n      <Value>v3.0.0</Value>\n    </SqlCmdVariable>\n  </ItemGroup>\n</Project>")
+		self.assertEqual(self.Bump("SQLPublishProfile", "Database.publish.xml", content, "3.0.1"),
+			content.replace(b"v3.0.0", b"v3.0.1"))
+		self.assertEqual(SQLPublishProfileManifest(self.DirectoryPath.joinpath("Database.publish.xml")).GetName(), "[server].[Database]")
+
+if (__name__ == "__main__"):
+	unittest.main()
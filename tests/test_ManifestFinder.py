@@ -0,0 +1,110 @@
+from pathlib import Path
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from CCSVGit import ManifestFinder
+from GitFixture import GitFixture
+
+class ManifestFinderTests(unittest.TestCase):
+	Files:dict[str, str] = {
+		".gitignore": "build/\ndocs/*\n!docs/keep\n",
+		".git/info/exclude": "scratch/\n",
+		"pyproject.toml": "",
+		"packages/alpha/pyproject.toml": "",
+		"node_modules/dependency/pyproject.toml": "",
+		"build/pyproject.toml": "",
+		"scratch/pyproject.toml": "",
+		"docs/other/pyproject.toml": "",
+		"docs/keep/pyproject.toml": "",
+		"database/Database.sqlproj": "",
+		"database/Database.publish.xml": "",
+		"database/.gitignore": "generated\n",
+		"database/generated/Generated.sqlproj": "",
+		"database/Database.sqlproj.user": ""
+	}
+
+	def setUp(self) -> None:
+		self.TemporaryDirectory = tempfile.TemporaryDirectory(prefix="ccsvgit-")
+		self.RootPath:Path = Path(self.TemporaryDirectory.name)
+		for relativePath, content in self.Files.items():
+			self.RootPath.joinpath(relativePath).parent.mkdir(parents=True, exist_ok=True)
+			self.RootPath.joinpath(relativePath).write_text(content)
+
+	def tearDown(self) -> None:
+		self.TemporaryDirectory.cleanup()
+
+	def GetRelativePaths(self, manifestPaths:dict[str, list[Path]]) -> dict[str, list[str]]:
+		return {manifestType: [path.relative_to(self.RootPath).as_posix() for path in paths] for manifestType, paths in manifestPaths.items()}
+
+	def test_WalkHonoursGitIgnore(self) -> None:
+		self.assertEqual(self.GetRelativePaths(ManifestFinder(self.RootPath).Find()), {
+			"PyProject": ["docs/keep/pyproject.toml", "packages/alpha/pyproject.toml", "pyproject.toml"],
+			"SQLProject": ["database/Database.sqlproj"],
+			"SQLPublishProfile": ["database/Database.publish.xml"]})
+
+	def test_WalkHonoursExcludesFile(self) -> None:
+		#A linked worktree: .git is a file, and config and info/exclude live in the main repository's git directory.
+		self.RootPath.joinpath("vendor", "package").mkdir(parents=True)
+		self.RootPath.joinpath("vendor", "package", "pyproject.toml").write_text("")
+		with tempfile.TemporaryDirectory(prefix="ccsvgit-") as mainDirectory:
+			commonDirPath:Path = Path(mainDirectory)
+			gitDirPath:Path = commonDirPath.joinpath("worktrees", "tree")
+			gitDirPath.mkdir(parents=True)
+			gitDirPath.joinpath("commondir").write_text("../..\n")
+			shutil.move(self.RootPath.joinpath(".git", "info"), commonDirPath.joinpath("info"))
+			shutil.rmtree(self.RootPath.joinpath(".git"))
+			self.RootPath.joinpath(".git").write_text(f"gitdir: {gitDirPath}\n")
+			#Without core.excludesFile git reads $XDG_CONFIG_HOME/git/ignore.
+			for config, ignorePath in [
+				("", commonDirPath.joinpath("git", "ignore")),
+				(f"[core]\n\texcludesFile = {commonDirPath.joinpath("global-ignore")}\n", commonDirPath.joinpath("global-ignore"))]:
+				with self.subTest(config=config):
+					commonDirPath.joinpath("config").write_text(config)
+					ignorePath.parent.mkdir(exist_ok=True)
+					ignorePath.write_text("vendor/\n")
+					with mock.patch.dict(os.environ, {"GIT_CONFIG_GLOBAL": os.devnull, "XDG_CONFIG_HOME": mainDirectory}):
+						self.assertEqual(self.GetRelativePaths(ManifestFinder(self.RootPath).Find())["PyProject"],
+							["docs/keep/pyproject.toml", "packages/alpha/pyproject.toml", "pyproject.toml"])
+					ignorePath.unlink()
+
+	def test_WalkWithoutGitIgnore(self) -> None:
+		self.assertEqual(self.GetRelativePaths(ManifestFinder(self.RootPath, ignoreDirectoryNames=["node_modules", "build"], useGitIgnore=False).Find()), {
+			"PyProject": ["docs/keep/pyproject.toml", "docs/other/pyproject.toml", "packages/alpha/pyproject.toml", "pyproject.toml", "scratch/pyproject.toml"],
+			"SQLProject": ["database/Database.sqlproj", "database/generated/Generated.sqlproj"],
+			"SQLPublishProfile": ["database/Database.publish.xml"]})
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class ManifestFinderIndexTests(unittest.TestCase):
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def test_IndexListsTrackedManifests(self) -> None:
+		#Untracked manifests are left out, tracked ones are found even when ignored, and deleted ones are skipped.
+		self.Fixture.Commit("feat: manifests", {
+			".gitignore": "build/\n",
+			"pyproject.toml": "",
+			"packages/alpha/pyproject.toml": "",
+			"database/Database.sqlproj": "",
+			"database/Database.publish.xml": ""})
+		self.Fixture.WriteFile("build/pyproject.toml", "")
+		self.Fixture.Run("add", "--force", "build/pyproject.toml")
+		self.Fixture.WriteFile("untracked/pyproject.toml", "")
+		self.Fixture.RepoPath.joinpath("packages", "alpha", "pyproject.toml").unlink()
+		manifestPaths:dict[str, list[Path]] = ManifestFinder(self.Fixture.RepoPath, discovery="index").Find()
+		self.assertEqual({manifestType: [path.relative_to(self.Fixture.RepoPath).as_posix() for path in paths] for manifestType, paths in manifestPaths.items()}, {
+			"PyProject": ["build/pyproject.toml", "pyproject.toml"],
+			"SQLProject": ["database/Database.sqlproj"],
+			"SQLPublishProfile": ["database/Database.publish.xml"]})
+
+	def test_UnknownDiscoveryMode(self) -> None:
+		with self.assertRaises(ValueError):
+			ManifestFinder(self.Fixture.RepoPath, discovery="search")
+
+if (__name__ == "__main__"):
+	unittest.main()
@@ -0,0 +1,123 @@
+from pathlib import Path
+import asyncio
+import subprocess
+import unittest
+
+from CCSVGit import AsyncGit, Git, GitObjectStore
+from GitFixture import GitFixture
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class ObjectStoreTests(unittest.TestCase):
+	Attributes:list[str] = ["Hash", "AbbreviatedHash", "ParentHashes", "Subject", "Body", "AuthorName", "CommitterDate_IS08601Strict"]
+
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def LoadCommits(self, repoPath:Path, backend:str, **arguments) -> list[dict]:
+		with Git(repoPath, backend=backend) as gitRepo:
+			return gitRepo.LoadCommits(selectedAttributes=self.Attributes, **arguments)
+
+	def BuildHistory(self) -> None:
+		#A merge, edits and deletes in subdirectories, a body, and tags of every kind, half packed and half loose.
+		self.Fixture.Commit("feat: root", {"src/a.txt": "a", "README.md": "readme"})
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Run("checkout", "--quiet", "-b", "side")
+		self.Fixture.Commit("fix(src): side\n\nBody line\n\nRefs: #1", {"src/a.txt": "a2", "src/b/c.txt": "c"})
+		self.Fixture.Run("checkout", "--quiet", "main")
+		self.Fixture.Commit("docs: main", {"README.md": "readme2"})
+		self.Fixture.Run("merge", "--quiet", "--no-ff", "-m", "Merge branch 'side'", "side")
+		self.Fixture.Tag("v1.1.0-rc.1", message="Release candidate")
+		self.Fixture.Run("repack", "-a", "-d", "--quiet")
+		self.Fixture.Run("rm", "--quiet", "src/b/c.txt")
+		self.Fixture.Commit("feat!: remove c")
+		self.Fixture.Tag("v1.1.0", message="Release")
+		self.Fixture.Tag("v1.1.0-signed", "v1.1.0", "Tag of a tag")
+
+	def test_HistoryMatchesExec(self) -> None:
+		self.BuildHistory()
+		for arguments in [dict(), dict(includeRevisions=["v1.1.0"], excludeRevisions=["v1.0.0"]), dict(excludeMergeCommits=True), dict(rootCommitsOnly=True), dict(lastNCommits=2)]:
+			with self.subTest(**arguments):
+				execCommits:list[dict] = self.LoadCommits(self.Fixture.RepoPath, "exec", **arguments)
+				self.assertGreater(len(execCommits), 0)
+				self.assertEqual(self.LoadCommits(self.Fixture.RepoPath, "objectstore", **arguments), execCommits)
+
+	def test_TagsMatchExec(self) -> None:
+		self.BuildHistory()
+		with Git(self.Fixture.RepoPath, backend="exec") as execRepo, Git(self.Fixture.RepoPath, backend="objectstore") as objectStoreRepo:
+			execTags:list[dict] = execRepo.GetTagIndex()
+			self.assertEqual([tag["Name"] for tag in execTags], ["v1.0.0", "v1.1.0", "v1.1.0-rc.1", "v1.1.0-signed"])
+			self.assertEqual(objectStoreRepo.GetTagIndex(), execTags)
+			self.assertEqual(objectStoreRepo.GetTags(self.Attributes), execRepo.GetTags(self.Attributes))
+			for tag in execTags:
+				self.assertEqual(objectStoreRepo.GetCommitFiles(tag["Hash"]), execRepo.GetCommitFiles(tag["Hash"]))
+			with AsyncGit(self.Fixture.RepoPath) as asyncRepo:
+				self.assertEqual(asyncio.run(asyncRepo.GetTags(self.Attributes)), execRepo.GetTags(self.Attributes))
+
+	def test_ReadsLooseAndPackedObjects(self) -> None:
+		self.BuildHistory()
+		objectStore:GitObjectStore = GitObjectStore(self.Fixture.RepoPath)
+		try:
+			for revision in ["v1.0.0", "v1.1.0-rc.1", "v1.1.0", "HEAD^{tree}", "HEAD:README.md"]:
+				objectHash:str = self.Fixture.Run("rev-parse", revision)
+				objectType:str = self.Fixture.Run("cat-file", "-t", objectHash)
+				#Trees are binary, so the content is compared as git writes it.
+				objectContent:bytes = subprocess.check_output(["git", "cat-file", objectType, objectHash], cwd=self.Fixture.RepoPath, env=self.Fixture.Environment)
+				self.assertEqual(objectStore.ReadObject(objectHash), (objectType, objectContent))
+			self.assertEqual(objectStore.ResolveRevision("v1.1.0-signed"), self.Fixture.Run("rev-parse", "v1.1.0^{commit}"))
+		finally:
+			objectStore.Close()
+
+	def test_ShallowClone(self) -> None:
+		#git treats the commits listed in .git/shallow as roots; their parents were never fetched.
+		for index in range(4):
+			self.Fixture.Commit(f"feat: change {index}")
+		with self.Fixture.Clone(depth=2) as clone:
+			execCommits:list[dict] = self.LoadCommits(clone.RepoPath, "exec")
+			objectStoreCommits:list[dict] = self.LoadCommits(clone.RepoPath, "objectstore")
+			self.assertEqual(len(execCommits), 2)
+			self.assertIsNone(execCommits[-1]["ParentHashes"])
+			self.assertEqual(objectStoreCommits, execCommits)
+
+	def test_ExcludedHistoryWithSkewedDates(self) -> None:
+		#S claims to be newer than its child E, so a date ordered walk reaches S from I before E can mark it.
+		self.Fixture.Commit("feat: root", epoch=1700000100)
+		skewedHash:str = self.Fixture.Commit("feat: skewed", epoch=1700001500)
+		excludedHash:str = self.Fixture.Commit("feat: excluded", epoch=1700001000)
+		self.Fixture.Run("checkout", "--quiet", "-b", "side", skewedHash)
+		includedHash:str = self.Fixture.Commit("feat: included", epoch=1700002000)
+		execCommits:list[dict] = self.LoadCommits(self.Fixture.RepoPath, "exec", includeRevisions=[includedHash], excludeRevisions=[excludedHash])
+		objectStoreCommits:list[dict] = self.LoadCommits(self.Fixture.RepoPath, "objectstore", includeRevisions=[includedHash], excludeRevisions=[excludedHash])
+		self.assertEqual([commit["Hash"] for commit in execCommits], [includedHash])
+		self.assertEqual(objectStoreCommits, execCommits)
+
+	def test_MissKeepsCachesAndFindsNewPacks(self) -> None:
+		firstHash:str = self.Fixture.Commit("feat: loose")
+		objectStore:GitObjectStore = GitObjectStore(self.Fixture.RepoPath)
+		try:
+			firstCommit:tuple = objectStore.GetCommit(firstHash)
+			treeHash:str = firstCommit[3]
+			self.assertIsNone(objectStore.ReadObject("0" * 40))
+			self.assertIs(objectStore.GetCommit(firstHash), firstCommit)
+			#Repacking moves the loose objects into a pack the store has not listed yet.
+			self.Fixture.Run("repack", "-a", "-d", "--quiet")
+			self.assertEqual(objectStore.ReadObject(treeHash)[0], "tree")
+			self.assertIs(objectStore.GetCommit(firstHash), firstCommit)
+		finally:
+			objectStore.Close()
+
+	def test_CommitCacheIsBounded(self) -> None:
+		commitHashes:list[str] = [self.Fixture.Commit(f"feat: change {index}") for index in range(5)]
+		objectStore:GitObjectStore = GitObjectStore(self.Fixture.RepoPath, commitCacheLimit=1)
+		try:
+			for commitHash in commitHashes:
+				objectStore.GetCommit(commitHash)
+			self.assertEqual(len(objectStore._commitCache), 1)
+			self.assertEqual(objectStore.GetCommit(commitHashes[0])[1], [])
+		finally:
+			objectStore.Close()
+
+if (__name__ == "__main__"):
+	unittest.main()
@@ -0,0 +1,508 @@
+from pathlib import Path
+import asyncio
+import datetime
+import json
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from semver.version import Version as SemVer
+
+from CCSVGit import CommitTable, CommitType, ConventionalCommit, ConventionalCommitStats, Git, GitRepoMeta, PackageVersionTags, VersionScanner, VersionTag, VersionTags, Versioning
+from GitFixture import GitFixture
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class BumpAndTagBatchTests(unittest.TestCase):
+	PyProject:str = "[project]\nname = \"package\"\nversion = \"1.0.0\" # kept\n"
+
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+		self.Fixture.Commit("feat: initial", {"pyproject.toml": self.PyProject})
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("feat: change")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def test_AutoModeBumpsEveryManifest(self) -> None:
+		pyProjectPath:Path = self.Fixture.RepoPath.joinpath("pyproject.toml")
+		result:dict = Versioning(self.Fixture.RepoPath).BumpAndTag(mode="auto", finalVersion="v2.0.0", workers=2, makeCommit=False)
+		self.assertEqual((result["Version"], result["TagName"], result["IsWritten"], result["IsCommitted"]), (SemVer.parse("2.0.0"), "v2.0.0", True, False))
+		self.assertEqual([(changedFile["Type"], changedFile["Path"], changedFile["IsChanged"]) for changedFile in result["ChangedFiles"]],
+			[("ChangeLog", self.Fixture.RepoPath.joinpath("CHANGELOG.md"), True), ("PyProject", pyProjectPath, True)])
+		self.assertEqual(result["Errors"], [])
+		self.assertEqual(pyProjectPath.read_text(), self.PyProject.replace("1.0.0", "2.0.0"))
+		self.assertIn("v2.0.0", self.Fixture.RepoPath.joinpath("CHANGELOG.md").read_text(encoding="utf-16"))
+
+	def test_EachBatchListsOnlyItsOwnFiles(self) -> None:
+		versioning:Versioning = Versioning(self.Fixture.RepoPath)
+		firstResult:dict = versioning.BumpAndTag(mode="auto", finalVersion="2.0.0", makeCommit=False)
+		secondResult:dict = versioning.BumpAndTag(mode="auto", finalVersion="2.0.1", makeCommit=False)
+		for result in [firstResult, secondResult]:
+			self.assertEqual([changedFile["Type"] for changedFile in result["ChangedFiles"]], ["ChangeLog", "PyProject"])
+		self.assertEqual([changedFile["NewVersion"] for changedFile in secondResult["ChangedFiles"]], [None, SemVer.parse("2.0.1")])
+		self.assertEqual(versioning.ChangedFiles, secondResult["ChangedFiles"])
+
+	def test_FailedManifestRollsBackEveryFile(self) -> None:
+		self.Fixture.WriteFile("database/Broken.sqlproj", "<Project><ItemGroup>")
+		result:dict = Versioning(self.Fixture.RepoPath).BumpAndTag(mode="auto", finalVersion="2.0.0", makeCommit=False)
+		self.assertEqual((result["IsWritten"], result["IsCommitted"]), (False, False))
+		self.assertEqual([(error["Type"], error["Path"].name) for error in result["Errors"]], [("SQLProject", "Broken.sqlproj")])
+		self.assertEqual(self.Fixture.RepoPath.joinpath("pyproject.toml").read_text(), self.PyProject)
+		self.assertFalse(self.Fixture.RepoPath.joinpath("CHANGELOG.md").exists())
+
+	def test_FailedManifestLeavesSharedManifestsUnchanged(self) -> None:
+		self.Fixture.WriteFile("database/Broken.sqlproj", "<Project><ItemGroup>")
+		pyProjectPath:Path = self.Fixture.RepoPath.joinpath("pyproject.toml")
+		versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath)
+		versioning:Versioning = Versioning(self.Fixture.RepoPath, manifests=versionScanner.Manifests.values())
+		unreleasedName:str = versioning.RepoVersionTags.GetLatest().Name
+		result:dict = versioning.BumpAndTag(mode="auto", finalVersion="2.0.0", makeCommit=False)
+		self.assertFalse(result["IsWritten"])
+		self.assertEqual(len(result["Errors"]), 1)
+		self.assertFalse(any(changedFile["IsChanged"] for changedFile in result["ChangedFiles"]))
+		self.assertEqual(versionScanner.Manifests[pyProjectPath].GetVersion(), SemVer.parse("1.0.0"))
+		self.assertEqual(pyProjectPath.read_text(), self.PyProject)
+		self.assertFalse(self.Fixture.RepoPath.joinpath("CHANGELOG.md").exists())
+		self.assertEqual(versioning.RepoVersionTags.GetLatest().Name, unreleasedName)
+
+	def test_WrittenManifestMovesToNewContent(self) -> None:
+		pyProjectPath:Path = self.Fixture.RepoPath.joinpath("pyproject.toml")
+		versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath)
+		versioning:Versioning = Versioning(self.Fixture.RepoPath, manifests=versionScanner.Manifests.values())
+		result:dict = versioning.BumpAndTag(mode="auto", finalVersion="2.0.0", makeCommit=False)
+		self.assertTrue(result["IsWritten"])
+		self.assertEqual(versionScanner.Manifests[pyProjectPath].GetVersion(), SemVer.parse("2.0.0"))
+		self.assertEqual(pyProjectPath.read_text(), self.PyProject.replace("1.0.0", "2.0.0"))
+		self.assertEqual(result["TagName"], "v2.0.0")
+
+	def test_UnknownMode(self) -> None:
+		with self.assertRaises(ValueError):
+			Versioning(self.Fixture.RepoPath).BumpAndTag(mode="batch")
+
+class ConventionalCommitTests(unittest.TestCase):
+	def GetParsed(self, commit:ConventionalCommit) -> tuple:
+		return (commit.Type, commit.Scope, commit.IsBreakingChange, commit.Description)
+
+	def test_ParseManySubjects(self) -> None:
+		commits:list[ConventionalCommit] = ConventionalCommit.ParseMany([
+			"feat: plain",
+			"FIX(core)!: breaking with scope",
+			"docs(api):no space",
+			"wip: unknown type",
+			"Merge branch 'main'",
+			"Initial commit",
+			"feat(a:b): c",
+			"fix(core: missing parenthesis"])
+		self.assertEqual([self.GetParsed(commit) for commit in commits], [
+			(CommitType.Feat, None, False, "plain"),
+			(CommitType.Fix, "core", True, "breaking with scope"),
+			(CommitType.Docs, "api", False, "no space"),
+			(CommitType.Unknown, None, False, "unknown type"),
+			(CommitType.Unknown, None, False, "Merge branch 'main'"),
+			(CommitType.Unknown, None, False, "Initial commit"),
+			(CommitType.Unknown, None, False, "feat(a:b): c"),
+			(CommitType.Unknown, None, False, "fix(core: missing parenthesis")])
+
+	def test_ParseManyGitCommits(self) -> None:
+		commits:list[ConventionalCommit] = ConventionalCommit.ParseMany([{
+			"Hash": "a" * 40,
+			"AbbreviatedHash": "a" * 7,
+			"CommitterDate_IS08601Strict": "2024-01-01T00:00:00+00:00",
+			"Subject": "refactor(parser): one pass",
+			"Body": "First line\nsecond line\n\nSecond paragraph\n\nRefs: #1\nReviewed-by: Someone\nBREAKING CHANGES: removed x\n"}])
+		self.assertEqual(len(commits), 1)
+		self.assertEqual(self.GetParsed(commits[0]), (CommitType.Refactor, "parser", False, "one pass"))
+		self.assertEqual(commits[0].Hash, "a" * 40)
+		self.assertEqual(commits[0].CommitterDate.year, 2024)
+		self.assertEqual(commits[0].Paragraphs, ["First line second line", "Second paragraph"])
+		self.assertEqual([(footer.Tag, footer.Value) for footer in commits[0].Footers], [("Refs", "#1"), ("Reviewed-by", "Someone")])
+		self.assertEqual(commits[0].BreakingChangeDescription, "removed x")
+
+class ConventionalCommitStatsTests(unittest.TestCase):
+	def GetCommits(self, subjects:list[str]) -> list[ConventionalCommit]:
+		return [ConventionalCommit(hash=f"{index:040x}", subject=subject) for index, subject in enumerate(subjects)]
+
+	def test_CountsAndCombines(self) -> None:
+		firstCommits:list[ConventionalCommit] = self.GetCommits(["feat: a", "feat!: b", "fix(core): c", "Initial commit"])
+		secondCommits:list[ConventionalCommit] = self.GetCommits(["fix: d", "docs!: e"])
+		firstStats:ConventionalCommitStats = ConventionalCommitStats(firstCommits)
+		secondStats:ConventionalCommitStats = ConventionalCommitStats(CommitTable(secondCommits))
+		self.assertEqual({name: count for name, count in firstStats.GetCounts().items() if count > 0}, {"Breaking": 1, "Feat": 2, "Fix": 1, "Unknown": 1})
+		self.assertEqual({name: count for name, count in secondStats.GetCounts().items() if count > 0}, {"Breaking": 1, "Fix": 1, "Docs": 1})
+		totalStats:ConventionalCommitStats = firstStats + secondStats
+		self.assertEqual(totalStats.GetCounts(), ConventionalCommitStats(firstCommits + secondCommits).GetCounts())
+		self.assertEqual((totalStats - secondStats).GetCounts(), firstStats.GetCounts())
+		self.assertEqual(firstStats.Feat, 2)
+		for commit in secondCommits:
+			firstStats.AddCommit(commit)
+		self.assertEqual(firstStats.GetCounts(), totalStats.GetCounts())
+
+class VersionSortTests(unittest.TestCase):
+	#In SemVer precedence order; the build metadata on the last version does not count.
+	Versions:list[str] = ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.2.0", "1.10.0", "2.0.0+build.5"]
+
+	def test_SortVersions(self) -> None:
+		shuffledVersions:list[str] = [f"v{version}" if index % 2 else version for index, version in enumerate(self.Versions)]
+		random.Random(0).shuffle(shuffledVersions)
+		self.assertEqual([version.removeprefix("v") for version in Versioning.SortVersions(shuffledVersions)], self.Versions)
+		self.assertEqual([version.removeprefix("v") for version in Versioning.SortVersions(shuffledVersions, reverse=True)], self.Versions[::-1])
+		self.assertEqual(Versioning.MaxVersion(shuffledVersions).removeprefix("v"), "2.0.0+build.5")
+		self.assertIsNone(Versioning.MaxVersion([]))
+
+	def test_VersionCompareMatchesSemVer(self) -> None:
+		for firstVersion in self.Versions:
+			for secondVersion in self.Versions:
+				self.assertEqual(Versioning.VersionCompare(firstVersion, secondVersion), "<=>"[SemVer.parse(firstVersion).compare(secondVersion) + 1], (firstVersion, secondVersion))
+		self.assertEqual(Versioning.VersionCompare("v1.0.0+a", "1.0.0+b"), "=")
+
+	def test_VersionToBytesIsDeprecated(self) -> None:
+		with self.assertWarns(DeprecationWarning):
+			self.assertEqual(Versioning.VersionToBytes("v1.10.2"), bytes.fromhex("00000001" "0000000a" "00000002"))
+
+class VersionTagsIndexTests(unittest.TestCase):
+	def GetVersionTags(self, versions:list[str]) -> VersionTags:
+		returnValue:VersionTags = VersionTags(useHistoryCache=False)
+		for version in versions:
+			returnValue.Add(VersionTag(name=f"v{version}", version=version))
+		return returnValue
+
+	def GetNames(self, versionTags:list[VersionTag]) -> list[str]:
+		return [versionTag.Name for versionTag in versionTags]
+
+	def test_OrderedLookups(self) -> None:
+		versionTags:VersionTags = self.GetVersionTags(["1.1.0", "1.0.0", "2.0.0", "1.10.0", "1.1.0-rc.1"])
+		self.assertEqual(self.GetNames(versionTags), ["v2.0.0", "v1.10.0", "v1.1.0", "v1.1.0-rc.1", "v1.0.0"])
+		self.assertEqual(self.GetNames(versionTags[1:3]), ["v1.10.0", "v1.1.0"])
+		self.assertEqual(versionTags[-1].Name, "v1.0.0")
+		self.assertEqual(versionTags.GetLatest().Name, "v2.0.0")
+		self.assertIs(versionTags.GetByName("v1.1.0"), versionTags[2])
+		self.assertIsNone(versionTags.GetByName("v9.9.9"))
+		self.assertEqual(self.GetNames(versionTags.GetRange("1.1.0-rc.1", "2.0.0")), ["v1.10.0", "v1.1.0", "v1.1.0-rc.1"])
+		self.assertEqual(self.GetNames(versionTags.GetRange(SemVer.parse("1.1.0"), "2.0.0", includeUpper=True)), ["v2.0.0", "v1.10.0", "v1.1.0"])
+		self.assertEqual(self.GetNames(versionTags.GetRange("3.0.0", "4.0.0")), [])
+
+	def test_RemoveAndSetLatestVersion(self) -> None:
+		versionTags:VersionTags = self.GetVersionTags(["1.0.0", "1.1.0", "2.0.0"])
+		versionTags.Remove(versionTags.GetByName("v1.1.0"))
+		self.assertEqual(len(versionTags), 2)
+		self.assertIsNone(versionTags.GetByName("v1.1.0"))
+		versionTags.SetLatestVersion(SemVer.parse("3.0.0"))
+		self.assertEqual(self.GetNames(versionTags), ["v3.0.0", "v1.0.0"])
+		self.assertIs(versionTags.GetByName("v3.0.0"), versionTags.GetLatest())
+		#Tags belong to their own VersionTags.
+		self.assertEqual(len(VersionTags(useHistoryCache=False)), 0)
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class HistoryCacheTests(unittest.TestCase):
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+		self.Fixture.Commit("feat: first")
+		self.Fixture.Commit("fix(core)!: second\n\nBREAKING CHANGE: changed")
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("not conventional")
+		self.Fixture.Commit("docs: third")
+		self.Fixture.Tag("v1.1.0", message="Release")
+		self.Fixture.Commit("feat: unreleased")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def GetSubjects(self, versionTags:VersionTags, name:str) -> list[str]:
+		versionTag:VersionTag = next(versionTag for versionTag in versionTags if versionTag.Name == name)
+		return [commit.Subject for commit in versionTag.Commits]
+
+	def EditCachedSubject(self, cachePath:Path, name:str) -> None:
+		#A cached entry is used as it is, so an edited entry shows whether the next load read it.
+		cache:dict = json.loads(cachePath.read_text(encoding="utf-8"))
+		cache["Tags"][name]["Commits"][0]["Subject"] = "feat: from the cache"
+		cachePath.write_text(json.dumps(cache), encoding="utf-8")
+
+	def test_CachedHistoryMatchesFreshLoad(self) -> None:
+		for useCommitTable in [False, True]:
+			with self.subTest(useCommitTable=useCommitTable):
+				freshTags:VersionTags = VersionTags(self.Fixture.RepoPath, useCommitTable=useCommitTable)
+				VersionTags(self.Fixture.RepoPath, useHistoryCache=True, useCommitTable=useCommitTable)
+				cachedTags:VersionTags = VersionTags(self.Fixture.RepoPath, useHistoryCache=True, useCommitTable=useCommitTable)
+				self.assertTrue(cachedTags.GetHistoryCachePath().exists())
+				self.assertEqual(cachedTags.Serializable(), freshTags.Serializable())
+				self.assertEqual([versionTag.Stats.GetCounts() for versionTag in cachedTags], [versionTag.Stats.GetCounts() for versionTag in freshTags])
+				self.assertEqual(cachedTags.GetChangeLogMarkdown(), freshTags.GetChangeLogMarkdown())
+
+	def test_CacheIsOptIn(self) -> None:
+		versionTags:VersionTags = VersionTags(self.Fixture.RepoPath)
+		self.assertFalse(versionTags.GetHistoryCachePath().parent.exists())
+		self.assertEqual(versionTags.Serializable(), VersionTags(self.Fixture.RepoPath, useHistoryCache=True).Serializable())
+
+	def test_CacheIsRead(self) -> None:
+		cachePath:Path = VersionTags(self.Fixture.RepoPath, useHistoryCache=True).GetHistoryCachePath()
+		self.assertEqual(sorted(json.loads(cachePath.read_text(encoding="utf-8"))["Tags"].keys()), ["v1.0.0", "v1.1.0"])
+		self.EditCachedSubject(cachePath, "v1.0.0")
+		self.assertEqual(self.GetSubjects(VersionTags(self.Fixture.RepoPath, useHistoryCache=True), "v1.0.0"), ["feat: from the cache"])
+
+	def test_CachedStatsAreRead(self) -> None:
+		#The counts are stored with each entry and restored as they are, not counted again from the cached commits.
+		cachePath:Path = VersionTags(self.Fixture.RepoPath, useHistoryCache=True).GetHistoryCachePath()
+		cache:dict = json.loads(cachePath.read_text(encoding="utf-8"))
+		self.assertEqual(cache["Tags"]["v1.1.0"]["Stats"]["Unknown"], 1)
+		cache["Tags"]["v1.1.0"]["Stats"]["Unknown"] = 7
+		cachePath.write_text(json.dumps(cache), encoding="utf-8")
+		versionTag:VersionTag = next(versionTag for versionTag in VersionTags(self.Fixture.RepoPath, useHistoryCache=True) if versionTag.Name == "v1.1.0")
+		self.assertEqual(versionTag.Stats.GetCounts()["Unknown"], 7)
+
+	def test_MovedTagInvalidatesEntries(self) -> None:
+		#Moving v1.0.0 changes its own range and the range v1.1.0 starts from.
+		cachePath:Path = VersionTags(self.Fixture.RepoPath, useHistoryCache=True).GetHistoryCachePath()
+		self.EditCachedSubject(cachePath, "v1.1.0")
+		self.Fixture.Run("tag", "--force", "v1.0.0", "HEAD~4")
+		cachedTags:VersionTags = VersionTags(self.Fixture.RepoPath, useHistoryCache=True)
+		self.assertEqual(self.GetSubjects(cachedTags, "v1.1.0"), ["not conventional", "fix(core)!: second"])
+		self.assertEqual(cachedTags.Serializable(), VersionTags(self.Fixture.RepoPath).Serializable())
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class VersionTagsTests(unittest.TestCase):
+	def setUp(self) -> None:
+		self.Fixture = GitFixture()
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def GetTagSubjects(self, versionTags:VersionTags) -> list[tuple[str, list[str]]]:
+		#The unreleased tag is named after its computed version, so it is listed without a name.
+		return [(versionTag.Name if versionTag.TagCommit is not None else None, [commit.Subject for commit in versionTag.Commits or []]) for versionTag in versionTags]
+
+	def test_PrereleaseSortsBeforeRelease(self) -> None:
+		#By name v2.0.0 sorts before v2.0.0-rc.1; by SemVer precedence the release candidate comes first.
+		self.Fixture.Commit("feat: first")
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("feat: second")
+		self.Fixture.Commit("fix: candidate")
+		self.Fixture.Tag("v2.0.0-rc.1")
+		self.Fixture.Commit("fix: third")
+		self.Fixture.Commit("docs: release")
+		self.Fixture.Tag("v2.0.0", message="Release")
+		self.Fixture.Commit("fix: unreleased")
+		for backend in ["exec", "objectstore"]:
+			with self.subTest(backend=backend):
+				versionTags:VersionTags = VersionTags(self.Fixture.RepoPath, backend=backend, useHistoryCache=False)
+				self.assertEqual(self.GetTagSubjects(versionTags), [
+					(None, ["fix: unreleased"]),
+					("v2.0.0", ["fix: third"]),
+					("v2.0.0-rc.1", ["feat: second"]),
+					("v1.0.0", ["feat: first"])])
+				self.assertEqual(versionTags[1].TagCommit.Subject, "docs: release")
+				self.assertEqual(versionTags[2].TagCommit.Subject, "fix: candidate")
+
+	def test_LoadFromRepoAsyncMatchesLoadFromRepo(self) -> None:
+		self.Fixture.Commit("feat: first", {"src/a.txt": "a"})
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("fix(core): second", {"src/a.txt": "a2"})
+		self.Fixture.Commit("docs: third", {"README.md": "readme"})
+		self.Fixture.Tag("v1.1.0", message="Release")
+		self.Fixture.Commit("feat: unreleased")
+		for includeFiles in [False, True]:
+			with self.subTest(includeFiles=includeFiles):
+				asyncTags:VersionTags = VersionTags(useHistoryCache=False)
+				asyncio.run(asyncTags.LoadFromRepoAsync(self.Fixture.RepoPath, includeFiles, maxConcurrency=2))
+				self.assertEqual(asyncTags.Serializable(), VersionTags(self.Fixture.RepoPath, includeFiles, useHistoryCache=False).Serializable())
+
+	def test_LoadFromRepoAsyncRunsNoBlockingGit(self) -> None:
+		#The first commit comes from AsyncGit, and the repository the instance had is closed when it is replaced.
+		self.Fixture.Commit("feat: first")
+		self.Fixture.Commit("fix: second")
+		for tagName in [None, "v1.0.0"]:
+			with self.subTest(tagName=tagName):
+				if (tagName is not None):
+					self.Fixture.Tag(tagName, "HEAD~1")
+				versionTags:VersionTags = VersionTags(self.Fixture.RepoPath)
+				previousRepo:Git = versionTags.GitRepo
+				with mock.patch.object(Git, "GetFirstCommit", side_effect=AssertionError("blocking git call")), mock.patch.object(previousRepo, "Close", wraps=previousRepo.Close) as close:
+					asyncio.run(versionTags.LoadFromRepoAsync(self.Fixture.RepoPath))
+				close.assert_called_once()
+				self.assertEqual(versionTags.Serializable(), VersionTags(self.Fixture.RepoPath).Serializable())
+				versionTags.GitRepo.Close()
+
+	def test_LoadFromRepoAsyncNeedsRepo(self) -> None:
+		with self.assertRaises(ValueError):
+			asyncio.run(VersionTags().LoadFromRepoAsync())
+
+	def test_SaveChangeLogMatchesMarkdown(self) -> None:
+		self.Fixture.Commit("feat: first", {"src/a.txt": "a"})
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Commit("fix(core): second", {"src/a.txt": "a2", "README.md": "readme"})
+		versionTags:VersionTags = VersionTags(self.Fixture.RepoPath, useHistoryCache=False)
+		for includeFiles in [False, True]:
+			with self.subTest(includeFiles=includeFiles):
+				versionTags.SaveChangeLog(includeChangedFilesInChangeLog=includeFiles)
+				self.assertEqual(self.Fixture.RepoPath.joinpath("CHANGELOG.md").read_text(encoding="utf-16"), versionTags.GetChangeLogMarkdown(includeFiles))
+		self.assertIn("\n	* README.md\n", versionTags.GetChangeLogMarkdown(True))
+
+	def test_FailedSaveChangeLogKeepsPreviousFile(self) -> None:
+		self.Fixture.Commit("feat: first")
+		versionTags:VersionTags = VersionTags(self.Fixture.RepoPath)
+		changeLogPath:Path = self.Fixture.WriteFile("CHANGELOG.md", "previous")
+		def WritePartOfChangeLog(changeLogFile, includeChangedFilesInChangeLog:bool = False) -> None:
+			changeLogFile.write("# Change")
+			raise RuntimeError("render failed")
+		with mock.patch.object(versionTags, "WriteChangeLogMarkdown", side_effect=WritePartOfChangeLog):
+			with self.assertRaises(RuntimeError):
+				versionTags.SaveChangeLog()
+		self.assertEqual(changeLogPath.read_text(encoding="utf-8"), "previous")
+		self.assertEqual([path.name for path in self.Fixture.RepoPath.iterdir() if path.name.endswith(".tmp")], [])
+
+	def test_PackagesOwnTheirTagsAndFiles(self) -> None:
+		self.Fixture.Commit("feat: root", {
+			"pyproject.toml": "[project]\nname = \"root\"\nversion = \"1.0.0\"\n",
+			"packages/alpha/pyproject.toml": "[project]\nname = \"alpha\"\nversion = \"1.0.0\"\n",
+			"packages/alpha/beta/pyproject.toml": "[project]\nname = \"beta\"\nversion = \"0.1.0\"\n"})
+		self.Fixture.Tag("v1.0.0")
+		self.Fixture.Tag("root@v1.0.0")
+		self.Fixture.Tag("alpha@v1.0.0")
+		self.Fixture.Commit("feat(alpha): alpha change", {"packages/alpha/a.txt": "a"})
+		self.Fixture.Commit("fix(beta): beta change", {"packages/alpha/beta/b.txt": "b"})
+		self.Fixture.Tag("alpha@v1.1.0-rc.1")
+		self.Fixture.Commit("fix: both", {"packages/alpha/a.txt": "a2", "README.md": "readme"})
+		self.Fixture.Tag("alpha@v1.1.0", message="alpha")
+		self.Fixture.Commit("docs: root only", {"README.md": "readme2"})
+		packageVersionTags:PackageVersionTags = PackageVersionTags(VersionScanner(self.Fixture.RepoPath), includeFiles=True)
+		self.assertEqual(packageVersionTags.PackageNames, {"": "root", "packages/alpha": "alpha", "packages/alpha/beta": "beta"})
+		self.assertEqual(self.GetTagSubjects(packageVersionTags["alpha"]), [
+			(None, []),
+			("alpha@v1.1.0", []),
+			("alpha@v1.1.0-rc.1", ["feat(alpha): alpha change"]),
+			("alpha@v1.0.0", [])])
+		self.assertEqual(packageVersionTags["alpha"][1].TagCommit.Subject, "fix: both")
+		self.assertEqual(self.GetTagSubjects(packageVersionTags["beta"]), [(None, ["fix(beta): beta change", "feat: root"])])
+		self.assertEqual(self.GetTagSubjects(packageVersionTags["root"]), [
+			(None, ["docs: root only", "fix: both"]),
+			("root@v1.0.0", [])])
+		self.assertEqual(packageVersionTags["root"][0].Commits[1].Files, ["README.md"])
+
+class CommitTableTests(unittest.TestCase):
+	Subjects:list[str] = ["feat: plain", "fix(core)!: breaking with scope", "Merge branch 'main'", "docs(api): scoped", ""]
+
+	def GetCommits(self) -> list[ConventionalCommit]:
+		returnValue:list[ConventionalCommit] = list[ConventionalCommit]()
+		for index, subject in enumerate(self.Subjects):
+			returnValue.append(ConventionalCommit(
+				hash=f"{index:07x}{0:033x}",
+				abbreviatedHash=f"{index:07x}",
+				committerDate=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) - datetime.timedelta(days=index % 2),
+				subject=subject or None,
+				body="Paragraph\n\nRefs: #1\nBREAKING CHANGE: removed" if index % 2 else None,
+				files=["a.txt"] if index == 0 else None))
+		return returnValue
+
+	def GetVersionTags(self, useCommitTable:bool) -> VersionTags:
+		returnValue:VersionTags = VersionTags(useHistoryCache=False, useCommitTable=useCommitTable)
+		versionTag:VersionTag = VersionTag(name="v1.0.0", version="1.0.0", useCommitTable=useCommitTable)
+		versionTag.ExtendFromIterator(self.GetCommits())
+		returnValue.Add(versionTag)
+		with tempfile.TemporaryDirectory() as directory:
+			returnValue.RepoMeta = GitRepoMeta(Path(directory))
+		returnValue.RepoMeta.ScopeLinks = {"core": "https://example.com/core"}
+		return returnValue
+
+	def test_RowsMatchParsedCommits(self) -> None:
+		commitTable:CommitTable = CommitTable()
+		commits:list[ConventionalCommit] = self.GetCommits()
+		for commit in commits:
+			commitTable.append(commit)
+		self.assertEqual(len(commitTable), len(commits))
+		for index, commit in enumerate(commits):
+			self.assertEqual(commitTable.GetDescription(index), commit.Description)
+			self.assertEqual(commitTable.GetScope(index), commit.Scope)
+			self.assertEqual(commitTable.GetIsBreakingChange(index), commit.IsBreakingChange)
+			self.assertEqual(commitTable.GetAbbreviatedHash(index), commit.AbbreviatedHash)
+			row:ConventionalCommit = commitTable[index]
+			for name in ConventionalCommit.__slots__:
+				if (name != "Footers"):
+					self.assertEqual(getattr(row, name), getattr(commit, name), name)
+			self.assertEqual([(footer.Tag, footer.Value) for footer in row.Footers], [(footer.Tag, footer.Value) for footer in commit.Footers])
+
+	def test_ChangeLogAndSerializableMatchList(self) -> None:
+		tableTags:VersionTags = self.GetVersionTags(True)
+		listTags:VersionTags = self.GetVersionTags(False)
+		self.assertIsInstance(tableTags[0].Commits, CommitTable)
+		self.assertEqual(tableTags.GetChangeLogMarkdown(True), listTags.GetChangeLogMarkdown(True))
+		self.assertEqual(tableTags.Serializable(), listTags.Serializable())
+
+@unittest.skipUnless(GitFixture.IsAvailable(), "git is not installed")
+class VersionScannerTests(unittest.TestCase):
+	SQLProject:str = ("<Project xmlns=\"http://schemas.microsoft.com/developer/msbuild/2003\">\n"
+		"  <PropertyGroup>\n    <Name>{name}</Name>\n  </PropertyGroup>\n"
+		"  <ItemGroup>\n    <SqlCmdVariable Include=\"DatabaseVersion\">\n      <DefaultValue>v{version}</DefaultValue>\n    </SqlCmdVariable>\n  </ItemGroup>\n</Project>\n")
+
+	def setUp(self) -> None:
+		#Several manifests of each type, two of them malformed, so a pool has more than one chunk to hand out.
+		self.Fixture = GitFixture()
+		for index in range(3):
+			self.Fixture.WriteFile(f"packages/package{index}/pyproject.toml", f"[project]\nname = \"package{index}\"\nversion = \"1.{index}.0\"\n")
+		self.Fixture.WriteFile("packages/broken/pyproject.toml", "[project\n")
+		for index in range(6):
+			self.Fixture.WriteFile(f"database/Database{index}.sqlproj", self.SQLProject.format(name=f"Database{index}", version=f"2.{index}.0"))
+		self.Fixture.WriteFile("database/Broken.sqlproj", "<Project><ItemGroup>")
+
+	def tearDown(self) -> None:
+		self.Fixture.Close()
+
+	def GetScan(self, **arguments) -> tuple[list[dict], list[dict]]:
+		versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath, **arguments)
+		return (versionScanner.Versions, versionScanner.Errors)
+
+	def test_ParallelScansMatchSerialScan(self) -> None:
+		serialVersions, serialErrors = self.GetScan()
+		self.assertEqual([(version["Type"], version["RelativePath"].as_posix(), version["ProjectName"], str(version["Version"])) for version in serialVersions],
+			[("PyProject", f"packages/package{index}/pyproject.toml", f"package{index}", f"1.{index}.0") for index in range(3)]
+			+ [("SQLProject", f"database/Database{index}.sqlproj", f"Database{index}", f"2.{index}.0") for index in range(6)])
+		self.assertEqual([(error["Type"], error["RelativePath"].as_posix()) for error in serialErrors],
+			[("PyProject", "packages/broken/pyproject.toml"), ("SQLProject", "database/Broken.sqlproj")])
+		for executor in ["thread", "process"]:
+			with self.subTest(executor=executor):
+				self.assertEqual(self.GetScan(workers=3, executor=executor), (serialVersions, serialErrors))
+
+	def test_ParallelScansKeepManifests(self) -> None:
+		#Process workers parse the manifests, so the scanner must still hold a usable copy of each one.
+		for executor in ["thread", "process"]:
+			with self.subTest(executor=executor):
+				versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath, workers=3, executor=executor)
+				self.assertEqual(sorted(self.Fixture.RepoPath.joinpath(version["RelativePath"]) for version in versionScanner.Versions), sorted(versionScanner.Manifests))
+				for version in versionScanner.Versions:
+					manifest = versionScanner.Manifests[self.Fixture.RepoPath.joinpath(version["RelativePath"])]
+					self.assertEqual((manifest.GetName(), manifest.GetVersion()), (version["ProjectName"], version["Version"]))
+					self.assertTrue(manifest.WriteVersion(version["Version"].bump_major()))
+					self.assertIn(str(version["Version"].bump_major()).encode(), manifest.Render())
+
+	def test_VersioningSharesScannerManifests(self) -> None:
+		self.Fixture.RepoPath.joinpath("packages", "broken", "pyproject.toml").unlink()
+		self.Fixture.RepoPath.joinpath("database", "Broken.sqlproj").unlink()
+		self.Fixture.Commit("feat: manifests")
+		versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath)
+		versioning:Versioning = Versioning(self.Fixture.RepoPath, manifests=versionScanner.Manifests.values())
+		self.assertEqual(len(versioning.Manifests), 9)
+		for path, manifest in versionScanner.Manifests.items():
+			self.assertIs(versioning.GetManifest(manifest.ManifestType, path), manifest)
+
+	def test_ScanCacheSkipsUnchangedManifests(self) -> None:
+		cachePath:Path = VersionScanner(self.Fixture.RepoPath, useScanCache=True).GetScanCachePath()
+		self.assertEqual(cachePath, self.Fixture.RepoPath.joinpath(".git", "ccsvgit-cache", "manifests.json"))
+		#An edited entry shows whether the next scan trusted the cache or read the file.
+		cache:dict = json.loads(cachePath.read_text(encoding="utf-8"))
+		self.assertEqual(len(cache["Manifests"]), 11)
+		for relativePath in ["packages/package0/pyproject.toml", "packages/package1/pyproject.toml"]:
+			cache["Manifests"][relativePath]["ProjectName"] = "from the cache"
+		cachePath.write_text(json.dumps(cache), encoding="utf-8")
+		self.Fixture.WriteFile("packages/package1/pyproject.toml", "[project]\nname = \"package1\"\nversion = \"10.0.0\"\n")
+		versionScanner:VersionScanner = VersionScanner(self.Fixture.RepoPath, useScanCache=True)
+		self.assertEqual([(version["ProjectName"], str(version["Version"])) for version in versionScanner.Versions[:3]],
+			[("from the cache", "1.0.0"), ("package1", "10.0.0"), ("package2", "1.2.0")])
+		self.assertEqual(versionScanner.Errors, VersionScanner(self.Fixture.RepoPath).Errors)
+		self.assertEqual(json.loads(cachePath.read_text(encoding="utf-8"))["Manifests"]["packages/package1/pyproject.toml"]["Version"], "10.0.0")
+
+	def test_UnknownExecutor(self) -> None:
+		with self.assertRaises(ValueError):
+			VersionScanner(self.Fixture.RepoPath, executor="fiber")
+
+if (__name__ == "__main__"):
+	unittest.main()